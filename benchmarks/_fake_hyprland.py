@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Out-of-process stand-in for Hyprland's command socket, shared by benchmarks."""
+
+from __future__ import annotations
+
+import multiprocessing
+import socket
+import tempfile
+import uuid
+from pathlib import Path
+
+
+def _serve(server: socket.socket, reply: bytes) -> None:
+    """Serve one reply per connection, like Hyprland's command socket."""
+    while True:
+        conn, _ = server.accept()
+        with conn:
+            if conn.recv(65536):
+                conn.sendall(reply)
+
+
+def socket_path() -> Path:
+    """Return a fresh, short socket path in the temp directory."""
+    return Path(tempfile.gettempdir()) / f"hypripc_bench_{uuid.uuid4().hex[:8]}.sock"
+
+
+class FakeServer:
+    """Handle on the stand-in server processes."""
+
+    def __init__(self, processes: list[multiprocessing.Process]) -> None:
+        """Wrap the started *processes*."""
+        self.processes = processes
+
+    def close(self) -> None:
+        """Stop every server process."""
+        for process in self.processes:
+            process.terminate()
+
+
+def fake_server(path: Path, reply: bytes, workers: int = 1) -> FakeServer:
+    """Start stand-in server processes sharing one listening socket.
+
+    One worker answers connections one at a time, as Hyprland does; more
+    workers let benchmarks measure client-side scaling without the server
+    becoming the bottleneck.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(256)
+        processes = [
+            multiprocessing.Process(target=_serve, args=(server, reply), daemon=True)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+    return FakeServer(processes)
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Measure the cold-start latency of one query from a fresh process.
+
+Compares an empty interpreter, the ``hyprland-ipc`` command line (through
+``python -m`` and, if installed, the console script) and a hand-written
+script that imports :class:`HyprlandIPC`. Each run spawns a new process and
+sends one query to a local stand-in server, or to the running Hyprland
+instance with ``--live``.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 50
+    python benchmarks/bench_startup.py --live --command clients
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _fake_hyprland import fake_server
+
+
+SCRIPT = (
+    "import sys\n"
+    "from hyprland_ipc import HyprlandIPC\n"
+    "print(HyprlandIPC.from_env().send(sys.argv[1]))\n"
+)
+
+
+def _measure(argv: list[str], runs: int, env: dict[str, str]) -> list[float]:
+    samples: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, env=env, check=True, stdout=subprocess.DEVNULL)  # noqa: S603
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(label: str, samples: list[float], baseline: float | None) -> None:
+    median = statistics.median(samples)
+    cuts = statistics.quantiles(samples, n=10)
+    extra = "" if baseline is None else f"   +{(median - baseline) * 1e3:6.1f} ms over python"
+    print(f"{label:<16} median {median * 1e3:6.1f} ms   p90 {cuts[8] * 1e3:6.1f} ms{extra}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--command", default="clients", help="query sent as j/<command>")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--live", action="store_true", help="query the running Hyprland")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    server = None
+    if not args.live:
+        runtime = Path(tempfile.mkdtemp(prefix="hypripc_"))
+        (runtime / "hypr" / "bench").mkdir(parents=True)
+        server = fake_server(runtime / "hypr" / "bench" / ".socket.sock", b"[]" * 512)
+        env |= {"XDG_RUNTIME_DIR": str(runtime), "HYPRLAND_INSTANCE_SIGNATURE": "bench"}
+        # from_env() checks that both sockets exist.
+        fake_server(runtime / "hypr" / "bench" / ".socket2.sock", b"")
+
+    python = sys.executable
+    cases = [
+        ("python -c pass", [python, "-c", "pass"]),
+        ("python -m cli", [python, "-m", "hyprland_ipc", "query", "-j", args.command]),
+        ("script", [python, "-c", SCRIPT, f"j/{args.command}"]),
+    ]
+    if installed := shutil.which("hyprland-ipc"):
+        cases.insert(2, ("hyprland-ipc", [installed, "query", "-j", args.command]))
+
+    try:
+        baseline = None
+        for label, argv in cases:
+            _measure(argv, 3, env)  # warm the page cache
+            samples = _measure(argv, args.runs, env)
+            _report(label, samples, baseline)
+            if baseline is None:
+                baseline = statistics.median(samples)
+    finally:
+        if server is not None:
+            server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Measure how query and event-handling throughput scale with thread count.
+
+Two workloads are run for each thread count:
+
+- ``send_json``: every thread issues ``j/clients`` queries against a
+  multi-process stand-in server (or the running Hyprland instance with
+  ``--live``) and parses the reply;
+- ``events``: synthetic events go through an :class:`EventDispatcher` whose
+  handler parses the event fields and does a little work per event.
+
+On a GIL build throughput flattens once parsing dominates; on a free-threaded
+build (``python3.13t`` / ``python3.14t``) it should keep rising with threads.
+
+Usage:
+    python benchmarks/bench_threads.py --threads 1 2 4 8
+    python3.14t benchmarks/bench_threads.py --live
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from _fake_hyprland import fake_server, socket_path
+
+from hyprland_ipc import EventDispatcher, HyprlandIPC
+from hyprland_ipc.handlers import by_window
+from hyprland_ipc.ipc import Event
+from hyprland_ipc.schema import parse_event_data
+
+
+def _clients_reply(count: int) -> bytes:
+    clients = [
+        {
+            "address": f"0x{i:x}",
+            "at": [i, i],
+            "size": [800, 600],
+            "workspace": {"id": i % 10, "name": str(i % 10)},
+            "floating": False,
+            "monitor": 0,
+            "class": "kitty",
+            "title": f"window {i}",
+            "pid": 1000 + i,
+            "grouped": [],
+        }
+        for i in range(count)
+    ]
+    return json.dumps(clients).encode()
+
+
+def _run_threads(threads: int, work: Callable[[], None]) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def run() -> None:
+        barrier.wait()
+        work()
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_queries(ipc: HyprlandIPC, threads: int, per_thread: int) -> float:
+    """Return queries per second with *threads* concurrent callers."""
+
+    def work() -> None:
+        for _ in range(per_thread):
+            ipc.send_json("clients")
+
+    return threads * per_thread / _run_threads(threads, work)
+
+
+def bench_events(threads: int, total: int) -> float:
+    """Return events per second handled by a dispatcher with *threads* workers."""
+    events = [Event("openwindow", f"{i % 64:x},{i % 10},kitty,title {i}") for i in range(total)]
+
+    def handler(event: Event) -> None:
+        fields = parse_event_data(event)
+        json.dumps(fields)
+
+    start = time.perf_counter()
+    with EventDispatcher(handler, concurrency=threads, key=by_window) as dispatcher:
+        for event in events:
+            dispatcher.submit(event)
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--queries", type=int, default=500, help="queries per thread")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=30, help="windows in the fake reply")
+    parser.add_argument("--live", action="store_true", help="query the running instance")
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    server = None
+    if args.live:
+        ipc = HyprlandIPC.from_env()
+    else:
+        path: Path = socket_path()
+        server = fake_server(path, _clients_reply(args.clients), workers=max(args.threads))
+        ipc = HyprlandIPC(path, path)
+
+    try:
+        baseline_q = baseline_e = 0.0
+        print(f"{'threads':>7} {'queries/s':>12} {'scale':>6} {'events/s':>12} {'scale':>6}")
+        for threads in args.threads:
+            queries = bench_queries(ipc, threads, args.queries)
+            events = bench_events(threads, args.events)
+            baseline_q = baseline_q or queries
+            baseline_e = baseline_e or events
+            print(
+                f"{threads:>7} {queries:>12,.0f} {queries / baseline_q:>6.2f}"
+                f" {events:>12,.0f} {events / baseline_e:>6.2f}"
+            )
+    finally:
+        if server is not None:
+            server.close()
+            path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,159 @@
 # SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
 #
 # SPDX-License-Identifier: MIT
+"""Type-safe client for Hyprland's IPC sockets.
+
+Public names are imported on first access, so ``import hyprland_ipc`` (and
+the ``hyprland-ipc`` command line) only pays for the modules actually used.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
 from .__about__ import __version__
-from .ipc import Event, HyprlandIPC, HyprlandIPCError
 
 
-__all__ = ["Event", "HyprlandIPC", "HyprlandIPCError", "__version__"]
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .batching import DispatchQueue
+    from .columnar import ClientTable
+    from .commands import Command, CommandTemplate, Dispatch, Query
+    from .config import OptionCache
+    from .diff import SnapshotDiff, SnapshotDiffer, diff_snapshots
+    from .fanout import EventFanout, Subscription
+    from .focus import FocusHistory
+    from .handlers import EventDispatcher
+    from .history import EventHistory, HistoryEntry
+    from .hybrid import HybridState
+    from .instances import HyprlandInstance, InstanceEvent, MultiInstanceIPC, discover_instances
+    from .ipc import Event, EventStream, HyprlandIPC, HyprlandIPCError
+    from .protocol import CommandExchange, EventParser, RawEvent
+    from .reader import EventReader, ReaderStats
+    from .rules import Rule, RuleEngine
+    from .scheduler import DispatchScheduler
+    from .schema import parse_event_data
+    from .shm import SharedSnapshot, SharedStateReader, SharedStateWriter, StatePublisher
+    from .singleflight import FrozenDict, FrozenList, SingleFlight
+    from .spatial import Rect, SpatialIndex
+    from .topology import Topology
+    from .warmstart import WarmState, load_state, save_state
+
+
+_EXPORTS = {
+    "ClientTable": "columnar",
+    "Command": "commands",
+    "CommandExchange": "protocol",
+    "CommandTemplate": "commands",
+    "Dispatch": "commands",
+    "DispatchQueue": "batching",
+    "DispatchScheduler": "scheduler",
+    "Event": "ipc",
+    "EventDispatcher": "handlers",
+    "EventFanout": "fanout",
+    "EventHistory": "history",
+    "EventParser": "protocol",
+    "EventReader": "reader",
+    "EventStream": "ipc",
+    "FocusHistory": "focus",
+    "FrozenDict": "singleflight",
+    "FrozenList": "singleflight",
+    "HistoryEntry": "history",
+    "HybridState": "hybrid",
+    "HyprlandIPC": "ipc",
+    "HyprlandIPCError": "ipc",
+    "HyprlandInstance": "instances",
+    "InstanceEvent": "instances",
+    "MultiInstanceIPC": "instances",
+    "OptionCache": "config",
+    "Query": "commands",
+    "RawEvent": "protocol",
+    "ReaderStats": "reader",
+    "Rect": "spatial",
+    "Rule": "rules",
+    "RuleEngine": "rules",
+    "SharedSnapshot": "shm",
+    "SharedStateReader": "shm",
+    "SharedStateWriter": "shm",
+    "SingleFlight": "singleflight",
+    "SnapshotDiff": "diff",
+    "SnapshotDiffer": "diff",
+    "SpatialIndex": "spatial",
+    "StatePublisher": "shm",
+    "Subscription": "fanout",
+    "Topology": "topology",
+    "WarmState": "warmstart",
+    "diff_snapshots": "diff",
+    "discover_instances": "instances",
+    "load_state": "warmstart",
+    "parse_event_data": "schema",
+    "save_state": "warmstart",
+}
+"""Submodule defining each lazily imported public name."""
+
+
+def __getattr__(name: str) -> object:
+    """Import a public name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names, including those not imported yet."""
+    return sorted({*globals(), *_EXPORTS})
+
+
+__all__ = [
+    "ClientTable",
+    "Command",
+    "CommandExchange",
+    "CommandTemplate",
+    "Dispatch",
+    "DispatchQueue",
+    "DispatchScheduler",
+    "Event",
+    "EventDispatcher",
+    "EventFanout",
+    "EventHistory",
+    "EventParser",
+    "EventReader",
+    "EventStream",
+    "FocusHistory",
+    "FrozenDict",
+    "FrozenList",
+    "HistoryEntry",
+    "HybridState",
+    "HyprlandIPC",
+    "HyprlandIPCError",
+    "HyprlandInstance",
+    "InstanceEvent",
+    "MultiInstanceIPC",
+    "OptionCache",
+    "Query",
+    "RawEvent",
+    "ReaderStats",
+    "Rect",
+    "Rule",
+    "RuleEngine",
+    "SharedSnapshot",
+    "SharedStateReader",
+    "SharedStateWriter",
+    "SingleFlight",
+    "SnapshotDiff",
+    "SnapshotDiffer",
+    "SpatialIndex",
+    "StatePublisher",
+    "Subscription",
+    "Topology",
+    "WarmState",
+    "__version__",
+    "diff_snapshots",
+    "discover_instances",
+    "load_state",
+    "parse_event_data",
+    "save_state",
+]
@@ -0,0 +1,9 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+"""Entry point for ``python -m hyprland_ipc``."""
+
+from .cli import main
+
+
+raise SystemExit(main())
@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Auto-batching dispatch queue.
+
+Dispatches issued through a :class:`DispatchQueue` are held for a short flush
+window (or until :meth:`DispatchQueue.flush` / context-manager exit) and then
+sent to Hyprland as a single :meth:`HyprlandIPC.batch` request, much like
+Nagle's algorithm coalesces small writes. Every caller gets a
+:class:`concurrent.futures.Future` that resolves once its batch was sent.
+Commands that cannot be batched (they contain ';' or a newline) are sent on
+their own, in order, so they only fail their own future.
+
+The queue exposes ``dispatch`` and ``dispatch_many`` with the same arguments as
+:class:`HyprlandIPC`, so handlers written against the client can be handed a
+queue instead.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future
+from typing import Self
+
+from .ipc import HyprlandIPC, HyprlandIPCError, is_batchable
+
+
+def send_coalesced(ipc: HyprlandIPC, entries: Sequence[tuple[str, Future[None]]]) -> None:
+    """Send *entries* in order and resolve each future with the outcome.
+
+    Runs of batchable commands go out as one request; a command containing ';'
+    or a newline is dispatched alone between them. The futures must already be
+    running (see :meth:`Future.set_running_or_notify_cancel`).
+
+    Args:
+        ipc: Client used to send the requests.
+        entries: ``(command, future)`` pairs in submission order.
+    """
+    run: list[tuple[str, Future[None]]] = []
+    for entry in entries:
+        if is_batchable(entry[0]):
+            run.append(entry)
+            continue
+        _send_run(ipc, run)
+        _send_run(ipc, [entry])
+        run = []
+    _send_run(ipc, run)
+
+
+def _send_run(ipc: HyprlandIPC, run: list[tuple[str, Future[None]]]) -> None:
+    if not run:
+        return
+    try:
+        if len(run) == 1:
+            ipc.dispatch(run[0][0])
+        else:
+            ipc.batch([cmd for cmd, _ in run])
+    except Exception as e:
+        # Every caller in the request gets the failure through its future.
+        for _, fut in run:
+            fut.set_exception(e)
+    else:
+        for _, fut in run:
+            fut.set_result(None)
+
+
+class DispatchQueue:
+    """Coalesce dispatch commands into batched requests.
+
+    Usage:
+        with DispatchQueue(ipc, window=0.005) as queue:
+            queue.dispatch("movewindow l")
+            queue.dispatch("resizeactive 10 0")
+            done = queue.dispatch("focuswindow address:0xabc")
+        done.result()  # raises HyprlandIPCError if the batch failed
+    """
+
+    def __init__(self, ipc: HyprlandIPC, window: float | None = 0.005, max_batch: int = 64) -> None:
+        """Initialize the queue.
+
+        Args:
+            ipc: Client used to send the batched requests.
+            window: Seconds to wait after the first queued command before
+                flushing automatically. None disables the timer, so commands
+                are only sent on :meth:`flush` or context-manager exit.
+            max_batch: Flush immediately once this many commands are pending.
+
+        Raises:
+            ValueError: If *max_batch* is smaller than 1.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.ipc = ipc
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        # Serializes flushes so batches reach Hyprland in submission order.
+        self._send_lock = threading.Lock()
+        self._pending: list[tuple[str, Future[None]]] = []
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of commands waiting to be flushed."""
+        with self._lock:
+            return len(self._pending)
+
+    def dispatch(self, command: str) -> Future[None]:
+        """Queue a single dispatch command.
+
+        Args:
+            command: e.g., 'focuswindow address:0xabc', 'fullscreen 1'
+
+        Raises:
+            HyprlandIPCError: If the queue has been closed.
+
+        Returns:
+            Future[None]: Resolves when the batch containing *command* was sent.
+        """
+        future: Future[None] = Future()
+        with self._lock:
+            if self._closed:
+                raise HyprlandIPCError("Dispatch queue is closed")
+            self._pending.append((command, future))
+            flush_now = len(self._pending) >= self.max_batch
+            if not flush_now and self._timer is None and self.window is not None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+        return future
+
+    def dispatch_many(self, commands: Sequence[str]) -> list[Future[None]]:
+        """Queue several dispatch commands, preserving their order.
+
+        Args:
+            commands: Iterable of dispatch commands.
+
+        Returns:
+            list[Future[None]]: One future per command.
+        """
+        return [self.dispatch(cmd) for cmd in commands]
+
+    def flush(self) -> None:
+        """Send every pending command now as one batched request.
+
+        Failures are reported through the futures rather than raised here.
+        """
+        with self._send_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            self._send(pending)
+
+    def _send(self, pending: list[tuple[str, Future[None]]]) -> None:
+        live = [(cmd, fut) for cmd, fut in pending if fut.set_running_or_notify_cancel()]
+        send_coalesced(self.ipc, live)
+
+    def close(self) -> None:
+        """Flush pending commands and reject further ones."""
+        with self._lock:
+            self._closed = True
+        self.flush()
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Flush and close on context exit."""
+        self.close()
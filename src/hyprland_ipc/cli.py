@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""``hyprland-ipc`` command line, built for fast cold starts.
+
+Keybinds run this thousands of times a day, so almost all of its latency is
+interpreter startup and imports. It therefore depends on nothing but ``os``,
+``sys`` and the C ``_socket`` module: the ``socket`` wrapper adds several
+milliseconds of enum setup, ``argparse`` about as much again, and the
+:class:`HyprlandIPC` client pulls in ``json``, ``dataclasses`` and
+``concurrent.futures``. Replies and events are passed through as bytes.
+``benchmarks/bench_startup.py`` compares it with a script using the client.
+
+Usage:
+    hyprland-ipc query -j clients
+    hyprland-ipc dispatch workspace 2
+    hyprland-ipc batch "keyword general:gaps_in 5" "dispatch workspace 2"
+    hyprland-ipc events -e workspacev2 -e activewindowv2 -n 10
+"""
+
+from __future__ import annotations
+
+import _socket
+import os
+import sys
+
+from .__about__ import __version__
+
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+
+USAGE = """\
+usage: hyprland-ipc [-i SIGNATURE] COMMAND [ARGS...]
+
+commands:
+  query [-j] WORDS...        send a query (e.g. clients, getoption NAME);
+                             -j requests JSON
+  dispatch WORDS...          run a dispatcher (e.g. workspace 2)
+  batch COMMAND...           send several full commands in one request
+  events [-e NAME]... [-g TEXT] [-n COUNT]
+                             print events as NAME>>DATA lines, optionally only
+                             those named NAME and/or whose data contains TEXT,
+                             stopping after COUNT events
+
+options:
+  -i, --instance SIGNATURE   instance to talk to (default:
+                             $HYPRLAND_INSTANCE_SIGNATURE)
+  -h, --help                 show this help and exit
+  -V, --version              show the version and exit
+"""
+
+
+class UsageError(Exception):
+    """Raised for invalid command-line arguments (exit status 2)."""
+
+
+def _socket_dir(signature: str | None) -> str:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    signature = signature or os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not runtime or not signature:
+        raise OSError("Must run under Hyprland (XDG_RUNTIME_DIR and instance signature needed)")
+    return f"{runtime}/hypr/{signature}"
+
+
+def _connect(path: str) -> _socket.socket:
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def request(directory: str, payload: bytes) -> bytes:
+    """Send one request to ``.socket.sock`` and return the raw reply.
+
+    Raises:
+        OSError: On connection or socket failure.
+    """
+    sock = _connect(f"{directory}/.socket.sock")
+    try:
+        sock.sendall(payload)
+        chunks = []
+        while chunk := sock.recv(65536):
+            chunks.append(chunk)
+    finally:
+        sock.close()
+    return b"".join(chunks)
+
+
+def follow_events(
+    directory: str,
+    names: frozenset[bytes],
+    grep: bytes | None,
+    count: int | None,
+    out: BinaryIO,
+) -> None:
+    """Copy matching ``.socket2.sock`` lines to *out* (a binary stream).
+
+    Raises:
+        OSError: On connection or socket failure.
+    """
+    sock = _connect(f"{directory}/.socket2.sock")
+    buf = b""
+    try:
+        while count != 0 and (chunk := sock.recv(65536)):
+            *lines, buf = (buf + chunk).split(b"\n")
+            for line in lines:
+                if not line:
+                    continue
+                name, _, data = line.partition(b">>")
+                if (names and name not in names) or (grep is not None and grep not in data):
+                    continue
+                out.write(line + b"\n")
+                if count is not None:
+                    count -= 1
+                    if not count:
+                        break
+            out.flush()
+    finally:
+        sock.close()
+
+
+def _take_value(args: list[str], flag: str) -> str:
+    if not args:
+        raise UsageError(f"{flag} expects a value")
+    return args.pop(0)
+
+
+def _parse_events(args: list[str]) -> tuple[frozenset[bytes], bytes | None, int | None]:
+    names: set[bytes] = set()
+    grep: bytes | None = None
+    count: int | None = None
+    while args:
+        flag = args.pop(0)
+        if flag in ("-e", "--event"):
+            names.add(_take_value(args, flag).encode())
+        elif flag in ("-g", "--grep"):
+            grep = _take_value(args, flag).encode()
+        elif flag in ("-n", "--count"):
+            value = _take_value(args, flag)
+            if not value.isdigit() or int(value) == 0:
+                raise UsageError(f"{flag} expects a positive integer, got {value!r}")
+            count = int(value)
+        else:
+            raise UsageError(f"unknown events option {flag!r}")
+    return frozenset(names), grep, count
+
+
+def _payload(command: str, args: list[str]) -> bytes:
+    if command == "query":
+        prefix = ""
+        if args and args[0] in ("-j", "--json"):
+            args.pop(0)
+            prefix = "j/"
+        if not args:
+            raise UsageError("query expects a command, e.g. 'clients'")
+        return f"{prefix}{' '.join(args)}".encode()
+    if command == "dispatch":
+        if not args:
+            raise UsageError("dispatch expects a dispatcher, e.g. 'workspace 2'")
+        return f"dispatch {' '.join(args)}".encode()
+    if not args:
+        raise UsageError("batch expects at least one command")
+    for cmd in args:
+        if ";" in cmd or "\n" in cmd:
+            raise UsageError(f"batched command must not contain ';' or newlines: {cmd!r}")
+    return f"[[BATCH]]{';'.join(args)}".encode()
+
+
+def _run(args: list[str]) -> int:
+    signature = None
+    while args and args[0].startswith("-"):
+        flag = args.pop(0)
+        if flag in ("-h", "--help"):
+            sys.stdout.write(USAGE)
+            return 0
+        if flag in ("-V", "--version"):
+            sys.stdout.write(f"hyprland-ipc {__version__}\n")
+            return 0
+        if flag not in ("-i", "--instance"):
+            raise UsageError(f"unknown option {flag!r}")
+        signature = _take_value(args, flag)
+    if not args:
+        raise UsageError("missing command")
+    command = args.pop(0)
+    if command not in ("query", "dispatch", "batch", "events"):
+        raise UsageError(f"unknown command {command!r}")
+
+    if command == "events":
+        names, grep, count = _parse_events(args)
+        follow_events(_socket_dir(signature), names, grep, count, sys.stdout.buffer)
+        return 0
+
+    payload = _payload(command, args)
+    reply = request(_socket_dir(signature), payload).strip()
+    sys.stdout.buffer.write(reply + b"\n")
+    # Hyprland signals an error with "unknown request"
+    return 1 if reply.startswith(b"unknown") else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line.
+
+    Args:
+        argv: Arguments without the program name; defaults to ``sys.argv[1:]``.
+
+    Returns:
+        int: Exit status; 0 on success, 1 on IPC errors, 2 on usage errors.
+    """
+    try:
+        return _run(list(sys.argv[1:] if argv is None else argv))
+    except UsageError as e:
+        usage = USAGE.partition("\n")[0]
+        sys.stderr.write(f"{usage}\nhyprland-ipc: error: {e} (see --help)\n")
+        return 2
+    except OSError as e:
+        sys.stderr.write(f"hyprland-ipc: error: {e}\n")
+        return 1
+    except KeyboardInterrupt:
+        return 130
@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Columnar (struct-of-arrays) view of ``get_clients()`` output.
+
+:class:`ClientTable` stores the hot numeric fields of every client in
+:mod:`array` columns and the string fields as interned lists. Queries work on
+row indices: :meth:`ClientTable.where` narrows a selection by scanning compact
+columns and :meth:`ClientTable.sort_by` orders it, so no per-client dicts are
+built until :meth:`ClientTable.rows` is asked for them.
+
+Usage:
+    table = ClientTable.from_clients(ipc.get_clients())
+    rows = table.sort_by("x", table.where(floating=True, monitor=1))
+    addresses = table.column("address", rows)
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .ipc import AnyDict
+
+
+NUMERIC_COLUMNS = ("x", "y", "width", "height", "workspace", "pid", "monitor", "floating")
+"""Columns stored as ``array('q')``; ``floating`` holds 0 or 1."""
+
+STRING_COLUMNS = ("address", "class", "title")
+"""Columns stored as lists of interned strings."""
+
+
+def _pair(value: object) -> tuple[int, int]:
+    if isinstance(value, list | tuple) and len(value) == 2:  # noqa: PLR2004
+        return int(value[0]), int(value[1])
+    return 0, 0
+
+
+class ClientTable:
+    """Struct-of-arrays table built from a ``get_clients()`` snapshot."""
+
+    def __init__(self) -> None:
+        """Create an empty table; use :meth:`from_clients` to populate one."""
+        self.numeric: dict[str, array[int]] = {name: array("q") for name in NUMERIC_COLUMNS}
+        self.strings: dict[str, list[str]] = {name: [] for name in STRING_COLUMNS}
+
+    @classmethod
+    def from_clients(cls, clients: Iterable[AnyDict]) -> ClientTable:
+        """Build a table from client dicts as returned by ``get_clients()``.
+
+        Args:
+            clients: Client dicts; missing fields default to 0 or "".
+
+        Returns:
+            ClientTable: The populated table.
+        """
+        table = cls()
+        x, y, width, height, workspace, pid, monitor, floating = (
+            table.numeric[name].append for name in NUMERIC_COLUMNS
+        )
+        address, klass, title = (table.strings[name].append for name in STRING_COLUMNS)
+        intern = sys.intern
+
+        for client in clients:
+            at_x, at_y = _pair(client.get("at"))
+            size_w, size_h = _pair(client.get("size"))
+            ws = client.get("workspace")
+            x(at_x)
+            y(at_y)
+            width(size_w)
+            height(size_h)
+            workspace(int(ws.get("id", 0)) if isinstance(ws, dict) else 0)
+            pid(int(client.get("pid", 0)))
+            monitor(int(client.get("monitor", 0)))
+            floating(1 if client.get("floating") else 0)
+            address(intern(str(client.get("address", ""))))
+            klass(intern(str(client.get("class", ""))))
+            title(intern(str(client.get("title", ""))))
+        return table
+
+    def __len__(self) -> int:
+        """Return the number of clients in the table."""
+        return len(self.strings["address"])
+
+    def _column(self, name: str) -> Sequence[Any]:
+        return self.numeric[name] if name in self.numeric else self.strings[name]
+
+    def column(self, name: str, rows: Iterable[int] | None = None) -> list[Any]:
+        """Return the values of one column, optionally for selected rows only.
+
+        Args:
+            name: Column name from :data:`NUMERIC_COLUMNS` or :data:`STRING_COLUMNS`.
+            rows: Row indices to pick; all rows if omitted.
+
+        Raises:
+            KeyError: If *name* is not a column.
+
+        Returns:
+            list[Any]: The column values.
+        """
+        col = self._column(name)
+        if rows is None:
+            return list(col)
+        return [col[i] for i in rows]
+
+    def where(self, rows: Iterable[int] | None = None, **conditions: Any) -> list[int]:
+        """Select rows whose columns match every condition.
+
+        Each keyword names a column; its value is either compared for equality
+        (booleans match the ``floating`` 0/1 encoding) or, if callable, used as
+        a predicate on the column value.
+
+        Args:
+            rows: Rows to narrow down; all rows if omitted.
+            **conditions: ``column=value`` or ``column=predicate`` pairs.
+
+        Raises:
+            KeyError: If a condition names an unknown column.
+
+        Returns:
+            list[int]: Matching row indices in their original order.
+        """
+        selected = list(range(len(self))) if rows is None else list(rows)
+        for name, wanted in conditions.items():
+            col = self._column(name)
+            if callable(wanted):
+                selected = [i for i in selected if wanted(col[i])]
+            else:
+                target = int(wanted) if isinstance(wanted, bool) else wanted
+                selected = [i for i in selected if col[i] == target]
+            if not selected:
+                break
+        return selected
+
+    def sort_by(
+        self, name: str, rows: Iterable[int] | None = None, *, reverse: bool = False
+    ) -> list[int]:
+        """Order rows by the values of one column.
+
+        Args:
+            name: Column to sort on.
+            rows: Rows to sort; all rows if omitted.
+            reverse: Sort in descending order.
+
+        Returns:
+            list[int]: Row indices in sorted order (stable).
+        """
+        col = self._column(name)
+        selected = range(len(self)) if rows is None else rows
+        return sorted(selected, key=col.__getitem__, reverse=reverse)
+
+    def rows(self, rows: Iterable[int] | None = None) -> list[AnyDict]:
+        """Materialize rows as flat dicts keyed by column name.
+
+        Args:
+            rows: Row indices; all rows if omitted.
+
+        Returns:
+            list[AnyDict]: One dict per row.
+        """
+        names = NUMERIC_COLUMNS + STRING_COLUMNS
+        cols: list[Sequence[Any]] = [self.numeric[n] for n in NUMERIC_COLUMNS]
+        cols += [self.strings[n] for n in STRING_COLUMNS]
+        selected = range(len(self)) if rows is None else rows
+        return [dict(zip(names, (c[i] for c in cols), strict=True)) for i in selected]
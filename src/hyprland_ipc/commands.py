@@ -0,0 +1,247 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Precompiled, validated command templates.
+
+A :class:`CommandTemplate` parses its template once into encoded byte chunks
+and named slots; calling it checks the slot values and joins the bytes into a
+:class:`Command`, skipping the f-string and ``.encode()`` that
+:meth:`HyprlandIPC.send` does per call. Malformed values (a bare window
+address, a newline, a ``;`` that would split a batch) raise ``ValueError``
+before anything is sent.
+
+:class:`Dispatch` holds templates for common dispatchers and :class:`Query`
+builds a query once:
+
+Usage:
+    focus = Dispatch.focuswindow(address="0x55d0c0ffee")
+    ipc.execute(focus)
+
+    clients = Query("clients", json=True)
+    ipc.execute(clients)  # parsed JSON
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from string import Formatter
+
+from .protocol import encode_command
+
+
+type Check = Callable[[str], str]
+"""Validates (and may normalize) one slot value; raises ValueError if invalid."""
+
+
+class Command:
+    """A validated command, encoded once and reusable for any number of sends."""
+
+    __slots__ = ("json", "payload")
+
+    def __init__(self, payload: bytes, *, json: bool = False) -> None:
+        """Wrap an encoded command.
+
+        Args:
+            payload: The bytes written to ``.socket.sock``.
+            json: Whether the reply is JSON to be parsed.
+        """
+        self.payload = payload
+        self.json = json
+
+    @property
+    def text(self) -> str:
+        """The command as a string."""
+        return self.payload.decode(encoding="utf-8")
+
+    def __str__(self) -> str:
+        """Return the command as a string."""
+        return self.text
+
+    def __repr__(self) -> str:
+        """Return the representation, showing the command text."""
+        return f"{type(self).__name__}({self.text!r}, json={self.json})"
+
+    def __eq__(self, other: object) -> bool:
+        """Commands are equal when they send the same bytes."""
+        if not isinstance(other, Command):
+            return NotImplemented
+        return (self.payload, self.json) == (other.payload, other.json)
+
+    def __hash__(self) -> int:
+        """Hash of the payload, so commands can key caches."""
+        return hash((self.payload, self.json))
+
+
+def _check_text(value: str, what: str = "Command") -> None:
+    if not value:
+        raise ValueError(f"{what} must not be empty")
+    if "\n" in value or "\0" in value:
+        raise ValueError(f"{what} must be a single line: {value!r}")
+
+
+class Query(Command):
+    """A query command such as ``clients`` or ``getoption general:gaps_in``."""
+
+    __slots__ = ()
+
+    def __init__(self, command: str, *, json: bool = False) -> None:
+        """Validate and encode a query.
+
+        Args:
+            command: The query without any flag prefix (e.g. 'clients').
+            json: Request JSON ('j/' prefix) and parse the reply.
+
+        Raises:
+            ValueError: If *command* is empty, spans lines, or already carries
+                a 'j/' prefix, a dispatch or a batch.
+        """
+        _check_text(command, "Query")
+        if command.startswith(("j/", "dispatch ", "[[BATCH]]")):
+            raise ValueError(f"Not a plain query (use json=True or Dispatch): {command!r}")
+        super().__init__(encode_command(f"j/{command}" if json else command), json=json)
+
+
+# -- slot checks ---------------------------------------------------------------
+
+_ADDRESS = re.compile(r"0x[0-9a-fA-F]+")
+_DIRECTIONS = frozenset("lrud")
+
+
+def argument(value: str) -> str:
+    """Accept a single-line value without ``;`` (which separates batched commands)."""
+    _check_text(value, "Argument")
+    if ";" in value:
+        raise ValueError(f"Argument must not contain ';': {value!r}")
+    return value
+
+
+def text(value: str) -> str:
+    """Accept any non-empty single-line value, e.g. a shell command for ``exec``."""
+    _check_text(value, "Argument")
+    return value
+
+
+def address(value: str) -> str:
+    """Accept a window address, adding the ``0x`` prefix events omit."""
+    value = value if value.startswith("0x") else f"0x{value}"
+    if not _ADDRESS.fullmatch(value):
+        raise ValueError(f"Invalid window address: {value!r}")
+    return value
+
+
+def direction(value: str) -> str:
+    """Accept one of the directions ``l``, ``r``, ``u`` or ``d``."""
+    if value not in _DIRECTIONS:
+        raise ValueError(f"Invalid direction (expected l, r, u or d): {value!r}")
+    return value
+
+
+def integer(value: str) -> str:
+    """Accept a (possibly negative) integer."""
+    try:
+        return str(int(value))
+    except ValueError:
+        raise ValueError(f"Expected an integer: {value!r}") from None
+
+
+class CommandTemplate:
+    """A command with named ``{slots}``, parsed and encoded once.
+
+    Usage:
+        resize = CommandTemplate(
+            "dispatch resizewindowpixel exact {w} {h},address:{address}",
+            w=integer, h=integer, address=address,
+        )
+        ipc.execute(resize(w=800, h=600, address="0xabc"))
+    """
+
+    __slots__ = ("_constant", "_parts", "json", "slots", "template")
+
+    def __init__(self, template: str, *, json: bool = False, **checks: Check) -> None:
+        """Parse *template* into literal byte chunks and slots.
+
+        Args:
+            template: Command text with ``{name}`` slots, without 'j/'.
+            json: Request JSON and parse the reply (for query templates).
+            **checks: Check per slot name; slots without one use
+                :func:`argument`.
+
+        Raises:
+            ValueError: If the template is malformed, uses positional or
+                formatted slots, or *checks* names a slot it does not have.
+        """
+        parts: list[tuple[bytes, str | None]] = []
+        try:
+            parsed = list(Formatter().parse(template))
+        except ValueError as e:
+            raise ValueError(f"Malformed command template {template!r}: {e}") from None
+        for literal, name, spec, conversion in parsed:
+            if name is not None and (not name.isidentifier() or spec or conversion):
+                raise ValueError(f"Slots must be plain {{name}} fields: {template!r}")
+            parts.append((encode_command(literal), name))
+        if json:
+            parts.insert(0, (b"j/", None))
+
+        self.template = template
+        self.json = json
+        self.slots = frozenset(name for _, name in parts if name is not None)
+        if unknown := checks.keys() - self.slots:
+            raise ValueError(f"Checks for unknown slots {sorted(unknown)} in {template!r}")
+        _check_text(template, "Template")
+        self._parts = tuple(
+            (literal, None if name is None else (name, checks.get(name, argument)))
+            for literal, name in parts
+        )
+        self._constant = None if self.slots else Command(b"".join(p for p, _ in parts), json=json)
+
+    def __call__(self, **values: object) -> Command:
+        """Fill the slots and return the encoded command.
+
+        Args:
+            **values: One value per slot; converted with ``str()`` and checked.
+
+        Raises:
+            TypeError: If a slot is missing or an unknown one is given.
+            ValueError: If a value fails its slot's check.
+
+        Returns:
+            Command: Ready to pass to :meth:`HyprlandIPC.execute`.
+        """
+        if self._constant is not None and not values:
+            return self._constant
+        if values.keys() != self.slots:
+            raise TypeError(
+                f"{self.template!r} takes slots {sorted(self.slots)}, got {sorted(values)}"
+            )
+        chunks: list[bytes] = []
+        for literal, slot in self._parts:
+            chunks.append(literal)
+            if slot is not None:
+                name, check = slot
+                chunks.append(check(str(values[name])).encode(encoding="utf-8"))
+        return Command(b"".join(chunks), json=self.json)
+
+    def __repr__(self) -> str:
+        """Return the representation, showing the template text."""
+        return f"CommandTemplate({self.template!r})"
+
+
+class Dispatch:
+    """Templates for common dispatchers (see https://wiki.hyprland.org/Configuring/Dispatchers/)."""
+
+    exec = CommandTemplate("dispatch exec {command}", command=text)
+    killactive = CommandTemplate("dispatch killactive")
+    closewindow = CommandTemplate("dispatch closewindow address:{address}", address=address)
+    focuswindow = CommandTemplate("dispatch focuswindow address:{address}", address=address)
+    workspace = CommandTemplate("dispatch workspace {workspace}")
+    movetoworkspace = CommandTemplate("dispatch movetoworkspace {workspace}")
+    movetoworkspacesilent = CommandTemplate("dispatch movetoworkspacesilent {workspace}")
+    togglespecialworkspace = CommandTemplate("dispatch togglespecialworkspace {name}")
+    movefocus = CommandTemplate("dispatch movefocus {direction}", direction=direction)
+    movewindow = CommandTemplate("dispatch movewindow {direction}", direction=direction)
+    togglefloating = CommandTemplate("dispatch togglefloating")
+    fullscreen = CommandTemplate("dispatch fullscreen {mode}", mode=integer)
+    pin = CommandTemplate("dispatch pin")
+    cyclenext = CommandTemplate("dispatch cyclenext")
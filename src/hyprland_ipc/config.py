@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Cached config options and diff-based bulk ``keyword`` application.
+
+:class:`OptionCache` answers ``getoption`` from memory after the first query
+and forgets everything on ``configreloaded``. Options not cached yet are
+fetched together in one ``[[BATCH]]`` request.
+
+Hyprland emits no event when another client changes an option (``hyprctl
+keyword``, another script), so such changes leave the cache stale. Call
+:meth:`OptionCache.invalidate` when other clients may set options you read.
+
+:meth:`OptionCache.apply_config` compares the wanted values with the current
+ones and sends only the ``keyword`` commands that change something, all in one
+batched request:
+
+Usage:
+    options = OptionCache(ipc)
+    options.apply_config({"general:gaps_in": 5, "decoration:rounding": 8})
+    for event in ipc.events():
+        options.handle_event(event)
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .commands import CommandTemplate
+from .ipc import AnyDict, Event, HyprlandIPC, HyprlandIPCError
+
+
+_GETOPTION = CommandTemplate("getoption {name}")
+_KEYWORD = CommandTemplate("keyword {name} {value}")
+
+_METADATA = frozenset({"option", "set"})
+
+# "ok" replies at either end of a line; Hyprland may concatenate them ("okok").
+_OK = re.compile(r"^(?:ok)+|(?:ok)+$")
+
+
+def option_value(reply: AnyDict) -> Any:
+    """Return the value from a ``j/getoption`` reply.
+
+    Hyprland stores it under a key naming its type (``int``, ``float``,
+    ``str``, ``custom``, ``vec2``...), next to ``option`` and ``set``.
+
+    Raises:
+        HyprlandIPCError: If the reply holds no value.
+    """
+    for key, value in reply.items():
+        if key not in _METADATA:
+            return value
+    raise HyprlandIPCError(f"getoption reply without a value: {reply!r}")
+
+
+def format_value(value: Any) -> str:
+    """Format a Python value the way ``keyword`` expects it.
+
+    ``True`` / ``False`` become ``1`` / ``0`` and sequences (``vec2``) are
+    space-separated.
+    """
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, float):
+        return f"{value:g}"
+    if isinstance(value, list | tuple):
+        return " ".join(format_value(v) for v in value)
+    return str(value).strip()
+
+
+def _same(current: Any, wanted: Any) -> bool:
+    a, b = format_value(current), format_value(wanted)
+    if a == b:
+        return True
+    try:
+        return float(a) == float(b)
+    except ValueError:
+        return False
+
+
+def _rejections(reply: str) -> list[str]:
+    """Return the error messages in a batched ``keyword`` reply.
+
+    The per-command replies may be separated by blank lines or simply
+    concatenated, depending on the Hyprland version; both are accepted.
+    """
+    errors = (_OK.sub("", line.strip()).strip() for line in reply.splitlines())
+    return [error for error in errors if error]
+
+
+class OptionCache:
+    """Config option values cached until the next ``configreloaded``.
+
+    Values the cache cannot compare exactly (a color given as ``rgba(...)``
+    but reported as an integer, say) count as different, so
+    :meth:`apply_config` may resend them but never skips a real change.
+    """
+
+    def __init__(self, ipc: HyprlandIPC) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            ipc: Client used for queries and keyword commands.
+        """
+        self.ipc = ipc
+        self._values: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if option *name* is cached."""
+        return name in self._values
+
+    def get(self, name: str) -> Any:
+        """Return the value of one option.
+
+        Args:
+            name: Option name, e.g. 'general:gaps_in'.
+
+        Raises:
+            HyprlandIPCError: If the query failed or the option is unknown.
+        """
+        return self.get_many([name])[name]
+
+    def get_many(self, names: Iterable[str]) -> dict[str, Any]:
+        """Return several options, fetching the uncached ones in one request.
+
+        Raises:
+            HyprlandIPCError: If the query failed or an option is unknown.
+        """
+        names = list(dict.fromkeys(names))
+        with self._lock:
+            found = {n: self._values[n] for n in names if n in self._values}
+            self.hits += len(found)
+            self.misses += len(names) - len(found)
+        missing = [n for n in names if n not in found]
+        if missing:
+            commands = [_GETOPTION(name=n).text for n in missing]
+            replies = self.ipc.send_json_batch(commands)
+            fetched = {n: option_value(r) for n, r in zip(missing, replies, strict=True)}
+            with self._lock:
+                self._values.update(fetched)
+            found.update(fetched)
+        return {n: found[n] for n in names}
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Forget one option, or every option if *name* is None."""
+        with self._lock:
+            if name is None:
+                self._values.clear()
+            else:
+                self._values.pop(name, None)
+
+    def handle_event(self, event: Event) -> None:
+        """Apply an event from :meth:`HyprlandIPC.events`."""
+        if event.name == "configreloaded":
+            self.invalidate()
+
+    def apply_config(self, config: Mapping[str, Any]) -> list[str]:
+        """Set options, sending only those whose value differs.
+
+        Current values come from the cache (uncached ones are fetched in one
+        batched query); the differing ``keyword`` commands then go out in one
+        more batched request, and the cache records the new values.
+
+        Args:
+            config: Option name to wanted value.
+
+        Raises:
+            ValueError: If a name or value cannot be sent as a keyword.
+            HyprlandIPCError: On IPC failure, or if Hyprland rejected any
+                keyword; the cache then forgets every option in *config*.
+
+        Returns:
+            list[str]: Names of the options that were sent, in order.
+        """
+        current = self.get_many(config)
+        changed = {n: v for n, v in config.items() if not _same(current[n], v)}
+        if not changed:
+            return []
+        commands = [_KEYWORD(name=n, value=format_value(v)).text for n, v in changed.items()]
+        try:
+            reply = self.ipc.send_batch(commands)
+            errors = _rejections(reply)
+            if errors:
+                raise HyprlandIPCError(f"Hyprland rejected keywords: {'; '.join(errors)}")
+        except HyprlandIPCError:
+            for name in changed:
+                self.invalidate(name)
+            raise
+        with self._lock:
+            self._values.update(changed)
+        return list(changed)
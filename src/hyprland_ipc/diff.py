@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Keyed diffing of client, workspace and monitor snapshots.
+
+Snapshots are indexed by their key (``address`` for clients, ``id`` for
+workspaces and monitors) so a diff is O(n) instead of a nested scan. Entries
+that did not change are recognized by identity or a single C-level ``==``
+before any per-field walk happens, which keeps the common "nothing moved"
+poll cheap. :meth:`SnapshotDiffer.update_raw` takes the raw reply instead and
+skips parsing altogether when it is byte-for-byte the previous one.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .ipc import AnyDict
+
+
+type FieldPath = tuple[str | int, ...]
+"""Path to a changed value, e.g. ``("workspace", "id")`` or ``("at", 0)``."""
+
+_KEY_CANDIDATES = ("address", "id")
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """Result of comparing two snapshots."""
+
+    added: dict[Hashable, AnyDict] = field(default_factory=dict)
+    removed: dict[Hashable, AnyDict] = field(default_factory=dict)
+    changed: dict[Hashable, list[FieldPath]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        """Return True if anything was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+
+def _infer_key(*snapshots: Sequence[AnyDict]) -> str:
+    for snapshot in snapshots:
+        for item in snapshot:
+            for candidate in _KEY_CANDIDATES:
+                if candidate in item:
+                    return candidate
+            break
+    return _KEY_CANDIDATES[0]
+
+
+def diff_values(old: Any, new: Any, path: FieldPath = ()) -> list[FieldPath]:
+    """Return the paths at which two JSON values differ.
+
+    Dicts are compared key by key and equal-length lists element by element;
+    anything else that differs is reported at its own path.
+
+    Args:
+        old: Previous value.
+        new: Current value.
+        path: Prefix prepended to every reported path.
+
+    Returns:
+        list[FieldPath]: Paths of differing values, empty if equal.
+    """
+    if old is new or old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes: list[FieldPath] = []
+        for name in old.keys() | new.keys():
+            if name not in old or name not in new:
+                changes.append((*path, name))
+            else:
+                changes.extend(diff_values(old[name], new[name], (*path, name)))
+        return sorted(changes, key=str)
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = []
+        for index, (a, b) in enumerate(zip(old, new, strict=True)):
+            changes.extend(diff_values(a, b, (*path, index)))
+        return changes
+    return [path]
+
+
+def diff_snapshots(
+    old: Sequence[AnyDict], new: Sequence[AnyDict], key: str | None = None
+) -> SnapshotDiff:
+    """Compare two snapshots of clients, workspaces or monitors.
+
+    Args:
+        old: Previous snapshot, e.g. an earlier ``get_clients()`` result.
+        new: Current snapshot.
+        key: Field identifying an entry. Defaults to ``address`` when the
+            entries have one, otherwise ``id``.
+
+    Returns:
+        SnapshotDiff: Added and removed entries plus changed field paths.
+    """
+    key = key or _infer_key(new, old)
+    old_index = {item.get(key): item for item in old}
+    new_index = {item.get(key): item for item in new}
+
+    added: dict[Hashable, AnyDict] = {}
+    changed: dict[Hashable, list[FieldPath]] = {}
+    for ident, current in new_index.items():
+        previous = old_index.get(ident)
+        if previous is None:
+            added[ident] = current
+        elif previous is not current and previous != current:
+            changed[ident] = diff_values(previous, current)
+
+    removed = {ident: item for ident, item in old_index.items() if ident not in new_index}
+    return SnapshotDiff(added, removed, changed)
+
+
+class SnapshotDiffer:
+    """Remember the last snapshot and diff each new one against it.
+
+    Usage:
+        differ = SnapshotDiffer()
+        while True:
+            if changes := differ.update(ipc.get_clients()):
+                ...
+    """
+
+    def __init__(self, key: str | None = None) -> None:
+        """Initialize with no previous snapshot.
+
+        Args:
+            key: Field identifying an entry (see :func:`diff_snapshots`).
+        """
+        self.key = key
+        self.previous: Sequence[AnyDict] = []
+        self._raw: str | bytes | None = None
+
+    def update(self, snapshot: Sequence[AnyDict]) -> SnapshotDiff:
+        """Diff *snapshot* against the previous one and remember it.
+
+        Args:
+            snapshot: The current snapshot.
+
+        Returns:
+            SnapshotDiff: Changes since the previous call.
+        """
+        result = diff_snapshots(self.previous, snapshot, self.key)
+        self.previous = snapshot
+        self._raw = None
+        return result
+
+    def update_raw(self, reply: str | bytes) -> SnapshotDiff:
+        """Like :meth:`update`, but take the unparsed JSON reply.
+
+        A reply equal to the one passed last time returns an empty diff
+        without being parsed; polling an idle compositor then costs one
+        string comparison instead of ``json.loads`` plus a diff.
+
+        Args:
+            reply: A JSON array reply, e.g. ``ipc.send("j/clients")``.
+
+        Raises:
+            ValueError: If *reply* is not valid JSON.
+
+        Returns:
+            SnapshotDiff: Changes since the previous call.
+        """
+        if reply == self._raw:
+            return SnapshotDiff()
+        result = self.update(json.loads(reply))
+        self._raw = reply
+        return result
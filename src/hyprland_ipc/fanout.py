@@ -0,0 +1,253 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Multi-consumer fan-out of a single event stream.
+
+:class:`EventFanout` reads one :meth:`HyprlandIPC.events` connection and
+appends each event to a bounded shared buffer. Every :class:`Subscription`
+iterates the buffer with its own cursor, so fast consumers never wait for slow
+ones. When the buffer is full and a consumer still has not read the oldest
+event, that consumer's overflow policy decides what happens:
+
+- ``"block"``: the producer waits until the consumer catches up;
+- ``"drop-oldest"``: the consumer skips the event and its ``dropped`` counter
+  increases;
+- ``"coalesce"``: the consumer keeps only the newest evicted event per key
+  (the event name by default) and counts the ones it replaced as dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import Literal, Self
+
+from .ipc import Event, HyprlandIPCError
+
+
+type OverflowPolicy = Literal["block", "drop-oldest", "coalesce"]
+"""What a lagging subscription does when the shared buffer overflows."""
+
+_POLICIES = frozenset({"block", "drop-oldest", "coalesce"})
+
+
+def _event_name(event: Event) -> Hashable:
+    return event.name
+
+
+class Subscription:
+    """An independent cursor over an :class:`EventFanout` buffer.
+
+    Iterating blocks until the next event is available and stops once the
+    source is exhausted and everything was consumed.
+    """
+
+    def __init__(
+        self,
+        fanout: EventFanout,
+        cursor: int,
+        policy: OverflowPolicy,
+        key: Callable[[Event], Hashable],
+    ) -> None:
+        """Create a subscription; use :meth:`EventFanout.subscribe` instead."""
+        self._fanout = fanout
+        self.cursor = cursor
+        self.policy = policy
+        self.key = key
+        self.dropped = 0
+        self.closed = False
+        self._coalesced: OrderedDict[Hashable, Event] = OrderedDict()
+
+    @property
+    def lag(self) -> int:
+        """Number of events buffered for this subscription but not yet read."""
+        with self._fanout._cond:
+            return self._fanout._head - self.cursor + len(self._coalesced)
+
+    def _evict(self, event: Event) -> None:
+        """Account for the shared buffer dropping *event* before we read it."""
+        self.cursor += 1
+        if self.policy == "coalesce":
+            key = self.key(event)
+            if self._coalesced.pop(key, None) is not None:
+                self.dropped += 1
+            self._coalesced[key] = event
+        else:
+            self.dropped += 1
+
+    def get(self, timeout: float | None = None) -> Event | None:
+        """Return the next event.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Raises:
+            HyprlandIPCError: If the source failed and no events remain.
+
+        Returns:
+            Event | None: The event, or None on timeout or end of stream.
+        """
+        fanout = self._fanout
+        with fanout._cond:
+            ready = fanout._cond.wait_for(
+                lambda: (
+                    self.closed or self._coalesced or self.cursor < fanout._head or fanout._done
+                ),
+                timeout,
+            )
+            if not ready or self.closed:
+                return None
+            if self._coalesced:
+                return self._coalesced.popitem(last=False)[1]
+            if self.cursor < fanout._head:
+                event = fanout._buffer[self.cursor - fanout._base]
+                self.cursor += 1
+                fanout._cond.notify_all()
+                return event
+            if fanout._error is not None:
+                raise HyprlandIPCError(f"Event source failed: {fanout._error}") from fanout._error
+            return None
+
+    def __iter__(self) -> Iterator[Event]:
+        """Iterate until the source is exhausted or the subscription closed."""
+        while not self.closed and (event := self.get()) is not None:
+            yield event
+
+    def close(self) -> None:
+        """Detach from the fan-out so this cursor never holds the producer back."""
+        self._fanout._unsubscribe(self)
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close on context exit."""
+        self.close()
+
+
+class EventFanout:
+    """Share one event stream between several independent consumers.
+
+    Usage:
+        fanout = EventFanout(ipc.events(), capacity=1024)
+        bar = fanout.subscribe("coalesce")
+        logger = fanout.subscribe("block")
+        fanout.start()
+        for event in bar:
+            ...
+    """
+
+    def __init__(self, source: Iterable[Event], capacity: int = 1024) -> None:
+        """Initialize the fan-out.
+
+        Args:
+            source: Event iterable, usually :meth:`HyprlandIPC.events`.
+            capacity: Maximum number of events held in the shared buffer.
+
+        Raises:
+            ValueError: If *capacity* is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.source = source
+        self.capacity = capacity
+        self._buffer: deque[Event] = deque()
+        self._base = 0
+        self._head = 0
+        self._subs: list[Subscription] = []
+        self._cond = threading.Condition()
+        self._done = False
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+
+    def subscribe(
+        self,
+        policy: OverflowPolicy = "drop-oldest",
+        key: Callable[[Event], Hashable] = _event_name,
+    ) -> Subscription:
+        """Create a new consumer that starts at the next published event.
+
+        Args:
+            policy: Overflow policy for this consumer.
+            key: Coalescing key (only used by ``"coalesce"``).
+
+        Raises:
+            ValueError: If *policy* is unknown.
+
+        Returns:
+            Subscription: The new consumer.
+        """
+        if policy not in _POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy!r}")
+        with self._cond:
+            sub = Subscription(self, self._head, policy, key)
+            self._subs.append(sub)
+            return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._cond:
+            sub.closed = True
+            if sub in self._subs:
+                self._subs.remove(sub)
+            self._cond.notify_all()
+
+    def publish(self, event: Event) -> None:
+        """Append one event to the shared buffer, applying overflow policies.
+
+        Blocks while the buffer is full and a ``"block"`` subscriber has not
+        read the oldest event yet.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: (
+                    len(self._buffer) < self.capacity
+                    or not any(s.policy == "block" and s.cursor == self._base for s in self._subs)
+                )
+            )
+            if len(self._buffer) >= self.capacity:
+                oldest = self._buffer.popleft()
+                for sub in self._subs:
+                    if sub.cursor == self._base:
+                        sub._evict(oldest)
+                self._base += 1
+            self._buffer.append(event)
+            self._head += 1
+            self._cond.notify_all()
+
+    def pump(self) -> None:
+        """Publish every event from the source in the calling thread."""
+        try:
+            for event in self.source:
+                self.publish(event)
+        except Exception as e:
+            self._error = e
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def start(self) -> None:
+        """Run :meth:`pump` in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.pump, name="hyprland-fanout", daemon=True)
+            self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for the pump thread to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self) -> Self:
+        """Start pumping and return self."""
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Detach every subscription so a blocked producer can finish."""
+        with self._cond:
+            subs = list(self._subs)
+        for sub in subs:
+            sub.close()
@@ -0,0 +1,208 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Most-recently-used window focus history, kept current from events.
+
+:class:`FocusHistory` keeps window addresses in focus order, globally and per
+workspace, so "previous window", alt-tab order and "last focused on workspace
+N" need no ``get_clients()`` query sorted by ``focusHistoryID``.
+
+Both orders are insertion-ordered dicts used as linked lists: focusing a
+window removes and re-appends its key, and the most recent window is the last
+key, so a focus change, a close and the "most recent" lookups are O(1).
+
+It is seeded once from ``get_clients()`` and then follows ``activewindowv2``
+(focus), ``closewindow`` (prune), ``movewindowv2`` (workspace change) and
+``workspacev2`` / ``focusedmonv2`` (active workspace, used for windows it has
+not seen yet).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from itertools import islice
+
+from .ipc import AnyDict, Event, HyprlandIPC
+from .schema import window_address
+
+
+def _workspace_id(client: AnyDict) -> int | None:
+    ws = client.get("workspace")
+    return int(ws["id"]) if isinstance(ws, dict) and "id" in ws else None
+
+
+def _parse_id(raw: str) -> int | None:
+    return int(raw) if raw.lstrip("-").isdigit() else None
+
+
+class FocusHistory:
+    """Window addresses in most-recently-focused order.
+
+    Usage:
+        history = FocusHistory.from_ipc(ipc)
+        for event in ipc.events():
+            history.handle_event(event)
+        ipc.dispatch(f"focuswindow address:{history.previous()}")
+    """
+
+    def __init__(self) -> None:
+        """Create an empty history."""
+        self._order: dict[str, None] = {}
+        self._by_workspace: dict[int, dict[str, None]] = {}
+        self._workspace: dict[str, int] = {}
+        self.active_workspace: int | None = None
+
+    @classmethod
+    def from_clients(cls, clients: Iterable[AnyDict]) -> FocusHistory:
+        """Build a history from a ``get_clients()`` snapshot.
+
+        Args:
+            clients: Client dicts; ``focusHistoryID`` 0 is the most recent.
+
+        Returns:
+            FocusHistory: The seeded history.
+        """
+        history = cls()
+        history.sync(clients)
+        return history
+
+    @classmethod
+    def from_ipc(cls, ipc: HyprlandIPC) -> FocusHistory:
+        """Build a history from the clients and active workspace of *ipc*."""
+        history = cls.from_clients(ipc.get_clients())
+        ws_id = ipc.get_active_workspace().get("id")
+        history.active_workspace = ws_id if isinstance(ws_id, int) else None
+        return history
+
+    def __len__(self) -> int:
+        """Return the number of tracked windows."""
+        return len(self._order)
+
+    def __contains__(self, address: object) -> bool:
+        """Return True if *address* is tracked."""
+        return address in self._order
+
+    # -- maintenance ---------------------------------------------------------
+
+    def sync(self, clients: Iterable[AnyDict]) -> None:
+        """Replace the history with a fresh ``get_clients()`` snapshot."""
+        ranked = sorted(
+            (c for c in clients if c.get("address")),
+            key=lambda c: c.get("focusHistoryID", -1),
+            reverse=True,
+        )
+        self._order.clear()
+        self._by_workspace.clear()
+        self._workspace.clear()
+        for client in ranked:
+            self.focus(str(client["address"]), _workspace_id(client))
+
+    def focus(self, address: str, workspace: int | None = None) -> None:
+        """Mark a window as the most recently focused one.
+
+        Args:
+            address: Window address.
+            workspace: Its workspace id; defaults to the one already known,
+                else :attr:`active_workspace`.
+        """
+        if workspace is None:
+            workspace = self._workspace.get(address, self.active_workspace)
+        old = self._workspace.get(address)
+        self._order.pop(address, None)
+        self._order[address] = None
+        if old is not None and old != workspace:
+            self._discard(old, address)
+        if workspace is None:
+            self._workspace.pop(address, None)
+            return
+        self._workspace[address] = workspace
+        windows = self._by_workspace.setdefault(workspace, {})
+        windows.pop(address, None)
+        windows[address] = None
+
+    def remove(self, address: str) -> None:
+        """Forget a window (no-op if absent)."""
+        self._order.pop(address, None)
+        if (workspace := self._workspace.pop(address, None)) is not None:
+            self._discard(workspace, address)
+
+    def move(self, address: str, workspace: int) -> None:
+        """Record that a window moved to another workspace, keeping its rank."""
+        old = self._workspace.get(address)
+        if address not in self._order or old == workspace:
+            return
+        if old is not None:
+            self._discard(old, address)
+        self._workspace[address] = workspace
+        # Rare compared to focus changes: rebuild the target in global order.
+        self._by_workspace[workspace] = {
+            a: None for a in self._order if self._workspace.get(a) == workspace
+        }
+
+    def _discard(self, workspace: int, address: str) -> None:
+        windows = self._by_workspace.get(workspace)
+        if windows is not None:
+            windows.pop(address, None)
+            if not windows:
+                del self._by_workspace[workspace]
+
+    def handle_event(self, event: Event) -> None:
+        """Apply an event from :meth:`HyprlandIPC.events`."""
+        name = event.name
+        if name == "activewindowv2":
+            if event.data and event.data != ",":
+                self.focus(window_address(event.data))
+        elif name == "closewindow":
+            self.remove(window_address(event.data))
+        elif name == "movewindowv2":
+            address, _, rest = event.data.partition(",")
+            if (ws_id := _parse_id(rest.partition(",")[0])) is not None:
+                self.move(window_address(address), ws_id)
+        elif name == "workspacev2":
+            self.active_workspace = _parse_id(event.data.partition(",")[0])
+        elif name == "focusedmonv2":
+            self.active_workspace = _parse_id(event.data.rpartition(",")[2])
+
+    # -- queries -------------------------------------------------------------
+
+    @property
+    def current(self) -> str | None:
+        """The most recently focused window, or None."""
+        return next(reversed(self._order), None)
+
+    def previous(self, workspace: int | None = None) -> str | None:
+        """The window focused before the current one (the alt-tab target).
+
+        Args:
+            workspace: Only consider windows on this workspace.
+        """
+        order = self._order if workspace is None else self._by_workspace.get(workspace, {})
+        recent = reversed(order)
+        next(recent, None)
+        return next(recent, None)
+
+    def last_on(self, workspace: int) -> str | None:
+        """The most recently focused window on *workspace*, or None."""
+        return next(reversed(self._by_workspace.get(workspace, {})), None)
+
+    def entries(self) -> list[tuple[str, int | None]]:
+        """``(address, workspace id)`` pairs, least recently focused first.
+
+        Replaying them through :meth:`focus` rebuilds the same history.
+        """
+        return [(address, self._workspace.get(address)) for address in self._order]
+
+    def workspace_of(self, address: str) -> int | None:
+        """The workspace id a window was last seen on, or None."""
+        return self._workspace.get(address)
+
+    def order(self, workspace: int | None = None, limit: int | None = None) -> list[str]:
+        """Window addresses, most recently focused first (alt-tab order).
+
+        Args:
+            workspace: Only list windows on this workspace.
+            limit: Return at most this many addresses.
+        """
+        order = self._order if workspace is None else self._by_workspace.get(workspace, {})
+        return list(islice(reversed(order), limit))
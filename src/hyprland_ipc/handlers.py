@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Concurrent event handling with per-key ordering.
+
+:class:`EventDispatcher` runs an event handler for many events at once while
+keeping events that share a key in order. Sync handlers run on a thread pool;
+coroutine functions run on a private asyncio loop thread. At most
+``concurrency`` events are in flight, and :meth:`EventDispatcher.submit` blocks
+once that limit is reached, which pushes back on the reader instead of
+queueing without bound.
+
+Keys decide what must stay ordered: :func:`by_name` serializes per event name,
+:func:`by_window` per window address (falling back to the event name for
+events that are not about a window).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Self
+
+from .ipc import Event, HyprlandIPCError
+from .schema import WINDOW_EVENTS, window_address
+
+
+type EventHandler = Callable[[Event], Any] | Callable[[Event], Awaitable[Any]]
+"""A sync callable or a coroutine function accepting an Event."""
+
+type EventKey = Callable[[Event], Hashable]
+"""Maps an event to its ordering key."""
+
+
+def by_name(event: Event) -> Hashable:
+    """Order events per event name."""
+    return event.name
+
+
+def by_window(event: Event) -> Hashable:
+    """Order events per window address, or per name for non-window events."""
+    if event.name in WINDOW_EVENTS:
+        return window_address(event.data.partition(",")[0])
+    return event.name
+
+
+class EventDispatcher:
+    """Run a handler concurrently while preserving order within each key.
+
+    Usage:
+        async def handler(event: Event) -> None: ...
+
+        with EventDispatcher(handler, concurrency=8, key=by_window) as dispatcher:
+            for event in ipc.events():
+                dispatcher.submit(event)
+    """
+
+    def __init__(
+        self, handler: EventHandler, *, concurrency: int = 8, key: EventKey = by_name
+    ) -> None:
+        """Initialize the dispatcher and its worker pool or event loop.
+
+        Args:
+            handler: Sync callable or coroutine function accepting an Event.
+            concurrency: Maximum number of events handled at once.
+            key: Ordering key; events with equal keys run one after another.
+
+        Raises:
+            ValueError: If *concurrency* is not positive.
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.handler = handler
+        self.key = key
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._chains: dict[Hashable, deque[Event]] = {}
+        self._in_flight = 0
+        self._error: BaseException | None = None
+
+        self._pool: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._run: Callable[[Event], Future[Any]]
+        if inspect.iscoroutinefunction(handler):
+            loop = self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=loop.run_forever, name="hyprland-handlers", daemon=True
+            )
+            self._loop_thread.start()
+            self._run = lambda event: asyncio.run_coroutine_threadsafe(handler(event), loop)
+        else:
+            pool = self._pool = ThreadPoolExecutor(
+                concurrency, thread_name_prefix="hyprland-handler"
+            )
+            self._run = lambda event: pool.submit(handler, event)
+
+    def submit(self, event: Event) -> None:
+        """Schedule *event*; blocks while ``concurrency`` events are in flight.
+
+        Raises:
+            HyprlandIPCError: If an earlier handler call failed.
+        """
+        self._raise_pending_error()
+        key = self.key(event)
+        self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+            chain = self._chains.get(key)
+            if chain is not None:
+                chain.append(event)
+                return
+            self._chains[key] = deque()
+        self._start(key, event)
+
+    def _start(self, key: Hashable, event: Event) -> None:
+        future: Future[Any]
+        try:
+            future = self._run(event)
+        except Exception as e:
+            # Report it like a failed handler so the slot and key are released.
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(lambda f: self._finished(key, f))
+
+    def _finished(self, key: Hashable, future: Future[Any]) -> None:
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            if error is not None and self._error is None:
+                self._error = error
+            chain = self._chains[key]
+            following = chain.popleft() if chain else None
+            if following is None:
+                del self._chains[key]
+            self._in_flight -= 1
+            self._idle.notify_all()
+        self._slots.release()
+        if following is not None:
+            self._start(key, following)
+
+    def _raise_pending_error(self) -> None:
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise HyprlandIPCError(f"Event handler failed: {error}") from error
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted event has been handled.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def close(self) -> None:
+        """Wait for outstanding events, then stop the pool or loop.
+
+        Raises:
+            HyprlandIPCError: If a handler call failed and was not yet reported.
+        """
+        self.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        if self._loop is not None and self._loop_thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+        self._raise_pending_error()
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close on context exit."""
+        self.close()
@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Bounded in-memory history of Hyprland events.
+
+:class:`EventHistory` keeps the most recent events in fixed-capacity,
+array-backed ring buffers instead of a list of :class:`Event` objects:
+
+- sequence numbers, timestamps, name ids, data offsets and lengths live in
+  :mod:`array` columns indexed by ``seq % capacity``;
+- event names are interned into a small table and stored as ids;
+- event data is UTF-8 encoded into a circular byte arena addressed by
+  monotonically increasing offsets, so an entry's bytes are valid for as long
+  as the arena has not wrapped past them.
+
+Entries are evicted when either the slot ring or the byte arena runs out of
+room. Late or restarted consumers catch up with :meth:`EventHistory.since` or
+:meth:`EventHistory.window`; only those queries build :class:`Event` objects.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from .ipc import Event
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    """An event retrieved from :class:`EventHistory`."""
+
+    seq: int
+    timestamp: float
+    event: Event
+
+
+class EventHistory:
+    """Fixed-capacity ring buffer of events with monotonic sequence numbers.
+
+    Usage:
+        history = EventHistory(capacity=4096)
+        for event in history.tap(ipc.events()):
+            ...
+        # elsewhere, e.g. in a restarted handler:
+        for entry in history.since(last_seen_seq):
+            ...
+    """
+
+    def __init__(self, capacity: int = 4096, data_capacity: int | None = None) -> None:
+        """Allocate the buffers.
+
+        Args:
+            capacity: Maximum number of events retained.
+            data_capacity: Size in bytes of the data arena; defaults to
+                128 bytes per event slot.
+
+        Raises:
+            ValueError: If a capacity is not positive.
+        """
+        data_capacity = capacity * 128 if data_capacity is None else data_capacity
+        if capacity <= 0 or data_capacity <= 0:
+            raise ValueError("capacity and data_capacity must be positive")
+        self.capacity = capacity
+        self.data_capacity = data_capacity
+        self.truncated = 0  # events whose data was cut to fit the arena
+
+        self._seq = array("Q", bytes(8 * capacity))
+        self._time = array("d", bytes(8 * capacity))
+        self._name = array("H", bytes(2 * capacity))
+        self._offset = array("Q", bytes(8 * capacity))
+        self._length = array("I", bytes(4 * capacity))
+        self._arena = bytearray(data_capacity)
+        self._write_pos = 0
+        self._names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._first = 1
+        self._next = 1
+        self._lock = threading.Lock()
+
+    # -- bookkeeping ---------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Return the number of retained events."""
+        return self._next - self._first
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained event (== next_seq if empty)."""
+        return self._first
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next recorded event will get."""
+        return self._next
+
+    def missed(self, seq: int) -> int:
+        """Return how many events after *seq* have already been evicted.
+
+        Args:
+            seq: Last sequence number the caller has seen (0 for none).
+
+        Returns:
+            int: Number of events the caller can no longer catch up on.
+        """
+        return max(0, self._first - seq - 1)
+
+    def _intern(self, name: str) -> int:
+        ident = self._name_ids.get(name)
+        if ident is None:
+            ident = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = ident
+        return ident
+
+    # -- writing -------------------------------------------------------------
+
+    def record(self, event: Event, timestamp: float | None = None) -> int:
+        """Append an event.
+
+        Args:
+            event: The event to store.
+            timestamp: Monotonic time of the event; defaults to now.
+
+        Returns:
+            int: The sequence number assigned to the event.
+        """
+        data = event.data.encode()
+        truncated = len(data) > self.data_capacity
+        if truncated:
+            data = data[: self.data_capacity]
+        size = len(data)
+        stamp = time.monotonic() if timestamp is None else timestamp
+
+        with self._lock:
+            if truncated:
+                self.truncated += 1
+            name_id = self._intern(event.name)
+            pos = self._write_pos
+            phys = pos % self.data_capacity
+            if phys + size > self.data_capacity:
+                # Never split an entry across the end of the arena.
+                pos += self.data_capacity - phys
+                phys = 0
+            self._arena[phys : phys + size] = data
+            self._write_pos = pos + size
+
+            seq = self._next
+            if seq - self._first >= self.capacity:
+                self._first += 1
+            # Evict entries whose bytes were overwritten by this write.
+            low_water = self._write_pos - self.data_capacity
+            while self._first < seq and self._offset[self._first % self.capacity] < low_water:
+                self._first += 1
+
+            slot = seq % self.capacity
+            self._seq[slot] = seq
+            self._time[slot] = stamp
+            self._name[slot] = name_id
+            self._offset[slot] = pos
+            self._length[slot] = size
+            self._next = seq + 1
+        return seq
+
+    def tap(self, events: Iterable[Event]) -> Iterator[Event]:
+        """Record every event from *events* while passing it through.
+
+        Args:
+            events: Usually :meth:`HyprlandIPC.events`.
+
+        Yields:
+            Event: The events, unchanged.
+        """
+        for event in events:
+            self.record(event)
+            yield event
+
+    # -- reading -------------------------------------------------------------
+
+    def _entry(self, seq: int) -> HistoryEntry:
+        slot = seq % self.capacity
+        phys = self._offset[slot] % self.data_capacity
+        data = self._arena[phys : phys + self._length[slot]].decode(errors="replace")
+        event = Event(self._names[self._name[slot]], data)
+        return HistoryEntry(self._seq[slot], self._time[slot], event)
+
+    def since(self, seq: int = 0, limit: int | None = None) -> list[HistoryEntry]:
+        """Return retained events with a sequence number greater than *seq*.
+
+        Args:
+            seq: Last sequence number the caller has seen (0 for everything).
+            limit: Return at most this many of the oldest matching events.
+
+        Returns:
+            list[HistoryEntry]: Matching events, oldest first.
+        """
+        with self._lock:
+            start = max(seq + 1, self._first)
+            stop = self._next if limit is None else min(self._next, start + limit)
+            return [self._entry(s) for s in range(start, stop)]
+
+    def window(self, seconds: float, now: float | None = None) -> list[HistoryEntry]:
+        """Return retained events recorded within the last *seconds*.
+
+        Args:
+            seconds: Width of the time window.
+            now: Reference monotonic time; defaults to now.
+
+        Returns:
+            list[HistoryEntry]: Matching events, oldest first.
+        """
+        cutoff = (time.monotonic() if now is None else now) - seconds
+        with self._lock:
+            # Timestamps are non-decreasing in sequence order: binary search the ring.
+            lo, hi = self._first, self._next
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._time[mid % self.capacity] < cutoff:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return [self._entry(s) for s in range(lo, self._next)]
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """Iterate over a snapshot of all retained events, oldest first."""
+        return iter(self.since())
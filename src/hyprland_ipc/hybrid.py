@@ -0,0 +1,327 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Compositor state served from events, with queries as the fallback.
+
+:class:`HybridState` mirrors a set of fields (active window, active
+workspace, focused monitor...) from the events that carry them, and answers
+reads from the mirror while it is known to be fresh. A field is queried with
+``send_json`` instead when:
+
+- it has not been seen yet, or no event stream is being followed;
+- the event stream (re)connected or had a gap (undecodable lines), since
+  events may have been missed;
+- an event changed it without carrying its new value (e.g. a title change of
+  some window, possibly the active one);
+- an event this module does not know arrived, which may mean a newer
+  Hyprland changes state in ways the mirror cannot follow. ``custom`` events
+  (sent with ``hyprctl dispatch event``) carry no compositor state and are
+  known.
+
+Each read counts as a hit or a miss per field, and :meth:`HybridState.freshness`
+shows which fields are currently served from the mirror:
+
+Usage:
+    state = HybridState(ipc)
+    threading.Thread(target=state.run, daemon=True).start()
+    ...
+    state.get("active_workspace")  # no query while events keep it current
+"""
+
+from __future__ import annotations
+
+import selectors
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .ipc import Event, HyprlandIPC
+from .schema import EVENT_FIELDS, window_address
+
+
+type Parser = Callable[[str], Any]
+"""Computes a field value from event data; raises ValueError if it cannot."""
+
+
+@dataclass(frozen=True)
+class Field:
+    """How one field is queried and which events maintain it.
+
+    Attributes:
+        name: Field name passed to :meth:`HybridState.get`.
+        query: JSON query returning the field (without 'j/').
+        extract: Picks the value out of the parsed query reply.
+        events: Events carrying the new value, with the parser for their data.
+        invalidated_by: Events that may change the value without carrying it;
+            the next read queries it again.
+    """
+
+    name: str
+    query: str
+    extract: Callable[[Any], Any]
+    events: Mapping[str, Parser] = field(default_factory=dict)
+    invalidated_by: frozenset[str] = frozenset()
+
+
+# Events outside EVENT_FIELDS that never change compositor state.
+_STATELESS_EVENTS = frozenset({"custom"})
+
+
+def _key(name: str) -> Callable[[Any], Any]:
+    # Replies are {} when there is nothing active.
+    return lambda reply: reply.get(name) if isinstance(reply, dict) else None
+
+
+def _focused_monitor(reply: Any) -> Any:
+    monitors = reply if isinstance(reply, list) else []
+    return next((m.get("name") for m in monitors if m.get("focused")), None)
+
+
+def _address(data: str) -> str | None:
+    return window_address(data) if data and data != "," else None
+
+
+def _first(data: str) -> str:
+    return data.partition(",")[0]
+
+
+def _rest(data: str) -> str:
+    return data.partition(",")[2]
+
+
+# activewindow>>, means no window is focused, like the {} reply.
+def _window_class(data: str) -> str | None:
+    return None if data == "," else _first(data)
+
+
+def _window_title(data: str) -> str | None:
+    return None if data == "," else _rest(data)
+
+
+def _first_id(data: str) -> int:
+    return int(_first(data))
+
+
+def _last_id(data: str) -> int:
+    return int(data.rpartition(",")[2])
+
+
+DEFAULT_FIELDS = (
+    Field("active_window", "activewindow", _key("address"), {"activewindowv2": _address}),
+    Field("active_class", "activewindow", _key("class"), {"activewindow": _window_class}),
+    Field(
+        "active_title",
+        "activewindow",
+        _key("title"),
+        {"activewindow": _window_title},
+        frozenset({"windowtitle", "windowtitlev2"}),
+    ),
+    Field(
+        "active_workspace",
+        "activeworkspace",
+        _key("id"),
+        {"workspacev2": _first_id, "focusedmonv2": _last_id},
+    ),
+    Field(
+        "active_workspace_name",
+        "activeworkspace",
+        _key("name"),
+        {"workspacev2": _rest, "focusedmon": lambda data: data.rpartition(",")[2]},
+        frozenset({"renameworkspace"}),
+    ),
+    Field(
+        "focused_monitor",
+        "monitors",
+        _focused_monitor,
+        {"focusedmon": _first, "focusedmonv2": _first},
+        frozenset({"monitoradded", "monitorremoved", "monitoraddedv2", "monitorremovedv2"}),
+    ),
+)
+"""Fields :class:`HybridState` tracks unless given others."""
+
+
+class HybridState:
+    """Event-maintained fields with per-field query fallback.
+
+    Reads are thread-safe, so one thread can :meth:`follow` events while
+    others :meth:`get` fields. A query racing with an event for the same
+    field returns its result but does not overwrite the newer event value.
+    """
+
+    def __init__(
+        self,
+        ipc: HyprlandIPC,
+        fields: Iterable[Field] = DEFAULT_FIELDS,
+        *,
+        unknown_events_stale: bool = True,
+    ) -> None:
+        """Initialize with every field stale.
+
+        Args:
+            ipc: Client used for fallback queries and :meth:`follow`.
+            fields: Fields to track.
+            unknown_events_stale: Treat events missing from
+                :data:`~hyprland_ipc.schema.EVENT_FIELDS` (and from *fields*)
+                as a gap, except ``custom``; disable if plugins emit their
+                own events.
+        """
+        self.ipc = ipc
+        self.unknown_events_stale = unknown_events_stale
+        self._fields = {f.name: f for f in fields}
+        self._by_event: dict[str, list[tuple[str, Parser | None]]] = {}
+        for f in self._fields.values():
+            for event, parser in f.events.items():
+                self._by_event.setdefault(event, []).append((f.name, parser))
+            for event in f.invalidated_by:
+                self._by_event.setdefault(event, []).append((f.name, None))
+        self._values: dict[str, Any] = {}
+        self._fresh: set[str] = set()
+        self._generation = dict.fromkeys(self._fields, 0)
+        self._lock = threading.Lock()
+        self.live = False
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    @property
+    def fields(self) -> list[str]:
+        """Names of the tracked fields."""
+        return list(self._fields)
+
+    # -- freshness -----------------------------------------------------------
+
+    def is_fresh(self, name: str) -> bool:
+        """Return True if *name* would be served without a query."""
+        return self.live and name in self._fresh
+
+    def freshness(self) -> dict[str, bool]:
+        """Field name to :meth:`is_fresh`."""
+        return {name: self.is_fresh(name) for name in self._fields}
+
+    def _stale(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._generation[name] += 1
+            self._fresh.discard(name)
+
+    def mark_stale(self, name: str | None = None) -> None:
+        """Make one field, or all of them, be queried on the next read."""
+        with self._lock:
+            self._stale(self._fields if name is None else [name])
+
+    def connected(self) -> None:
+        """Record that an event stream is now followed (starting from a gap)."""
+        with self._lock:
+            self._stale(self._fields)
+            self.live = True
+
+    def disconnected(self) -> None:
+        """Record that events are no longer followed; reads query until reconnected."""
+        with self._lock:
+            self._stale(self._fields)
+            self.live = False
+
+    # -- events --------------------------------------------------------------
+
+    def handle_event(self, event: Event) -> None:
+        """Apply an event from :meth:`HyprlandIPC.events`."""
+        targets = self._by_event.get(event.name)
+        with self._lock:
+            if targets is None:
+                known = event.name in EVENT_FIELDS or event.name in _STATELESS_EVENTS
+                if self.unknown_events_stale and not known:
+                    self._stale(self._fields)
+                return
+            for name, parser in targets:
+                self._generation[name] += 1
+                if parser is not None:
+                    try:
+                        self._values[name] = parser(event.data)
+                    except ValueError:
+                        pass
+                    else:
+                        self._fresh.add(name)
+                        continue
+                self._fresh.discard(name)
+
+    def follow(self) -> Iterator[Event]:
+        """Follow the event socket, applying and yielding each event.
+
+        The mirror counts as live from the moment the socket is connected
+        until the generator ends, and undecodable event lines count as gaps.
+
+        Raises:
+            HyprlandIPCError: If the event socket cannot be connected.
+        """
+        with self.ipc.connect_events() as stream, selectors.DefaultSelector() as sel:
+            sel.register(stream, selectors.EVENT_READ)
+            self.connected()
+            try:
+                while not stream.closed:
+                    sel.select()
+                    errors = stream.decode_errors
+                    events = stream.read()
+                    if stream.decode_errors != errors:
+                        self.mark_stale()
+                    for event in events:
+                        self.handle_event(event)
+                        yield event
+            finally:
+                self.disconnected()
+
+    def run(self) -> None:
+        """Apply events until the event socket closes (blocks).
+
+        Raises:
+            HyprlandIPCError: If the event socket cannot be connected.
+        """
+        for _ in self.follow():
+            pass
+
+    # -- reads ---------------------------------------------------------------
+
+    def get(self, name: str) -> Any:
+        """Return one field, querying it only if it is stale.
+
+        Raises:
+            ValueError: If *name* is not a tracked field.
+            HyprlandIPCError: If the fallback query failed.
+        """
+        return self.get_many([name])[name]
+
+    def get_many(self, names: Iterable[str]) -> dict[str, Any]:
+        """Return several fields; stale ones cost one request in total.
+
+        Fields sharing a query (the active window's address, class and
+        title, say) are fetched once.
+
+        Raises:
+            ValueError: If a name is not a tracked field.
+            HyprlandIPCError: If the fallback query failed.
+        """
+        names = list(dict.fromkeys(names))
+        if unknown := [n for n in names if n not in self._fields]:
+            raise ValueError(f"Unknown fields {unknown}; tracked: {self.fields}")
+        with self._lock:
+            found = {n: self._values[n] for n in names if self.live and n in self._fresh}
+            stale = {n: self._generation[n] for n in names if n not in found}
+            self.hits.update(found.keys())
+            self.misses.update(stale.keys())
+        if not stale:
+            return found
+
+        queries = list(dict.fromkeys(self._fields[n].query for n in stale))
+        if len(queries) == 1:
+            replies = {queries[0]: self.ipc.send_json(queries[0])}
+        else:
+            replies = dict(zip(queries, self.ipc.send_json_batch(queries), strict=True))
+        with self._lock:
+            for name, generation in stale.items():
+                spec = self._fields[name]
+                found[name] = spec.extract(replies[spec.query])
+                # An event since the read above is newer than this reply.
+                if self._generation[name] == generation:
+                    self._values[name] = found[name]
+                    self._fresh.add(name)
+        return {n: found[n] for n in names}
@@ -0,0 +1,284 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Discovery of, and a combined client for, several Hyprland instances.
+
+Every running compositor owns a directory ``$XDG_RUNTIME_DIR/hypr/<signature>``
+holding its ``.socket.sock`` and ``.socket2.sock``. :func:`discover_instances`
+scans those directories, and :class:`MultiInstanceIPC` talks to all of them:
+
+- :meth:`MultiInstanceIPC.events` reads every ``.socket2.sock`` from one
+  selector loop in the calling thread and tags each event with its instance;
+- :meth:`MultiInstanceIPC.map` / :meth:`MultiInstanceIPC.send_json` run a
+  query on every instance in parallel.
+
+Usage:
+    multi = MultiInstanceIPC.from_runtime_dir()
+    clients = multi.map(HyprlandIPC.get_clients)
+    for tagged in multi.events():
+        print(tagged.signature, tagged.event)
+"""
+
+from __future__ import annotations
+
+import os
+import selectors
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from .ipc import Event, EventStream, HyprlandIPC, HyprlandIPCError
+
+
+LOCK_FILENAME = "hyprland.lock"
+"""File in the instance directory holding the compositor PID and Wayland socket."""
+
+
+@dataclass(frozen=True)
+class HyprlandInstance:
+    """A running (or stale) Hyprland instance found under the runtime directory.
+
+    Attributes:
+        signature: The instance signature (``HYPRLAND_INSTANCE_SIGNATURE``).
+        directory: ``$XDG_RUNTIME_DIR/hypr/<signature>``.
+        pid: Compositor PID from ``hyprland.lock``, if readable.
+        wayland_display: Wayland socket name from ``hyprland.lock``, if readable.
+    """
+
+    signature: str
+    directory: Path
+    pid: int | None = None
+    wayland_display: str | None = None
+
+    @property
+    def socket_path(self) -> Path:
+        """Path to the command socket (.socket.sock)."""
+        return self.directory / ".socket.sock"
+
+    @property
+    def event_socket_path(self) -> Path:
+        """Path to the event socket (.socket2.sock)."""
+        return self.directory / ".socket2.sock"
+
+    def client(self, **options: Any) -> HyprlandIPC:
+        """Return a :class:`HyprlandIPC` for this instance.
+
+        Args:
+            **options: Keyword options passed to :class:`HyprlandIPC`.
+        """
+        return HyprlandIPC(self.socket_path, self.event_socket_path, **options)
+
+
+def _read_lock(directory: Path) -> tuple[int | None, str | None]:
+    try:
+        lines = (directory / LOCK_FILENAME).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None, None
+    pid = int(lines[0]) if lines and lines[0].strip().isdigit() else None
+    display = (lines[1].strip() or None) if len(lines) > 1 else None
+    return pid, display
+
+
+def discover_instances(
+    runtime_dir: str | os.PathLike[str] | None = None,
+) -> list[HyprlandInstance]:
+    """Find Hyprland instances with both IPC sockets present.
+
+    Args:
+        runtime_dir: Runtime directory; defaults to ``XDG_RUNTIME_DIR``.
+
+    Raises:
+        HyprlandIPCError: If no runtime directory is given or set.
+
+    Returns:
+        list[HyprlandInstance]: Instances sorted by signature.
+    """
+    runtime = runtime_dir or os.getenv("XDG_RUNTIME_DIR")
+    if not runtime:
+        raise HyprlandIPCError("Cannot discover instances: XDG_RUNTIME_DIR is not set")
+
+    root = Path(runtime) / "hypr"
+    try:
+        directories = sorted(p for p in root.iterdir() if p.is_dir())
+    except FileNotFoundError:
+        return []
+
+    instances: list[HyprlandInstance] = []
+    for directory in directories:
+        if (directory / ".socket.sock").is_socket() and (directory / ".socket2.sock").is_socket():
+            pid, display = _read_lock(directory)
+            instances.append(HyprlandInstance(directory.name, directory, pid, display))
+    return instances
+
+
+@dataclass(frozen=True)
+class InstanceEvent:
+    """An event together with the signature of the instance that sent it."""
+
+    signature: str
+    event: Event
+
+
+class MultiInstanceIPC:
+    """Query several Hyprland instances and read all their events at once."""
+
+    def __init__(self, clients: dict[str, HyprlandIPC], max_workers: int | None = None) -> None:
+        """Initialize with one client per instance signature.
+
+        Args:
+            clients: Mapping of instance signature to client.
+            max_workers: Threads used for parallel queries (default: one per
+                instance).
+        """
+        self.clients = clients
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.event_errors: dict[str, HyprlandIPCError] = {}
+
+    @classmethod
+    def from_instances(cls, instances: Iterable[HyprlandInstance], **options: Any) -> Self:
+        """Create a client for the given instances.
+
+        Args:
+            instances: Instances, e.g. from :func:`discover_instances`.
+            **options: Keyword options passed to each :class:`HyprlandIPC`.
+        """
+        return cls({instance.signature: instance.client(**options) for instance in instances})
+
+    @classmethod
+    def from_runtime_dir(
+        cls, runtime_dir: str | os.PathLike[str] | None = None, **options: Any
+    ) -> Self:
+        """Create a client for every instance found under the runtime directory.
+
+        Raises:
+            HyprlandIPCError: If no runtime directory is set or no instance is found.
+        """
+        instances = discover_instances(runtime_dir)
+        if not instances:
+            raise HyprlandIPCError("No Hyprland instances found")
+        return cls.from_instances(instances, **options)
+
+    def __getitem__(self, signature: str) -> HyprlandIPC:
+        """Return the client of one instance."""
+        return self.clients[signature]
+
+    def __len__(self) -> int:
+        """Number of instances."""
+        return len(self.clients)
+
+    def map[T](self, fn: Callable[[HyprlandIPC], T]) -> dict[str, T]:
+        """Call *fn* with every instance's client in parallel.
+
+        Args:
+            fn: e.g. ``HyprlandIPC.get_clients`` or ``lambda ipc: ipc.send("version")``.
+
+        Raises:
+            HyprlandIPCError: If any call failed; names the failing instances.
+
+        Returns:
+            dict[str, T]: Result per instance signature.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers or max(len(self.clients), 1),
+                    thread_name_prefix="hyprland-multi",
+                )
+            executor = self._executor
+        futures = {sig: executor.submit(fn, ipc) for sig, ipc in self.clients.items()}
+
+        results: dict[str, T] = {}
+        errors: dict[str, BaseException] = {}
+        for sig, future in futures.items():
+            try:
+                results[sig] = future.result()
+            except Exception as e:
+                errors[sig] = e
+        if errors:
+            detail = "; ".join(f"{sig}: {e}" for sig, e in errors.items())
+            raise HyprlandIPCError(f"Query failed on {len(errors)} instance(s): {detail}")
+        return results
+
+    def send_json(self, command: str) -> dict[str, Any]:
+        """Run a JSON query on every instance in parallel.
+
+        Args:
+            command: The command after 'j/' (e.g. 'clients', 'activewindow').
+
+        Raises:
+            HyprlandIPCError: If any instance failed.
+
+        Returns:
+            dict[str, Any]: Parsed reply per instance signature.
+        """
+        return self.map(lambda ipc: ipc.send_json(command))
+
+    def events(self) -> Iterator[InstanceEvent]:
+        """Read every instance's event socket from one selector loop.
+
+        Instances that disconnect are dropped; iteration ends once none are
+        left. An instance whose event socket cannot be connected or read is
+        dropped as well, with the error recorded in :attr:`event_errors`
+        (signature to error, reset by each call), so one broken instance
+        does not end the events of the others.
+
+        Yields:
+            InstanceEvent: Each event tagged with its instance signature.
+
+        Raises:
+            HyprlandIPCError: If no instance's event socket could be connected.
+        """
+        self.event_errors = {}
+        streams: dict[str, EventStream] = {}
+        sel = selectors.DefaultSelector()
+        try:
+            for sig, ipc in self.clients.items():
+                try:
+                    streams[sig] = ipc.connect_events()
+                except HyprlandIPCError as e:
+                    self.event_errors[sig] = e
+                    continue
+                sel.register(streams[sig], selectors.EVENT_READ, sig)
+            if self.event_errors and not streams:
+                detail = "; ".join(f"{sig}: {e}" for sig, e in self.event_errors.items())
+                raise HyprlandIPCError(f"Failed to read events: {detail}")
+
+            while sel.get_map():
+                for key, _ in sel.select():
+                    sig = key.data
+                    stream = streams[sig]
+                    events: list[Event] = []
+                    try:
+                        events = stream.read()
+                    except OSError as e:
+                        self.event_errors[sig] = HyprlandIPCError(f"Failed to read events: {e}")
+                        stream.close()
+                    for event in events:
+                        yield InstanceEvent(sig, event)
+                    if stream.closed:
+                        sel.unregister(stream)
+        finally:
+            for stream in streams.values():
+                stream.close()
+            sel.close()
+
+    def close(self) -> None:
+        """Stop the query threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close on context exit."""
+        self.close()
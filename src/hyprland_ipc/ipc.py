@@ -6,7 +6,8 @@
 
 - Send hyprctl-like commands and receive replies (raw or JSON).
 - Send dispatches, single or batch.
-- Listen for real-time Hyprland events via .socket2.sock.
+- Listen for real-time Hyprland events via .socket2.sock, or poll them from
+  an external event loop (:class:`EventStream`).
 - Raise descriptive errors for any IPC failures.
 
 Designed for scripting, automation, and event-driven Hyprland tools.
@@ -18,10 +19,29 @@ import json
 import os
 import selectors
 import socket
-from collections.abc import Callable, Iterator, Sequence
-from dataclasses import dataclass
+import threading
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Literal, TypeGuard, cast, overload
+from types import TracebackType
+from typing import Any, Literal, Self, TypeGuard, overload
+
+from .protocol import (
+    Event as Event,  # noqa: PLC0414 - re-exported, defined in .protocol
+    EventParser,
+    HyprlandIPCError as HyprlandIPCError,  # noqa: PLC0414 - re-exported
+    RawEvent as RawEvent,  # noqa: PLC0414 - re-exported
+    decode_reply,
+    encode_command,
+)
+
+
+# Imported where used: the client is on the cold-start path of every script,
+# and these pull in concurrent.futures, re and ast (inspect) between them.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .commands import Command
+    from .singleflight import SingleFlight
 
 
 type AnyDict = dict[str, Any]
@@ -52,6 +72,21 @@ def is_list_of_dicts(obj: object) -> TypeGuard[list[AnyDict]]:
     return isinstance(obj, list) and all(is_dict(i) for i in obj)
 
 
+def is_batchable(command: str) -> bool:
+    """Check if *command* can be sent inside a ``[[BATCH]]`` request.
+
+    Hyprland splits a batch on ';', so a command containing one (or a newline)
+    must be sent on its own.
+
+    Args:
+        command (str): The command to check.
+
+    Returns:
+        bool: True if the command contains neither ';' nor a newline.
+    """
+    return ";" not in command and "\n" not in command
+
+
 @overload  # pragma: no cover - hint stub for typing only
 def normalize(data: object, kind: Literal["list"]) -> list[AnyDict]: ...
 @overload  # pragma: no cover - hint stub for typing only
@@ -84,16 +119,148 @@ def normalize(data: object, kind: Literal["list", "dict"]) -> AnyDict | list[Any
         return {}
 
 
-@dataclass
-class Event:
-    """A Hyprland event, with a name and associated data string."""
+def _exchange(sock: socket.socket, payload: bytes) -> bytes:
+    """Write *payload* to a connected command socket and read until it closes."""
+    sock.sendall(payload)
+    response = bytearray()
+    while True:
+        # Read until socket closes
+        if not (chunk := sock.recv(4096)):
+            break
+        response.extend(chunk)
+    return bytes(response)
+
+
+def _split_json(text: str) -> list[Any]:
+    """Parse a sequence of concatenated JSON documents."""
+    decoder = json.JSONDecoder()
+    values: list[Any] = []
+    end = len(text)
+    index = 0
+    while True:
+        while index < end and text[index].isspace():
+            index += 1
+        if index == end:
+            return values
+        value, index = decoder.raw_decode(text, index)
+        values.append(value)
+
+
+class EventStream:
+    """Non-blocking connection to .socket2.sock for external event loops.
+
+    Register :meth:`fileno` with the loop and call :meth:`read` whenever it
+    reports the descriptor readable; :meth:`read` never blocks. Check
+    :attr:`closed` afterwards, it is set once Hyprland closed the connection.
+
+    Usage:
+        stream = ipc.connect_events()
+
+        def on_readable(*_args):
+            for event in stream.read():
+                handle(event)
+            return not stream.closed  # False removes the GLib source
+
+        GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, stream.fileno(), GLib.IOCondition.IN, on_readable
+        )
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Connect to the event socket.
+
+        Args:
+            path: Path to the event socket (.socket2.sock).
+
+        Raises:
+            OSError: If the connection failed.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(path))
+            sock.setblocking(False)
+        except BaseException:
+            sock.close()
+            raise
+        self._sock = sock
+        self._parser = EventParser()
+        self.closed = False
+
+    def fileno(self) -> int:
+        """File descriptor to watch for readability."""
+        return self._sock.fileno()
+
+    @property
+    def decode_errors(self) -> int:
+        """Number of event lines dropped so far for not being valid UTF-8."""
+        return self._parser.decode_errors
+
+    def _recv(self) -> Iterator[bytes]:
+        while not self.closed:
+            try:
+                chunk = self._sock.recv(65536)
+            except BlockingIOError:
+                return
+            if not chunk:
+                self.close()  # Disconnected
+                return
+            yield chunk
+
+    def read(self) -> list[Event]:
+        """Read everything currently available without blocking.
+
+        Raises:
+            OSError: On socket read error.
+
+        Returns:
+            list[Event]: Events completed by the data read (possibly none).
+        """
+        events: list[Event] = []
+        for chunk in self._recv():
+            events += self._parser.feed(chunk)
+        return events
+
+    def read_raw(self) -> list[RawEvent]:
+        """Like :meth:`read`, but return undecoded :class:`RawEvent` records.
+
+        Use either this or :meth:`read` for the lifetime of a stream.
+
+        Raises:
+            OSError: On socket read error.
+        """
+        events: list[RawEvent] = []
+        for chunk in self._recv():
+            events += self._parser.feed_raw(chunk)
+        return events
+
+    def shutdown(self) -> None:
+        """Shut the connection down, waking any thread waiting to read it.
+
+        The next :meth:`read` sees the end of the stream and sets
+        :attr:`closed`; :meth:`close` still releases the descriptor.
+        """
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Already disconnected or closed
 
-    name: str
-    data: str
+    def close(self) -> None:
+        """Close the connection."""
+        self.closed = True
+        self._sock.close()
 
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
 
-class HyprlandIPCError(Exception):
-    """Raised when HyprlandIPC fails to communicate or parse responses."""
+    def __exit__(
+        self,
+        _exc_type: type[BaseException] | None,
+        _exc: BaseException | None,
+        _tb: TracebackType | None,
+    ) -> None:
+        """Close on context exit."""
+        self.close()
 
 
 class HyprlandIPC:
@@ -106,24 +273,48 @@ class HyprlandIPC:
             ...
     """
 
-    def __init__(self, socket_path: Path, event_socket_path: Path):
+    def __init__(
+        self,
+        socket_path: Path,
+        event_socket_path: Path,
+        *,
+        single_flight: bool = False,
+        frozen: bool = False,
+    ):
         """Initialize the IPC client with explicit socket paths.
 
         Args:
             socket_path: Path to the command socket (.socket.sock).
             event_socket_path: Path to the event socket (.socket2.sock).
+            single_flight: Let identical concurrent JSON queries share one
+                request (see :class:`SingleFlight`).
+            frozen: Return JSON replies as read-only FrozenDict / FrozenList
+                values. Combined with *single_flight*, concurrent callers then
+                share one parsed result instead of parsing the reply each.
         """
         self.socket_path = socket_path
         self.event_socket_path = event_socket_path
+        self.frozen = frozen
+        self.event_decode_errors = 0
+        self._lock = threading.Lock()
+        self._flights: SingleFlight[Any] | None = None
+        if single_flight:
+            from .singleflight import SingleFlight  # noqa: PLC0415
+
+            self._flights = SingleFlight()
 
     @classmethod
-    def from_env(cls) -> HyprlandIPC:
+    def from_env(cls, *, single_flight: bool = False, frozen: bool = False) -> HyprlandIPC:
         """Create a HyprlandIPC client by discovering socket paths from the environment.
 
         Environment:
             - XDG_RUNTIME_DIR
             - HYPRLAND_INSTANCE_SIGNATURE
 
+        Args:
+            single_flight: Share identical concurrent JSON queries.
+            frozen: Return JSON replies as read-only values.
+
         Raises:
             HyprlandIPCError: If required environment variables are missing or sockets don't exist.
 
@@ -149,7 +340,13 @@ class HyprlandIPC:
         if not sock1.is_socket() or not sock2.is_socket():
             raise HyprlandIPCError("Expected Hyprland socket files not found.")
 
-        return cls(sock1, sock2)
+        return cls(sock1, sock2, single_flight=single_flight, frozen=frozen)
+
+    def _request(self, payload: bytes) -> bytes:
+        """Send *payload* on a new command connection and return the full reply."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self.socket_path))
+            return _exchange(sock, payload)
 
     def send(self, command: str) -> str:
         """Send a raw command and return response as a string.
@@ -164,26 +361,32 @@ class HyprlandIPC:
             str: The raw string response from Hyprland.
         """
         try:
-            payload = command.encode(encoding="utf-8")
+            return decode_reply(self._request(encode_command(command)))
+        except Exception as e:
+            raise HyprlandIPCError(f"Failed to send IPC command '{command}': {e}") from e
 
-            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
-                sock.connect(str(self.socket_path))
-                sock.sendall(payload)
-                response = bytearray()
-                while True:
-                    # Read until socket closes
-                    if not (chunk := sock.recv(4096)):
-                        break
-                    response.extend(chunk)
+    def execute(self, command: Command) -> Any:
+        """Send a prebuilt command (see :mod:`hyprland_ipc.commands`).
 
-            decoded = response.decode(encoding="utf-8").strip()
+        The payload was encoded when the command was built, so nothing is
+        formatted or encoded here.
 
-            # Hyprland signals an error with "unknown request"
-            if decoded.startswith("unknown"):
-                raise HyprlandIPCError(f"Hyprland returned an error: {decoded}")
+        Args:
+            command: e.g. ``Dispatch.focuswindow(address=...)`` or
+                ``Query("clients", json=True)``.
 
-            return decoded
+        Raises:
+            HyprlandIPCError: On IPC failure, or JSON parse failure for JSON
+                commands.
 
+        Returns:
+            Any: Parsed JSON for JSON commands, otherwise the reply string.
+        """
+        try:
+            reply = decode_reply(self._request(command.payload))
+            return self._parse_json(reply) if command.json else reply
+        except json.JSONDecodeError as e:
+            raise HyprlandIPCError(f"Invalid JSON response for command '{command}': {e}") from e
         except Exception as e:
             raise HyprlandIPCError(f"Failed to send IPC command '{command}': {e}") from e
 
@@ -200,8 +403,15 @@ class HyprlandIPC:
             Any: Parsed JSON response (typically dict or list).
         """
         try:
-            resp = self.send(f"j/{command}")
-            return json.loads(resp) if resp else {}
+            if self._flights is None:
+                return self._parse_json(self.send(f"j/{command}"))
+            if self.frozen:
+                # Read-only results are safe to hand to every waiting caller.
+                return self._flights.do(
+                    command, lambda: self._parse_json(self.send(f"j/{command}"))
+                )
+            # Share the reply text; each caller parses its own mutable copy.
+            return self._parse_json(self._flights.do(command, lambda: self.send(f"j/{command}")))
         except json.JSONDecodeError as e:
             raise HyprlandIPCError(f"Invalid JSON response for command '{command}': {e}") from e
         except HyprlandIPCError:
@@ -211,6 +421,16 @@ class HyprlandIPC:
                 f"Failed to send or parse JSON for command '{command}': {e} "
             ) from e
 
+    def _parse_json(self, resp: str) -> Any:
+        value = json.loads(resp) if resp else {}
+        return self._freeze(value) if self.frozen else value
+
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        from .singleflight import freeze  # noqa: PLC0415
+
+        return freeze(value)
+
     def dispatch(self, command: str) -> None:
         """Send a single dispatch command.
 
@@ -241,8 +461,9 @@ class HyprlandIPC:
                 raise HyprlandIPCError(f"Failed to dispatch command '{cmd}': {e}") from e
 
     def batch(self, commands: Sequence[str]) -> None:
-        """Send multiple dispatch commands as a single string, separated by ';'.
+        """Send multiple dispatch commands in one ``[[BATCH]]`` request.
 
+        Equivalent to ``send_batch([f"dispatch {c}" for c in commands])``.
         Not all Hyprland versions support batch over IPC; if batch fails,
         falls back to dispatch_many().
 
@@ -250,11 +471,11 @@ class HyprlandIPC:
             commands: Iterable of dispatch commands.
 
         Raises:
+            ValueError: If a command contains ';' or a newline.
             HyprlandIPCError: On overall failure.
         """
         try:
-            cmd_str = "; ".join(commands)
-            self.send(f"dispatch {cmd_str}")
+            self.send_batch([f"dispatch {cmd}" for cmd in commands])
         except HyprlandIPCError as e:
             # Detect error message and fallback
             # Fallback unverified. May not work on older Hyprland versions.
@@ -263,6 +484,53 @@ class HyprlandIPC:
             else:
                 raise
 
+    def send_batch(self, commands: Sequence[str]) -> str:
+        """Send several commands of any kind in one request (``[[BATCH]]``).
+
+        Hyprland runs them in order and concatenates their replies.
+
+        Args:
+            commands: e.g. ['keyword general:gaps_in 5', 'dispatch workspace 2'].
+
+        Raises:
+            ValueError: If a command contains ';' or a newline, which would
+                split it.
+            HyprlandIPCError: On IPC failure.
+
+        Returns:
+            str: The combined reply ('' if *commands* is empty).
+        """
+        if not commands:
+            return ""
+        for cmd in commands:
+            if not is_batchable(cmd):
+                raise ValueError(f"Batched command must not contain ';' or newlines: {cmd!r}")
+        return self.send("[[BATCH]]" + ";".join(commands))
+
+    def send_json_batch(self, commands: Sequence[str]) -> list[Any]:
+        """Run several JSON queries in one request and parse each reply.
+
+        Args:
+            commands: Commands after 'j/' (e.g. ['monitors', 'workspaces']).
+
+        Raises:
+            HyprlandIPCError: On IPC or JSON parse failure, or if the number
+                of replies does not match.
+
+        Returns:
+            list[Any]: One parsed reply per command, in order.
+        """
+        reply = self.send_batch([f"j/{cmd}" for cmd in commands])
+        try:
+            values = _split_json(reply)
+        except json.JSONDecodeError as e:
+            raise HyprlandIPCError(f"Invalid JSON response for batch {commands!r}: {e}") from e
+        if len(values) != len(commands):
+            raise HyprlandIPCError(
+                f"Expected {len(commands)} replies for batch {commands!r}, got {len(values)}"
+            )
+        return [self._freeze(v) for v in values] if self.frozen else values
+
     def get_clients(self) -> list[AnyDict]:
         """List all windows with their properties as a JSON object.
 
@@ -287,9 +555,106 @@ class HyprlandIPC:
         """
         return normalize(self.send_json("activeworkspace"), "dict")
 
-    def events(self) -> Iterator[Event]:
+    def get_workspaces(self) -> list[AnyDict]:
+        """List all workspaces with their properties as a JSON object.
+
+        Returns:
+            list[AnyDict]: List of workspace info dicts.
+        """
+        return normalize(self.send_json("workspaces"), "list")
+
+    def get_monitors(self) -> list[AnyDict]:
+        """List all monitors with their properties as a JSON object.
+
+        Returns:
+            list[AnyDict]: List of monitor info dicts.
+        """
+        return normalize(self.send_json("monitors"), "list")
+
+    def watch(self, command: str, interval: float = 1.0, *, raw: bool = False) -> Iterator[Any]:
+        """Poll a query and yield its result whenever the reply changes.
+
+        The first reply is always yielded. Later replies are compared with the
+        previous one as raw bytes before anything is decoded, so an unchanged
+        poll costs one request and one comparison but no JSON parsing. Useful
+        for state that events do not fully cover (``getoption``, ``devices``,
+        ``layers``).
+
+        Args:
+            command: The command after 'j/' (e.g. 'devices',
+                'getoption general:gaps_in'), or the full command if *raw*.
+            interval: Seconds between the start of consecutive polls.
+            raw: Yield the reply string of *command* as sent, without the
+                'j/' prefix and without parsing.
+
+        Yields:
+            Any: Parsed JSON (or the reply string if *raw*) after each change.
+
+        Raises:
+            HyprlandIPCError: On IPC or JSON parse failure.
+        """
+        import time  # noqa: PLC0415
+
+        request = command if raw else f"j/{command}"
+        payload = encode_command(request)
+        previous: bytes | None = None
+        deadline = time.monotonic()
+        while True:
+            try:
+                response = self._request(payload)
+                changed = response != previous
+                if changed:
+                    decoded = decode_reply(response)
+                    result = decoded if raw else self._parse_json(decoded)
+            except json.JSONDecodeError as e:
+                raise HyprlandIPCError(f"Invalid JSON response for command '{command}': {e}") from e
+            except Exception as e:
+                raise HyprlandIPCError(f"Failed to send IPC command '{request}': {e}") from e
+            if changed:
+                previous = response
+                yield result
+
+            # Fixed-rate schedule; skip ticks rather than bunch up after a stall.
+            now = time.monotonic()
+            deadline = max(deadline + interval, now)
+            time.sleep(deadline - now)
+
+    def connect_events(self) -> EventStream:
+        """Open a non-blocking event connection for an external event loop.
+
+        Unlike :meth:`events`, nothing blocks and no thread is needed: GLib,
+        Qt (``QSocketNotifier``), asyncio (``loop.add_reader``) or a
+        ``selectors`` loop watches :meth:`EventStream.fileno` and calls
+        :meth:`EventStream.read` when it is readable.
+
+        Raises:
+            HyprlandIPCError: If the event socket cannot be connected.
+
+        Returns:
+            EventStream: The connected stream; close it when done.
+        """
+        try:
+            return EventStream(self.event_socket_path)
+        except OSError as e:
+            raise HyprlandIPCError(f"Failed to connect to event socket: {e}") from e
+
+    @overload
+    def events(self, *, raw: Literal[False] = False) -> Iterator[Event]: ...
+
+    @overload
+    def events(self, *, raw: Literal[True]) -> Iterator[RawEvent]: ...
+
+    def events(self, *, raw: bool = False) -> Iterator[Event | RawEvent]:
         """Listen to .socket2.sock for Hyprland events.
 
+        Lines that are not valid UTF-8 are skipped and counted in
+        :attr:`event_decode_errors`.
+
+        Args:
+            raw: Yield :class:`RawEvent` records instead: the name is a shared
+                string and the data stays bytes until decoded, which saves
+                two strings and a dataclass per event at high event rates.
+
         Yields:
             Event: Each event as an Event(name, data) object.
                 - name: The event type (e.g. 'workspace', 'activewindowv2')
@@ -299,44 +664,71 @@ class HyprlandIPC:
             HyprlandIPCError: On socket read error.
         """
         try:
-            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
-                sock.connect(str(self.event_socket_path))
-                sock.setblocking(False)
-
+            with EventStream(self.event_socket_path) as stream:
                 sel = selectors.DefaultSelector()
-                sel.register(sock, selectors.EVENT_READ)
-
-                buf = bytearray()
-
-                while True:
-                    for key, _ in sel.select(timeout=0.01):  # 10ms timeout
-                        conn = cast(socket.socket, key.fileobj)
-                        try:
-                            chunk = conn.recv(4096)
-                            if not chunk:
-                                return  # Disconnected
-                            buf.extend(chunk)
-                            while b"\n" in buf:
-                                line, _, rest = buf.partition(b"\n")
-                                buf[:] = rest
-                                if line:
-                                    try:
-                                        ev, _, data = line.partition(b">>")
-                                        yield Event(ev.decode(), data.decode())
-                                    except UnicodeDecodeError:
-                                        # XXX: this should be logged once logging is setup
-                                        continue
-                        except BlockingIOError:
-                            continue
+                sel.register(stream, selectors.EVENT_READ)
+                read = stream.read_raw if raw else stream.read
+
+                while not stream.closed:
+                    sel.select()
+                    counted = stream.decode_errors
+                    events: list[Event] | list[RawEvent] = read()
+                    if errors := stream.decode_errors - counted:
+                        # Several events() generators may share this client.
+                        with self._lock:
+                            self.event_decode_errors += errors
+                    yield from events
 
         except Exception as e:
             raise HyprlandIPCError(f"Failed to read events: {e}") from e
 
-    def listen_events(self, handler: Callable[[Event], None]) -> None:
+    def listen_events(
+        self,
+        handler: Callable[[Event], Any],
+        *,
+        queue_size: int | None = None,
+        concurrency: int | None = None,
+        key: Callable[[Event], Hashable] | None = None,
+    ) -> None:
         """Run a callback for each event as it is received (blocks forever).
 
+        By default the handler runs inline, one event at a time. Coroutine
+        functions, or any handler when *concurrency* is given, are run through
+        an :class:`EventDispatcher`: up to *concurrency* events are handled in
+        parallel while events with the same *key* keep their order.
+
         Args:
-            handler: Callable that accepts Event.
+            handler: Callable or coroutine function that accepts Event.
+            queue_size: If set, read the event socket on a dedicated thread
+                into a queue of this size (see :class:`EventReader`), so a slow
+                handler never stops the socket from being drained.
+            concurrency: Maximum number of events handled at once (default 8
+                for coroutine handlers).
+            key: Ordering key for concurrent handling (default: event name).
+
+        Raises:
+            HyprlandIPCError: On socket failure, or if a concurrent handler failed.
         """
-        for event in self.events():
-            handler(event)
+        # Imported lazily: inspect (via ast) costs more than the rest of the
+        # client, and handlers / reader both import this module.
+        from inspect import iscoroutinefunction  # noqa: PLC0415
+
+        from .handlers import EventDispatcher, by_name  # noqa: PLC0415
+        from .reader import EventReader  # noqa: PLC0415
+
+        with ExitStack() as stack:
+            events: Iterable[Event] = self.events()
+            if queue_size is not None:
+                # Stops the reader thread when the handler raises, too.
+                events = stack.enter_context(EventReader(events, maxsize=queue_size))
+
+            if concurrency is None and not iscoroutinefunction(handler):
+                for event in events:
+                    handler(event)
+                return
+
+            pool = stack.enter_context(
+                EventDispatcher(handler, concurrency=concurrency or 8, key=key or by_name)
+            )
+            for event in events:
+                pool.submit(event)
@@ -0,0 +1,298 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Sans-IO core of Hyprland's socket protocol.
+
+Nothing in this module touches a socket: callers feed in the bytes they read
+and get parsed replies and events back. :class:`HyprlandIPC` drives it with
+blocking sockets, and the same pieces let GLib, Qt, asyncio or ``selectors``
+loops speak the protocol on sockets they own:
+
+- ``.socket.sock`` takes one request per connection and closes it after the
+  reply, so a reply is complete at EOF (:class:`CommandExchange`);
+- ``.socket2.sock`` streams ``name>>data`` lines (:class:`EventParser`),
+  parsed into :class:`Event` objects or, with :meth:`EventParser.feed_raw`,
+  into :class:`RawEvent` records that defer UTF-8 decoding.
+
+Usage:
+    parser = EventParser()
+    for event in parser.feed(sock.recv(65536)):
+        ...
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class Event:
+    """A Hyprland event, with a name and associated data string."""
+
+    name: str
+    data: str
+
+
+class RawEvent:
+    """An undecoded event: an interned name and the data as received.
+
+    Names of known events (see :data:`~hyprland_ipc.schema.EVENT_FIELDS`) are
+    shared ``str`` objects, so no name string is created per event and name
+    comparisons usually succeed on identity. The data stays bytes until
+    :attr:`data` or :meth:`decode` is used.
+    """
+
+    __slots__ = ("name", "payload")
+
+    def __init__(self, name: str, payload: bytes) -> None:
+        """Wrap one event line.
+
+        Args:
+            name: Event name.
+            payload: Event data as received, without the name and ``>>``.
+        """
+        self.name = name
+        self.payload = payload
+
+    @property
+    def data(self) -> str:
+        """The data decoded as UTF-8.
+
+        Raises:
+            UnicodeDecodeError: If the data is not valid UTF-8.
+        """
+        return self.payload.decode(encoding="utf-8")
+
+    def decode(self, errors: str = "strict") -> Event:
+        """Return the equivalent :class:`Event`.
+
+        Args:
+            errors: UTF-8 error handler, e.g. 'replace' to never raise.
+
+        Raises:
+            UnicodeDecodeError: If the data is not valid UTF-8 and *errors*
+                is 'strict'.
+        """
+        return Event(self.name, self.payload.decode(encoding="utf-8", errors=errors))
+
+    def __repr__(self) -> str:
+        """Return the representation, showing name and raw data."""
+        return f"RawEvent({self.name!r}, {self.payload!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Raw events are equal when name and data bytes are."""
+        if not isinstance(other, RawEvent):
+            return NotImplemented
+        return self.name == other.name and self.payload == other.payload
+
+    def __hash__(self) -> int:
+        """Hash of name and data."""
+        return hash((self.name, self.payload))
+
+
+class HyprlandIPCError(Exception):
+    """Raised when HyprlandIPC fails to communicate or parse responses."""
+
+
+@lru_cache(maxsize=256)
+def encode_command(command: str) -> bytes:
+    """Return the bytes to write to ``.socket.sock`` for *command*.
+
+    Cached: scripts and keybinds repeat the same few commands, and the cache
+    hands back the already encoded bytes.
+    """
+    return command.encode(encoding="utf-8")
+
+
+def decode_reply(response: bytes) -> str:
+    """Decode a complete command reply.
+
+    Args:
+        response: Everything read from ``.socket.sock`` up to EOF.
+
+    Raises:
+        HyprlandIPCError: If Hyprland rejected the request.
+        UnicodeDecodeError: If the reply is not valid UTF-8.
+
+    Returns:
+        str: The reply with surrounding whitespace stripped.
+    """
+    decoded = response.decode(encoding="utf-8").strip()
+
+    # Hyprland signals an error with "unknown request"
+    if decoded.startswith("unknown"):
+        raise HyprlandIPCError(f"Hyprland returned an error: {decoded}")
+
+    return decoded
+
+
+def parse_event_line(line: bytes | bytearray) -> Event | None:
+    """Parse one ``name>>data`` line (without its newline).
+
+    Returns:
+        Event | None: The event, or None for an empty or undecodable line.
+    """
+    if not line:
+        return None
+    name, _, data = line.partition(b">>")
+    try:
+        return Event(name.decode(), data.decode())
+    except UnicodeDecodeError:
+        # XXX: this should be logged once logging is setup
+        return None
+
+
+class CommandExchange:
+    """One request and its reply on ``.socket.sock``.
+
+    Usage:
+        exchange = CommandExchange("j/clients")
+        sock.sendall(exchange.request)
+        while (reply := exchange.receive_data(sock.recv(4096))) is None:
+            pass
+    """
+
+    def __init__(self, command: str) -> None:
+        """Prepare the request for *command*.
+
+        Args:
+            command: The command to send (e.g. 'j/clients' or 'dispatch ...').
+        """
+        self.command = command
+        self.request = encode_command(command)
+        self._response = bytearray()
+        self.reply: str | None = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the reply is complete."""
+        return self.reply is not None
+
+    def receive_data(self, data: bytes) -> str | None:
+        """Feed bytes read from the socket; ``b""`` signals EOF.
+
+        Args:
+            data: Bytes received, or ``b""`` once the peer closed.
+
+        Raises:
+            HyprlandIPCError: If Hyprland rejected the request, or data arrives
+                after EOF.
+
+        Returns:
+            str | None: The decoded reply at EOF, otherwise None.
+        """
+        if self.reply is not None:
+            raise HyprlandIPCError(f"Reply to '{self.command}' is already complete")
+        if data:
+            self._response.extend(data)
+            return None
+        self.reply = decode_reply(bytes(self._response))
+        return self.reply
+
+
+_MAX_NAMES = 512
+
+
+@lru_cache(maxsize=1)
+def _known_names() -> dict[bytes, str]:
+    # Imported lazily: schema imports this module.
+    from .schema import EVENT_FIELDS  # noqa: PLC0415
+
+    return {name.encode(): sys.intern(name) for name in EVENT_FIELDS}
+
+
+class EventParser:
+    """Split the ``.socket2.sock`` byte stream into events.
+
+    Bytes may be fed in chunks of any size; a line split across chunks is
+    kept until its newline arrives. Use one parser per stream and either
+    :meth:`feed` or :meth:`feed_raw` for all of it.
+
+    Attributes:
+        decode_errors: Number of lines dropped because they were not valid
+            UTF-8 (for :meth:`feed_raw`, only the name is checked).
+    """
+
+    def __init__(self) -> None:
+        """Initialize with an empty buffer."""
+        self._buffer = bytearray()
+        self._names: dict[bytes, str] | None = None
+        self.decode_errors = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes of an incomplete line."""
+        return len(self._buffer)
+
+    def _lines(self, data: bytes) -> list[bytes]:
+        buf = self._buffer
+        # The buffered remainder never holds a newline, so only *data* can.
+        if b"\n" not in data:
+            buf.extend(data)
+            return []
+        if buf:
+            buf.extend(data)
+            data = bytes(buf)
+        *lines, rest = data.split(b"\n")
+        buf[:] = rest
+        return lines
+
+    def feed(self, data: bytes) -> list[Event]:
+        """Feed bytes read from the event socket.
+
+        Args:
+            data: Any chunk of the stream.
+
+        Returns:
+            list[Event]: Events completed by *data*, in order. Empty lines are
+            skipped, and so are lines that are not valid UTF-8 (counted in
+            :attr:`decode_errors`).
+        """
+        events: list[Event] = []
+        for line in self._lines(data):
+            if not line:
+                continue
+            if (event := parse_event_line(line)) is None:
+                self.decode_errors += 1
+            else:
+                events.append(event)
+        return events
+
+    def feed_raw(self, data: bytes) -> list[RawEvent]:
+        """Feed bytes read from the event socket, without decoding event data.
+
+        Known event names are looked up in a table of shared strings; other
+        names are decoded once and remembered (up to a limit), so a steady
+        stream creates one bytes object and one :class:`RawEvent` per event.
+
+        Args:
+            data: Any chunk of the stream.
+
+        Returns:
+            list[RawEvent]: Events completed by *data*, in order. Empty lines
+            are skipped, and so are lines whose name is not valid UTF-8
+            (counted in :attr:`decode_errors`).
+        """
+        names = self._names
+        if names is None:
+            names = self._names = dict(_known_names())
+        known = names.get
+        events: list[RawEvent] = []
+        for line in self._lines(data):
+            if not line:
+                continue
+            key, _, payload = line.partition(b">>")
+            name = known(key)
+            if name is None:
+                try:
+                    name = sys.intern(key.decode(encoding="utf-8"))
+                except UnicodeDecodeError:
+                    self.decode_errors += 1
+                    continue
+                if len(names) < _MAX_NAMES:
+                    names[key] = name
+            events.append(RawEvent(name, payload))
+        return events
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Background reader that keeps ``.socket2.sock`` drained.
+
+With the plain :meth:`HyprlandIPC.events` generator the socket is only read
+while the consumer asks for the next event, so a slow handler stops reads
+entirely; the kernel buffer then fills up and Hyprland may stall or drop the
+connection during bursts. :class:`EventReader` runs the generator on its own
+daemon thread and hands events over through a bounded queue. When the queue
+is full the oldest event is discarded and counted, so the socket is always
+read.
+
+Given an :class:`EventStream` (from :meth:`HyprlandIPC.connect_events`)
+instead of an iterable, the reader owns the connection: :meth:`EventReader.close`
+shuts it down, which wakes the thread even while no events arrive. Prefer it:
+a plain iterable can only be stopped once it yields its next event, so closing
+a reader over an idle :meth:`HyprlandIPC.events` generator leaves the thread
+(and its socket) waiting for that event.
+"""
+
+from __future__ import annotations
+
+import selectors
+import threading
+from collections import deque
+from collections.abc import Generator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Self
+
+from .ipc import Event, EventStream, HyprlandIPCError
+
+
+EXIT_TIMEOUT = 1.0
+"""Seconds :class:`EventReader` waits for its thread on context exit."""
+
+
+@dataclass(frozen=True)
+class ReaderStats:
+    """Counters describing an :class:`EventReader` queue.
+
+    Attributes:
+        depth: Events currently waiting in the queue.
+        high_water: Largest depth observed so far.
+        received: Events read from the source.
+        dropped: Events discarded because the queue was full.
+    """
+
+    depth: int
+    high_water: int
+    received: int
+    dropped: int
+
+
+class EventReader:
+    """Drain an event source on a background thread into a bounded queue.
+
+    Usage:
+        with EventReader(ipc.connect_events(), maxsize=4096) as reader:
+            for event in reader:
+                slow_handler(event)
+                if reader.stats().dropped:
+                    ...
+    """
+
+    def __init__(self, source: Iterable[Event] | EventStream, maxsize: int = 4096) -> None:
+        """Initialize the reader (call :meth:`start` to begin reading).
+
+        Args:
+            source: Event stream from :meth:`HyprlandIPC.connect_events`,
+                closed by :meth:`close`, or any event iterable such as
+                :meth:`HyprlandIPC.events`.
+            maxsize: Maximum number of queued events.
+
+        Raises:
+            ValueError: If *maxsize* is not positive.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.source = source
+        self.maxsize = maxsize
+        self._queue: deque[Event] = deque()
+        self._cond = threading.Condition()
+        self._high_water = 0
+        self._received = 0
+        self._dropped = 0
+        self._done = False
+        self._stopping = False
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+
+    def _stream_events(self, stream: EventStream) -> Iterator[Event]:
+        with selectors.DefaultSelector() as sel:
+            sel.register(stream, selectors.EVENT_READ)
+            while not stream.closed:
+                sel.select()
+                yield from stream.read()
+
+    def _run(self) -> None:
+        source = self.source
+        events = self._stream_events(source) if isinstance(source, EventStream) else source
+        try:
+            for event in events:
+                if self._stopping:
+                    break
+                with self._cond:
+                    if len(self._queue) >= self.maxsize:
+                        self._queue.popleft()
+                        self._dropped += 1
+                    self._queue.append(event)
+                    self._received += 1
+                    self._high_water = max(self._high_water, len(self._queue))
+                    self._cond.notify()
+        except Exception as e:
+            if not self._stopping:
+                self._error = e
+        finally:
+            # Generators such as HyprlandIPC.events() release their socket here.
+            if isinstance(events, Generator):
+                events.close()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def start(self) -> None:
+        """Start the reader thread (no-op if already started)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="hyprland-event-reader", daemon=True
+            )
+            self._thread.start()
+
+    def stats(self) -> ReaderStats:
+        """Return a consistent snapshot of the queue counters."""
+        with self._cond:
+            return ReaderStats(len(self._queue), self._high_water, self._received, self._dropped)
+
+    def get(self, timeout: float | None = None) -> Event | None:
+        """Return the next queued event.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Raises:
+            HyprlandIPCError: If the source failed and the queue is empty.
+
+        Returns:
+            Event | None: The event, or None on timeout or end of stream.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._queue or self._done, timeout):
+                return None
+            if self._queue:
+                return self._queue.popleft()
+            if self._error is not None:
+                raise HyprlandIPCError(f"Event source failed: {self._error}") from self._error
+            return None
+
+    def __iter__(self) -> Iterator[Event]:
+        """Yield queued events until the source is exhausted."""
+        self.start()
+        while (event := self.get()) is not None:
+            yield event
+
+    def __enter__(self) -> Self:
+        """Start the reader thread and return self."""
+        self.start()
+        return self
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop reading and wait for the reader thread to end.
+
+        An :class:`EventStream` source is shut down, so the thread ends right
+        away, and then closed. Other iterables are only stopped once they
+        yield their next event or end, which *timeout* bounds.
+
+        Args:
+            timeout: Seconds to wait for the thread; None waits indefinitely,
+                which with an idle iterable source means until its next event.
+        """
+        self._stopping = True
+        if isinstance(self.source, EventStream):
+            self.source.shutdown()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if isinstance(self.source, EventStream):
+            self.source.close()
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close the reader on context exit.
+
+        Waits at most :data:`EXIT_TIMEOUT` seconds; an iterable source that is
+        still blocked keeps its daemon thread until its next event.
+        """
+        self.close(EXIT_TIMEOUT)
@@ -0,0 +1,214 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Declarative event → dispatch rule engine.
+
+A :class:`Rule` matches an event name plus conditions on the event's fields
+(see :mod:`hyprland_ipc.schema`) and lists dispatch commands to run, which may
+reference fields as ``{address}``, ``{class}`` and so on.
+
+:class:`RuleEngine` compiles its rules into a per-event-name dispatch table
+with prebuilt matchers: an event only looks at rules registered for its own
+name (plus ``"*"`` wildcard rules), data is parsed only when such rules exist,
+and all actions triggered by one event are sent as a single batch. Per-event
+cost therefore stays flat as the rule set grows. Actions that contain ';' or a
+newline once filled in are dispatched on their own.
+
+Usage:
+    engine = RuleEngine(ipc)
+    engine.add(
+        Rule(
+            "openwindow",
+            where={"class": re.compile(r"^(pavucontrol|nm-connection-editor)$")},
+            actions=("setfloating address:{address}", "centerwindow"),
+        )
+    )
+    engine.run()
+"""
+
+from __future__ import annotations
+
+import re
+import string
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+
+from .ipc import Event, HyprlandIPC, HyprlandIPCError, is_batchable
+from .schema import EVENT_FIELDS, parse_event_data
+
+
+type Matcher = str | re.Pattern[str] | Callable[[str], bool]
+"""Exact value, compiled regex (searched), or predicate over a field value."""
+
+WILDCARD = "*"
+"""Rule event name that matches every event."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A declarative event rule.
+
+    Attributes:
+        event: Event name to match, or ``"*"`` for every event.
+        actions: Dispatch commands; ``{field}`` placeholders are filled from
+            the event fields, ``{name}`` and ``{data}`` are always available.
+        where: Field conditions that must all hold.
+        stop: Skip later rules for the same event when this one matches.
+    """
+
+    event: str
+    actions: tuple[str, ...]
+    where: Mapping[str, Matcher] = field(default_factory=dict)
+    stop: bool = False
+
+
+type _FieldTest = tuple[str, Callable[[str], bool]]
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    tests: tuple[_FieldTest, ...]
+    actions: tuple[str, ...]
+    stop: bool
+
+
+def _compile_matcher(matcher: Matcher) -> Callable[[str], bool]:
+    if isinstance(matcher, str):
+        return matcher.__eq__
+    if isinstance(matcher, re.Pattern):
+        search = matcher.search
+        return lambda value: search(value) is not None
+    return matcher
+
+
+def _compile_rule(rule: Rule) -> _CompiledRule:
+    available = {"name", "data"}
+    if rule.event != WILDCARD:
+        if rule.event not in EVENT_FIELDS:
+            raise HyprlandIPCError(f"Unknown event in rule: {rule.event!r}")
+        available.update(EVENT_FIELDS[rule.event])
+
+    for name in rule.where:
+        if name not in available:
+            raise HyprlandIPCError(f"Event {rule.event!r} has no field {name!r}")
+    for action in rule.actions:
+        for _, placeholder, _, _ in string.Formatter().parse(action):
+            if placeholder is not None and placeholder not in available:
+                raise HyprlandIPCError(
+                    f"Action {action!r} references unknown field {placeholder!r}"
+                )
+
+    tests = tuple((name, _compile_matcher(m)) for name, m in rule.where.items())
+    return _CompiledRule(tests, tuple(rule.actions), rule.stop)
+
+
+class RuleEngine:
+    """Match events against compiled rules and dispatch the resulting actions."""
+
+    def __init__(self, ipc: HyprlandIPC, rules: Iterable[Rule] = ()) -> None:
+        """Initialize the engine.
+
+        Args:
+            ipc: Client used to dispatch actions and read events.
+            rules: Initial rules, evaluated in order.
+
+        Raises:
+            HyprlandIPCError: If a rule names an unknown event or field.
+        """
+        self.ipc = ipc
+        self.rules: list[Rule] = []
+        self._compiled: list[_CompiledRule] = []
+        self._lock = threading.Lock()
+        # Table and wildcard rules are swapped as one tuple, so concurrent
+        # match() calls always see a consistent pair.
+        self._dispatch: tuple[dict[str, tuple[_CompiledRule, ...]], tuple[_CompiledRule, ...]] = (
+            {},
+            (),
+        )
+        self.add(*rules)
+
+    def add(self, *rules: Rule) -> None:
+        """Append rules and recompile the dispatch table.
+
+        Raises:
+            HyprlandIPCError: If a rule names an unknown event or field.
+        """
+        compiled = [_compile_rule(rule) for rule in rules]
+        with self._lock:
+            self.rules.extend(rules)
+            self._compiled.extend(compiled)
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        table: dict[str, list[_CompiledRule]] = {}
+        wildcard: list[_CompiledRule] = []
+        names = {rule.event for rule in self.rules} - {WILDCARD}
+        for rule, compiled in zip(self.rules, self._compiled, strict=True):
+            if rule.event == WILDCARD:
+                wildcard.append(compiled)
+                for name in names:
+                    table.setdefault(name, []).append(compiled)
+            else:
+                table.setdefault(rule.event, []).append(compiled)
+        self._dispatch = ({name: tuple(rules) for name, rules in table.items()}, tuple(wildcard))
+
+    def match(self, event: Event) -> list[str]:
+        """Return the formatted actions triggered by *event*.
+
+        Args:
+            event: Event received from :meth:`HyprlandIPC.events`.
+
+        Returns:
+            list[str]: Dispatch commands in rule order.
+        """
+        table, wildcard = self._dispatch
+        candidates = table.get(event.name, wildcard)
+        if not candidates:
+            return []
+        fields = parse_event_data(event)
+        fields["name"] = event.name
+        fields["data"] = event.data
+
+        actions: list[str] = []
+        for rule in candidates:
+            if all(test(fields.get(name, "")) for name, test in rule.tests):
+                actions.extend(action.format_map(fields) for action in rule.actions)
+                if rule.stop:
+                    break
+        return actions
+
+    def handle_event(self, event: Event) -> list[str]:
+        """Dispatch every action triggered by *event* in one request.
+
+        An action containing ';' or a newline (e.g. after ``{title}`` was
+        filled in) cannot be batched and is dispatched on its own, in order.
+
+        Args:
+            event: Event received from :meth:`HyprlandIPC.events`.
+
+        Returns:
+            list[str]: The dispatched commands.
+        """
+        actions = self.match(event)
+        run: list[str] = []
+        for action in actions:
+            if is_batchable(action):
+                run.append(action)
+                continue
+            self._send(run)
+            self.ipc.dispatch(action)
+            run = []
+        self._send(run)
+        return actions
+
+    def _send(self, actions: list[str]) -> None:
+        if len(actions) == 1:
+            self.ipc.dispatch(actions[0])
+        elif actions:
+            self.ipc.batch(actions)
+
+    def run(self) -> None:
+        """Apply the rules to every event (blocks forever)."""
+        self.ipc.listen_events(self.handle_event)
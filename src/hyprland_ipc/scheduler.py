@@ -0,0 +1,261 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Rate-limited, prioritized dispatch scheduler.
+
+:class:`DispatchScheduler` sits in front of :meth:`HyprlandIPC.dispatch` and
+:meth:`HyprlandIPC.batch` so that a runaway automation cannot flood
+``.socket.sock`` and delay keybind actions:
+
+- ``"background"`` commands draw from a token bucket (``rate`` commands per
+  second, bursts of up to ``burst``) and wait when it is empty;
+- ``"interactive"`` commands skip the bucket and are always sent before any
+  waiting background command;
+- a command that is already pending is not queued twice, callers share its
+  future (submitting it as interactive promotes the pending entry);
+- pending commands are cancelled with ``future.cancel()`` or dropped in bulk
+  with :meth:`DispatchScheduler.clear`.
+
+Commands ready at the same time are sent as one batch; a command containing
+';' or a newline is sent on its own between them.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import Literal, Self
+
+from .batching import send_coalesced
+from .ipc import HyprlandIPC, HyprlandIPCError
+
+
+type Priority = Literal["interactive", "background"]
+"""Scheduling class of a dispatch command."""
+
+_PRIORITIES: tuple[Priority, ...] = ("interactive", "background")
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(
+        self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Bucket capacity.
+            clock: Monotonic time source in seconds.
+
+        Raises:
+            ValueError: If *rate* or *burst* is not positive.
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self, wanted: int) -> int:
+        """Consume up to *wanted* whole tokens and return how many were taken."""
+        self._refill()
+        taken = min(wanted, int(self._tokens))
+        self._tokens -= taken
+        return taken
+
+    def delay(self) -> float:
+        """Seconds until at least one whole token is available."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class DispatchScheduler:
+    """Schedule dispatches by priority under a background rate limit.
+
+    Usage:
+        with DispatchScheduler(ipc, rate=50, burst=10) as scheduler:
+            for cmd in automation_commands:
+                scheduler.dispatch(cmd)  # background
+            scheduler.dispatch("workspace 2", priority="interactive").result()
+    """
+
+    def __init__(
+        self,
+        ipc: HyprlandIPC,
+        rate: float = 100.0,
+        burst: int = 20,
+        max_batch: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the scheduler and start its worker thread.
+
+        Args:
+            ipc: Client used to send the commands.
+            rate: Background commands allowed per second.
+            burst: Background commands that may be sent back to back.
+            max_batch: Largest number of commands per request.
+            clock: Monotonic time source for the token bucket.
+
+        Raises:
+            ValueError: If *rate*, *burst* or *max_batch* is not positive.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.ipc = ipc
+        self.max_batch = max_batch
+        self.bucket = TokenBucket(rate, burst, clock)
+        self._cond = threading.Condition()
+        self._queues: dict[Priority, deque[str]] = {p: deque() for p in _PRIORITIES}
+        self._pending: dict[str, tuple[Priority, Future[None]]] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="hyprland-scheduler", daemon=True)
+        self._thread.start()
+
+    def pending(self, priority: Priority | None = None) -> int:
+        """Number of queued commands, optionally for one priority only."""
+        with self._cond:
+            if priority is None:
+                return len(self._pending)
+            return len(self._queues[priority])
+
+    def dispatch(self, command: str, priority: Priority = "background") -> Future[None]:
+        """Queue a dispatch command.
+
+        Args:
+            command: e.g., 'focuswindow address:0xabc', 'fullscreen 1'
+            priority: ``"interactive"`` or ``"background"``.
+
+        Raises:
+            HyprlandIPCError: If the scheduler has been closed.
+            ValueError: If *priority* is unknown.
+
+        Returns:
+            Future[None]: Resolves once *command* was sent; shared with other
+            callers that queued the same command while it was pending.
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority: {priority!r}")
+        with self._cond:
+            if self._closed:
+                raise HyprlandIPCError("Dispatch scheduler is closed")
+            entry = self._pending.get(command)
+            if entry is not None and not entry[1].cancelled():
+                queued, future = entry
+                if priority == "interactive" and queued == "background":
+                    self._queues["background"].remove(command)
+                    self._queues["interactive"].append(command)
+                    self._pending[command] = (priority, future)
+                    self._cond.notify()
+                return future
+            if entry is not None:
+                self._queues[entry[0]].remove(command)
+            future = Future()
+            self._pending[command] = (priority, future)
+            self._queues[priority].append(command)
+            self._cond.notify()
+            return future
+
+    def dispatch_many(
+        self, commands: Sequence[str], priority: Priority = "background"
+    ) -> list[Future[None]]:
+        """Queue several dispatch commands, preserving their order.
+
+        Returns:
+            list[Future[None]]: One future per command.
+        """
+        return [self.dispatch(cmd, priority) for cmd in commands]
+
+    def clear(self, priority: Priority | None = None) -> int:
+        """Cancel pending commands, optionally for one priority only.
+
+        Returns:
+            int: Number of commands cancelled.
+        """
+        with self._cond:
+            cancelled = 0
+            for name in (priority,) if priority is not None else _PRIORITIES:
+                queue = self._queues[name]
+                while queue:
+                    _, future = self._pending.pop(queue.popleft())
+                    cancelled += future.cancel()
+            return cancelled
+
+    def _take(self, priority: Priority, limit: int) -> list[tuple[str, Future[None]]]:
+        queue = self._queues[priority]
+        taken: list[tuple[str, Future[None]]] = []
+        while queue and len(taken) < limit:
+            command = queue.popleft()
+            _, future = self._pending.pop(command)
+            taken.append((command, future))
+        return taken
+
+    def _next_batch(self) -> list[tuple[str, Future[None]]] | None:
+        """Wait for sendable commands; None once closed and drained."""
+        with self._cond:
+            while True:
+                if self._queues["interactive"]:
+                    return self._take("interactive", self.max_batch)
+                background = self._queues["background"]
+                # Cancelled commands must not use up tokens, wherever they sit
+                # in the window about to be sent.
+                head: list[str] = []
+                while background and len(head) < self.max_batch:
+                    command = background.popleft()
+                    if self._pending[command][1].cancelled():
+                        del self._pending[command]
+                    else:
+                        head.append(command)
+                background.extendleft(reversed(head))
+                if background:
+                    allowed = self.bucket.take(min(len(background), self.max_batch))
+                    if allowed:
+                        return self._take("background", allowed)
+                    # Woken early by interactive commands or close().
+                    self._cond.wait(self.bucket.delay())
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            self._send(batch)
+
+    def _send(self, batch: list[tuple[str, Future[None]]]) -> None:
+        live = [(cmd, fut) for cmd, fut in batch if fut.set_running_or_notify_cancel()]
+        send_coalesced(self.ipc, live)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Reject new commands and wait until queued ones were sent.
+
+        Background commands still obey the rate limit while draining; call
+        :meth:`clear` first to drop them instead.
+
+        Args:
+            timeout: Seconds to wait for the worker; None waits indefinitely.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close on context exit."""
+        self.close()
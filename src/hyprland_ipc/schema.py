@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Field layout of Hyprland's ``.socket2.sock`` events.
+
+Event data is a comma-separated list whose meaning depends on the event name
+(see https://wiki.hyprland.org/IPC/). :data:`EVENT_FIELDS` names those fields
+and :func:`parse_event_data` splits an event accordingly. The last field takes
+the remainder of the line, so window titles containing commas survive.
+
+Window addresses are sent without the ``0x`` prefix used in JSON replies;
+fields named ``address`` are normalized to include it, so they can be compared
+with ``get_clients()`` output directly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from .protocol import Event
+
+
+EVENT_FIELDS: Mapping[str, tuple[str, ...]] = MappingProxyType(
+    {
+        "workspace": ("workspace_name",),
+        "workspacev2": ("workspace_id", "workspace_name"),
+        "focusedmon": ("monitor_name", "workspace_name"),
+        "focusedmonv2": ("monitor_name", "workspace_id"),
+        "activewindow": ("class", "title"),
+        "activewindowv2": ("address",),
+        "fullscreen": ("state",),
+        "monitorremoved": ("monitor_name",),
+        "monitorremovedv2": ("monitor_id", "monitor_name", "description"),
+        "monitoradded": ("monitor_name",),
+        "monitoraddedv2": ("monitor_id", "monitor_name", "description"),
+        "createworkspace": ("workspace_name",),
+        "createworkspacev2": ("workspace_id", "workspace_name"),
+        "destroyworkspace": ("workspace_name",),
+        "destroyworkspacev2": ("workspace_id", "workspace_name"),
+        "moveworkspace": ("workspace_name", "monitor_name"),
+        "moveworkspacev2": ("workspace_id", "workspace_name", "monitor_name"),
+        "renameworkspace": ("workspace_id", "new_name"),
+        "activespecial": ("workspace_name", "monitor_name"),
+        "activespecialv2": ("workspace_id", "workspace_name", "monitor_name"),
+        "activelayout": ("keyboard", "layout"),
+        "openwindow": ("address", "workspace_name", "class", "title"),
+        "closewindow": ("address",),
+        "movewindow": ("address", "workspace_name"),
+        "movewindowv2": ("address", "workspace_id", "workspace_name"),
+        "openlayer": ("namespace",),
+        "closelayer": ("namespace",),
+        "submap": ("submap",),
+        "changefloatingmode": ("address", "floating"),
+        "urgent": ("address",),
+        "screencast": ("state", "owner"),
+        "windowtitle": ("address",),
+        "windowtitlev2": ("address", "title"),
+        "togglegroup": ("state", "addresses"),
+        "moveintogroup": ("address",),
+        "moveoutofgroup": ("address",),
+        "ignoregrouplock": ("state",),
+        "lockgroups": ("state",),
+        "configreloaded": (),
+        "pin": ("address", "pinned"),
+        "minimized": ("address", "minimized"),
+        "bell": ("address",),
+    }
+)
+"""Field names of each known event, in the order Hyprland sends them."""
+
+WINDOW_EVENTS = frozenset(
+    name for name, fields in EVENT_FIELDS.items() if fields[:1] == ("address",)
+)
+"""Events whose first field is a window address."""
+
+
+def window_address(raw: str) -> str:
+    """Return a window address with the ``0x`` prefix used by JSON replies."""
+    return raw if raw.startswith("0x") else f"0x{raw}"
+
+
+def parse_event_data(event: Event) -> dict[str, str]:
+    """Split an event's data into named fields.
+
+    Unknown events yield ``{"data": <raw data>}``; missing trailing fields are
+    returned as empty strings.
+
+    Args:
+        event: Event received from :meth:`HyprlandIPC.events`.
+
+    Returns:
+        dict[str, str]: Field name to value.
+    """
+    fields = EVENT_FIELDS.get(event.name)
+    if fields is None:
+        return {"data": event.data}
+    if not fields:
+        return {}
+    values = event.data.split(",", len(fields) - 1)
+    values += [""] * (len(fields) - len(values))
+    parsed = dict(zip(fields, values, strict=True))
+    if parsed.get("address"):
+        parsed["address"] = window_address(parsed["address"])
+    return parsed
@@ -0,0 +1,528 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Shared-memory state snapshots readable by many processes.
+
+A single writer publishes the current clients, workspaces and monitors into a
+memory-mapped file under ``$XDG_RUNTIME_DIR/hypr/<signature>/``. Any number of
+readers (bars, widgets, scripts) can then load the latest snapshot without a
+socket round trip and without parsing JSON.
+
+File layout (little endian)::
+
+    header  magic[8] layout:u32 marshal:u32 seq:u64 capacity:u64 flags:u64
+            len_a:u64 len_b:u64
+    slot A  capacity bytes
+    slot B  capacity bytes
+
+Writes are double buffered and guarded by a sequence counter (a seqlock
+variant): generation ``g`` lives in slot ``g % 2``. Before writing generation
+``g + 1`` the writer makes ``seq`` odd, writes into the *other* slot and then
+publishes ``seq = 2 * (g + 1)``. A reader that observed ``seq`` and copied a
+slot keeps its copy only if ``seq`` did not advance far enough for the writer to
+start reusing that slot, so readers never block and rarely retry.
+
+When a snapshot outgrows the slots the writer builds a larger file, atomically
+replaces the old one and marks the old mapping as retired so readers reopen.
+A new writer (after a publisher restart) takes over an existing file the same
+way: it continues from that file's generation, carries its snapshot over and
+retires it, so attached readers follow it and never see the generation go
+backwards.
+"""
+
+from __future__ import annotations
+
+import marshal
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self, cast
+
+from .ipc import AnyDict, Event, HyprlandIPC, HyprlandIPCError
+from .singleflight import thaw
+
+
+SNAPSHOT_FILENAME = "hyprland-ipc.shm"
+"""File name of the shared snapshot inside the instance runtime directory."""
+
+_MAGIC = b"HYPRSHM\x00"
+_LAYOUT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 16
+_CAPACITY_OFFSET = 24
+_FLAGS_OFFSET = 32
+_LEN_OFFSET = 40
+_FLAG_RETIRED = 1
+_MIN_CAPACITY = 64 * 1024
+_MAX_READ_ATTEMPTS = 64
+
+REFRESH_EVENTS = frozenset(
+    {
+        "openwindow",
+        "closewindow",
+        "movewindow",
+        "movewindowv2",
+        "windowtitle",
+        "windowtitlev2",
+        "changefloatingmode",
+        "fullscreen",
+        "pin",
+        "minimized",
+        "urgent",
+        "activewindow",
+        "activewindowv2",
+        "workspace",
+        "workspacev2",
+        "createworkspace",
+        "createworkspacev2",
+        "destroyworkspace",
+        "destroyworkspacev2",
+        "moveworkspace",
+        "moveworkspacev2",
+        "renameworkspace",
+        "activespecial",
+        "activespecialv2",
+        "focusedmon",
+        "focusedmonv2",
+        "monitoradded",
+        "monitoraddedv2",
+        "monitorremoved",
+        "monitorremovedv2",
+        "configreloaded",
+    }
+)
+"""Events after which the published state may be out of date."""
+
+
+@dataclass(frozen=True)
+class SharedSnapshot:
+    """A decoded state snapshot as published by :class:`SharedStateWriter`."""
+
+    generation: int
+    clients: list[AnyDict]
+    workspaces: list[AnyDict]
+    monitors: list[AnyDict]
+
+
+def default_snapshot_path(
+    signature: str | None = None, runtime_dir: str | os.PathLike[str] | None = None
+) -> Path:
+    """Return the snapshot path for a Hyprland instance.
+
+    Args:
+        signature: Instance signature; defaults to ``HYPRLAND_INSTANCE_SIGNATURE``.
+        runtime_dir: Runtime directory; defaults to ``XDG_RUNTIME_DIR``.
+
+    Raises:
+        HyprlandIPCError: If the signature or runtime directory cannot be determined.
+
+    Returns:
+        Path: ``<runtime_dir>/hypr/<signature>/hyprland-ipc.shm``.
+    """
+    signature = signature or os.getenv("HYPRLAND_INSTANCE_SIGNATURE")
+    runtime = runtime_dir or os.getenv("XDG_RUNTIME_DIR")
+    if not signature or not runtime:
+        raise HyprlandIPCError(
+            "Cannot locate snapshot: XDG_RUNTIME_DIR and HYPRLAND_INSTANCE_SIGNATURE are required"
+        )
+    return Path(runtime) / "hypr" / signature / SNAPSHOT_FILENAME
+
+
+def _slot_offset(slot: int, capacity: int) -> int:
+    return _HEADER.size + slot * capacity
+
+
+class SharedStateWriter:
+    """Publish state snapshots into a memory-mapped file (single writer only).
+
+    Only one writer may use a snapshot file; within that process, publishing
+    from several threads is serialized.
+
+    Usage:
+        with SharedStateWriter(default_snapshot_path()) as writer:
+            writer.publish(clients, workspaces, monitors)
+    """
+
+    def __init__(self, path: Path, capacity: int = _MIN_CAPACITY) -> None:
+        """Create (or take over) the snapshot file at *path*.
+
+        Args:
+            path: Location of the snapshot file.
+            capacity: Initial size in bytes of each of the two payload slots.
+
+        Raises:
+            HyprlandIPCError: If the file cannot be created or mapped.
+        """
+        self.path = path
+        self._generation = 0
+        self._capacity = 0
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+        carry = self._adopt()
+        self._remap(max(capacity, _MIN_CAPACITY, self._capacity), carry=carry)
+
+    def _adopt(self) -> bool:
+        """Take over the snapshot file a previous writer left at :attr:`path`.
+
+        Returns:
+            bool: Whether its current payload can be carried over (it was
+            written with this interpreter's marshal version).
+        """
+        try:
+            with open(self.path, "r+b") as fh:
+                buf = mmap.mmap(fh.fileno(), 0)
+        except (OSError, ValueError):
+            return False  # Missing, empty or unreadable: start from scratch
+        if len(buf) < _HEADER.size:
+            buf.close()
+            return False  # Truncated: replace it like a foreign file
+        magic, layout, marshal_version, seq, capacity, *_ = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or layout != _LAYOUT_VERSION or len(buf) < _slot_offset(2, capacity):
+            buf.close()
+            return False
+        # An odd seq means the old writer died mid-publish; seq // 2 is still
+        # the last complete generation and its slot is intact.
+        self._map = buf
+        self._generation = int(seq // 2)
+        self._capacity = int(capacity)
+        return bool(marshal_version == marshal.version)
+
+    @property
+    def generation(self) -> int:
+        """Generation number of the most recently published snapshot."""
+        return self._generation
+
+    def _remap(self, capacity: int, *, carry: bool = True) -> None:
+        """Build a fresh file of *capacity* per slot and swap it in atomically.
+
+        Args:
+            capacity: Size in bytes of each payload slot.
+            carry: Copy the current snapshot into the new file.
+        """
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.ftruncate(fd, _HEADER.size + 2 * capacity)
+                new_map = mmap.mmap(fd, _HEADER.size + 2 * capacity)
+            finally:
+                os.close(fd)
+            _HEADER.pack_into(
+                new_map,
+                0,
+                _MAGIC,
+                _LAYOUT_VERSION,
+                marshal.version,
+                2 * self._generation,
+                capacity,
+                0,
+                0,
+                0,
+            )
+            if carry and self._map is not None and self._generation:
+                # Carry the current snapshot over so readers that reopen see it.
+                old_slot = self._generation % 2
+                (length,) = _SEQ.unpack_from(self._map, _LEN_OFFSET + 8 * old_slot)
+                start = _slot_offset(old_slot, self._capacity)
+                payload = self._map[start : start + length]
+                new_start = _slot_offset(old_slot, capacity)
+                new_map[new_start : new_start + length] = payload
+                _SEQ.pack_into(new_map, _LEN_OFFSET + 8 * old_slot, length)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            raise HyprlandIPCError(f"Failed to create snapshot file '{self.path}': {e}") from e
+
+        if self._map is not None:
+            _SEQ.pack_into(self._map, _FLAGS_OFFSET, _FLAG_RETIRED)
+            self._map.close()
+        self._map = new_map
+        self._capacity = capacity
+
+    def publish_bytes(self, payload: bytes) -> int:
+        """Publish an already marshalled payload.
+
+        Args:
+            payload: Bytes produced by :func:`marshal.dumps`.
+
+        Raises:
+            HyprlandIPCError: If the writer has been closed.
+
+        Returns:
+            int: The new generation number.
+        """
+        with self._lock:
+            if self._map is None:
+                raise HyprlandIPCError("Snapshot writer is closed")
+            if len(payload) > self._capacity:
+                self._remap(max(len(payload) * 2, self._capacity * 2))
+            buf = self._map
+            generation = self._generation + 1
+            slot = generation % 2
+
+            _SEQ.pack_into(buf, _SEQ_OFFSET, 2 * self._generation + 1)
+            start = _slot_offset(slot, self._capacity)
+            buf[start : start + len(payload)] = payload
+            _SEQ.pack_into(buf, _LEN_OFFSET + 8 * slot, len(payload))
+            _SEQ.pack_into(buf, _SEQ_OFFSET, 2 * generation)
+
+            self._generation = generation
+            return generation
+
+    def publish(
+        self,
+        clients: list[AnyDict],
+        workspaces: list[AnyDict],
+        monitors: list[AnyDict],
+    ) -> int:
+        """Publish a new snapshot of the compositor state.
+
+        Args:
+            clients: Output of :meth:`HyprlandIPC.get_clients`.
+            workspaces: Output of :meth:`HyprlandIPC.get_workspaces`.
+            monitors: Output of :meth:`HyprlandIPC.get_monitors`.
+
+        Returns:
+            int: The new generation number.
+        """
+        state = (clients, workspaces, monitors)
+        try:
+            payload = marshal.dumps(state)
+        except ValueError:
+            # Frozen replies (HyprlandIPC(frozen=True)) are not marshallable.
+            payload = marshal.dumps(thaw(state))
+        return self.publish_bytes(payload)
+
+    def close(self) -> None:
+        """Unmap the snapshot file. The file itself is left for readers."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close on context exit."""
+        self.close()
+
+
+class SharedStateReader:
+    """Read snapshots published by :class:`SharedStateWriter` (lock-free).
+
+    A reader may be shared between threads: when the writer replaces the file,
+    the old mapping stays valid until no thread still uses it.
+
+    Usage:
+        reader = SharedStateReader(default_snapshot_path())
+        snap = reader.read()
+        if (newer := reader.read_if_newer(snap.generation)) is not None:
+            ...
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open the snapshot file at *path* read-only.
+
+        Args:
+            path: Location of the snapshot file.
+
+        Raises:
+            HyprlandIPCError: If the file is missing or not a valid snapshot.
+        """
+        self.path = path
+        self._map: mmap.mmap | None = None
+        self._open()
+
+    def _open(self) -> mmap.mmap:
+        # The retired mapping is not closed here: another thread may still be
+        # copying from it. It is unmapped once the last reference goes away.
+        try:
+            with open(self.path, "rb") as fh:
+                buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise HyprlandIPCError(f"Failed to open snapshot file '{self.path}': {e}") from e
+
+        if len(buf) < _HEADER.size:
+            buf.close()
+            raise HyprlandIPCError(f"'{self.path}' is too short for a hyprland-ipc snapshot")
+        magic, layout, marshal_version, *_ = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or layout != _LAYOUT_VERSION:
+            buf.close()
+            raise HyprlandIPCError(f"'{self.path}' is not a hyprland-ipc snapshot")
+        if marshal_version != marshal.version:
+            buf.close()
+            raise HyprlandIPCError(
+                f"Snapshot written with marshal v{marshal_version}, reader uses v{marshal.version}"
+            )
+        self._map = buf
+        return buf
+
+    def _mapping(self) -> mmap.mmap:
+        buf = self._map
+        if buf is None:
+            raise HyprlandIPCError("Snapshot reader is closed")
+        if _SEQ.unpack_from(buf, _FLAGS_OFFSET)[0] & _FLAG_RETIRED:
+            buf = self._open()
+        return buf
+
+    @property
+    def generation(self) -> int:
+        """Generation of the latest complete snapshot (0 if none was published)."""
+        (seq,) = _SEQ.unpack_from(self._mapping(), _SEQ_OFFSET)
+        return int(seq // 2)
+
+    def read_bytes(self) -> tuple[int, bytes]:
+        """Copy the latest complete payload out of shared memory.
+
+        Raises:
+            HyprlandIPCError: If nothing was published yet or the writer kept
+                overtaking the reader.
+
+        Returns:
+            tuple[int, bytes]: The generation and its marshalled payload.
+        """
+        for _ in range(_MAX_READ_ATTEMPTS):
+            buf = self._mapping()
+            (capacity,) = _SEQ.unpack_from(buf, _CAPACITY_OFFSET)
+            (seq_before,) = _SEQ.unpack_from(buf, _SEQ_OFFSET)
+            generation = seq_before // 2
+            slot = generation % 2
+            (length,) = _SEQ.unpack_from(buf, _LEN_OFFSET + 8 * slot)
+            # A taken-over file whose payload could not be carried is empty too.
+            if generation == 0 or length == 0:
+                raise HyprlandIPCError("No snapshot has been published yet")
+            start = _slot_offset(slot, capacity)
+            payload = buf[start : start + length]
+            (seq_after,) = _SEQ.unpack_from(buf, _SEQ_OFFSET)
+            # The slot is only rewritten once the writer starts generation + 2.
+            if seq_after <= 2 * generation + 2 and length <= capacity:
+                return int(generation), payload
+        raise HyprlandIPCError("Snapshot writer kept overtaking the reader")
+
+    def read(self) -> SharedSnapshot:
+        """Load the latest snapshot.
+
+        Raises:
+            HyprlandIPCError: If no valid snapshot is available.
+
+        Returns:
+            SharedSnapshot: The decoded snapshot.
+        """
+        generation, payload = self.read_bytes()
+        try:
+            clients, workspaces, monitors = cast(
+                tuple[list[AnyDict], list[AnyDict], list[AnyDict]],
+                # The file lives in the user's private runtime dir and is mode 0600.
+                marshal.loads(payload),  # noqa: S302
+            )
+        except (EOFError, ValueError, TypeError) as e:
+            raise HyprlandIPCError(f"Corrupt snapshot payload: {e}") from e
+        return SharedSnapshot(generation, clients, workspaces, monitors)
+
+    def read_if_newer(self, generation: int) -> SharedSnapshot | None:
+        """Load the latest snapshot only if it is newer than *generation*.
+
+        Args:
+            generation: Generation the caller already has.
+
+        Returns:
+            SharedSnapshot | None: The newer snapshot, or None if unchanged.
+        """
+        if self.generation <= generation:
+            return None
+        return self.read()
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> Self:
+        """Return self for use as a context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close on context exit."""
+        self.close()
+
+
+class StatePublisher:
+    """Keep a shared snapshot in sync with Hyprland by following its events.
+
+    Usage:
+        ipc = HyprlandIPC.from_env()
+        with SharedStateWriter(default_snapshot_path()) as writer:
+            StatePublisher(ipc, writer).run()
+    """
+
+    def __init__(
+        self,
+        ipc: HyprlandIPC,
+        writer: SharedStateWriter,
+        refresh_events: Iterable[str] = REFRESH_EVENTS,
+    ) -> None:
+        """Initialize the publisher.
+
+        Args:
+            ipc: Client used to query the state and read events.
+            writer: Destination of the published snapshots.
+            refresh_events: Event names that trigger a new snapshot.
+        """
+        self.ipc = ipc
+        self.writer = writer
+        self.refresh_events = frozenset(refresh_events)
+
+    def refresh(self) -> int:
+        """Query the current state and publish it.
+
+        Returns:
+            int: The new generation number.
+        """
+        return self.writer.publish(
+            self.ipc.get_clients(), self.ipc.get_workspaces(), self.ipc.get_monitors()
+        )
+
+    def handle_event(self, event: Event) -> bool:
+        """Publish a new snapshot if *event* may have changed the state.
+
+        Args:
+            event: Event received from :meth:`HyprlandIPC.events`.
+
+        Returns:
+            bool: True if a new snapshot was published.
+        """
+        if event.name not in self.refresh_events:
+            return False
+        self.refresh()
+        return True
+
+    def run(self) -> None:
+        """Publish an initial snapshot, then follow events forever."""
+        self.refresh()
+        self.ipc.listen_events(self._on_event)
+
+    def _on_event(self, event: Event) -> None:
+        self.handle_event(event)
+
+
+def load_snapshot(path: Path | None = None) -> SharedSnapshot:
+    """Open, read and close a snapshot in one go.
+
+    Args:
+        path: Snapshot location; defaults to :func:`default_snapshot_path`.
+
+    Returns:
+        SharedSnapshot: The latest snapshot.
+    """
+    with SharedStateReader(path or default_snapshot_path()) as reader:
+        return reader.read()
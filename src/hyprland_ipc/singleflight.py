@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Single-flight execution of identical concurrent queries.
+
+:class:`SingleFlight` lets the first caller for a key run the work while
+callers arriving for the same key in the meantime wait and receive the same
+result (or exception). :class:`HyprlandIPC` uses it, when created with
+``single_flight=True``, so that threads asking for ``clients`` at the same
+moment share one request.
+
+Parsed JSON is mutable, so sharing it is only safe when it cannot change:
+:func:`freeze` turns a parsed reply into :class:`FrozenDict` /
+:class:`FrozenList` values that still pass ``isinstance(x, dict)`` /
+``isinstance(x, list)`` checks but reject mutation. ``dict(x)`` / ``list(x)``
+give a mutable shallow copy when one is needed, and :func:`thaw` a deep one
+(``marshal`` only accepts the plain types).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any, NoReturn
+
+
+def _immutable(self: object, *_args: object, **_kwargs: object) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenDict(dict[str, Any]):
+    """A ``dict`` that rejects mutation; ``dict(d)`` returns a mutable copy."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenDict], tuple[dict[str, Any]]]:
+        """Rebuild without going through the blocked mutators (copy, pickle)."""
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list[Any]):
+    """A ``list`` that rejects mutation; ``list(x)`` returns a mutable copy."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenList], tuple[list[Any]]]:
+        """Rebuild without going through the blocked mutators (copy, pickle)."""
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy of parsed JSON (dicts, lists and scalars).
+
+    Args:
+        value: Result of ``json.loads``.
+
+    Returns:
+        Any: The same structure built from FrozenDict and FrozenList.
+    """
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of frozen JSON, e.g. for :func:`marshal.dumps`.
+
+    Args:
+        value: Parsed JSON (or tuples of it), possibly containing FrozenDict /
+            FrozenList values.
+
+    Returns:
+        Any: The same structure built from plain dicts and lists.
+    """
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(v) for v in value)
+    return value
+
+
+class SingleFlight[T]:
+    """Collapse concurrent calls with the same key into one execution.
+
+    Usage:
+        flights: SingleFlight[str] = SingleFlight()
+        reply = flights.do("clients", lambda: ipc.send("j/clients"))
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future[T]] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run *fn* unless a call for *key* is already running, then share it.
+
+        Args:
+            key: Identifies equivalent calls.
+            fn: Work to run when no call for *key* is in flight.
+
+        Raises:
+            Exception: Whatever *fn* raised, in the caller and every waiter.
+
+        Returns:
+            T: The result of the (possibly shared) call.
+        """
+        with self._lock:
+            waiting = self._calls.get(key)
+            if waiting is None:
+                future: Future[T] = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.shared += 1
+        if waiting is not None:
+            return waiting.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: Hashable) -> None:
+        # Callers arriving from now on start a fresh call.
+        with self._lock:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,405 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Grid-based spatial index over window geometry.
+
+:class:`SpatialIndex` buckets every window rectangle (``at`` / ``size`` from
+``get_clients()``) into fixed-size grid cells, so point, rectangle and
+directional queries only look at the cells they touch instead of scanning
+every client.
+
+Hyprland does not emit geometry in its events, so the index is kept current
+by removing windows on ``closewindow`` and marking itself stale on events that
+can move or resize windows (closing included, since tiled siblings reflow);
+:meth:`SpatialIndex.refresh` then resyncs from a single ``get_clients()``
+query only when needed.
+
+Geometry changes that Hyprland does not announce with an event are not
+detected: mouse drags, ``resizeactive``, ``layoutmsg`` and similar dispatches
+leave the index out of date. Callers that issue or expect those must call
+:meth:`SpatialIndex.mark_stale` (or resync with ``refresh(ipc, force=True)``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Literal
+
+from .ipc import AnyDict, Event, HyprlandIPC
+
+
+type Direction = Literal["l", "r", "u", "d"]
+"""Direction for neighbor queries: left, right, up or down."""
+
+type Cell = tuple[int, int]
+
+GEOMETRY_EVENTS = frozenset(
+    {
+        "openwindow",
+        "closewindow",
+        "movewindow",
+        "movewindowv2",
+        "changefloatingmode",
+        "fullscreen",
+        "togglegroup",
+        "moveintogroup",
+        "moveoutofgroup",
+        "workspace",
+        "workspacev2",
+        "moveworkspace",
+        "moveworkspacev2",
+        "monitoradded",
+        "monitoraddedv2",
+        "monitorremoved",
+        "monitorremovedv2",
+        "configreloaded",
+    }
+)
+"""Events after which window geometry may have changed."""
+
+
+@dataclass(frozen=True, slots=True)
+class Rect:
+    """An axis-aligned rectangle in layout coordinates."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def right(self) -> int:
+        """Exclusive right edge."""
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> int:
+        """Exclusive bottom edge."""
+        return self.y + self.height
+
+    def contains(self, x: int, y: int) -> bool:
+        """Return True if the point lies inside the rectangle."""
+        return self.x <= x < self.right and self.y <= y < self.bottom
+
+    def intersects(self, other: Rect) -> bool:
+        """Return True if both rectangles share a non-empty area."""
+        return (
+            self.x < other.right
+            and other.x < self.right
+            and self.y < other.bottom
+            and other.y < self.bottom
+        )
+
+
+def client_rect(client: AnyDict) -> Rect:
+    """Build a :class:`Rect` from a client's ``at`` and ``size`` fields.
+
+    Args:
+        client: Client dict as returned by ``get_clients()``.
+
+    Returns:
+        Rect: The client geometry (zero-sized if fields are missing).
+    """
+    at = client.get("at") or (0, 0)
+    size = client.get("size") or (0, 0)
+    return Rect(int(at[0]), int(at[1]), int(size[0]), int(size[1]))
+
+
+def _directional_score(src: Rect, rect: Rect, direction: Direction) -> float | None:
+    """Rank *rect* as a neighbor of *src*; None if it is not beyond the edge."""
+    if direction == "r":
+        gap = rect.x - src.right
+    elif direction == "l":
+        gap = src.x - rect.right
+    elif direction == "d":
+        gap = rect.y - src.bottom
+    else:
+        gap = src.y - rect.bottom
+    if gap < 0:
+        return None
+    if direction in {"l", "r"}:
+        offset = abs((rect.y + rect.height / 2) - (src.y + src.height / 2))
+    else:
+        offset = abs((rect.x + rect.width / 2) - (src.x + src.width / 2))
+    return gap + offset
+
+
+class SpatialIndex:
+    """Uniform-grid index of window rectangles keyed by address.
+
+    Usage:
+        index = SpatialIndex.from_clients(ipc.get_clients())
+        target = index.nearest(active_address, "r")
+    """
+
+    def __init__(self, cell_size: int = 256) -> None:
+        """Create an empty index.
+
+        Args:
+            cell_size: Width and height of a grid cell in pixels.
+
+        Raises:
+            ValueError: If *cell_size* is not positive.
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.stale = False
+        self._rects: dict[str, Rect] = {}
+        self._workspaces: dict[str, int] = {}
+        self._grid: dict[Cell, set[str]] = {}
+
+    @classmethod
+    def from_clients(cls, clients: Iterable[AnyDict], cell_size: int = 256) -> SpatialIndex:
+        """Build an index from a ``get_clients()`` snapshot.
+
+        Args:
+            clients: Client dicts.
+            cell_size: Width and height of a grid cell in pixels.
+
+        Returns:
+            SpatialIndex: The populated index.
+        """
+        index = cls(cell_size)
+        index.sync(clients)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of indexed windows."""
+        return len(self._rects)
+
+    def __contains__(self, address: object) -> bool:
+        """Return True if *address* is indexed."""
+        return address in self._rects
+
+    def rect(self, address: str) -> Rect:
+        """Return the stored rectangle of a window.
+
+        Raises:
+            KeyError: If the window is not indexed.
+        """
+        return self._rects[address]
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _cells(self, rect: Rect) -> Iterator[Cell]:
+        size = self.cell_size
+        last_x = (max(rect.right, rect.x + 1) - 1) // size
+        last_y = (max(rect.bottom, rect.y + 1) - 1) // size
+        for cx in range(rect.x // size, last_x + 1):
+            for cy in range(rect.y // size, last_y + 1):
+                yield cx, cy
+
+    def upsert(self, address: str, rect: Rect, workspace: int = 0) -> None:
+        """Insert or move a window.
+
+        Args:
+            address: Window address.
+            rect: Its geometry.
+            workspace: Its workspace id, used to scope queries.
+        """
+        if (old := self._rects.get(address)) is not None:
+            if old == rect:
+                self._workspaces[address] = workspace
+                return
+            self.remove(address)
+        self._rects[address] = rect
+        self._workspaces[address] = workspace
+        for cell in self._cells(rect):
+            self._grid.setdefault(cell, set()).add(address)
+
+    def remove(self, address: str) -> None:
+        """Drop a window from the index (no-op if absent)."""
+        rect = self._rects.pop(address, None)
+        self._workspaces.pop(address, None)
+        if rect is None:
+            return
+        for cell in self._cells(rect):
+            bucket = self._grid.get(cell)
+            if bucket is not None:
+                bucket.discard(address)
+                if not bucket:
+                    del self._grid[cell]
+
+    def sync(self, clients: Iterable[AnyDict]) -> None:
+        """Replace the index contents with a fresh ``get_clients()`` snapshot.
+
+        Unchanged windows keep their grid entries, so resyncs are cheap.
+        """
+        seen: set[str] = set()
+        for client in clients:
+            address = str(client.get("address", ""))
+            ws = client.get("workspace")
+            workspace = int(ws.get("id", 0)) if isinstance(ws, dict) else 0
+            self.upsert(address, client_rect(client), workspace)
+            seen.add(address)
+        for address in self._rects.keys() - seen:
+            self.remove(address)
+        self.stale = False
+
+    def handle_event(self, event: Event) -> None:
+        """Apply an event from :meth:`HyprlandIPC.events`.
+
+        ``closewindow`` removes the window right away; it and the other
+        geometry-affecting events mark the index stale until the next
+        :meth:`refresh`, as the remaining tiled windows fill the freed space.
+        """
+        if event.name == "closewindow":
+            self.remove(f"0x{event.data.removeprefix('0x')}")
+        if event.name == "movewindowv2":
+            # "<address>,<workspace id>,<workspace name>": rescope right away.
+            address, _, rest = event.data.partition(",")
+            address = f"0x{address.removeprefix('0x')}"
+            ws_id = rest.partition(",")[0]
+            if address in self._workspaces and ws_id.lstrip("-").isdigit():
+                self._workspaces[address] = int(ws_id)
+        if event.name in GEOMETRY_EVENTS:
+            self.mark_stale()
+
+    def mark_stale(self) -> None:
+        """Make the next :meth:`refresh` resync.
+
+        Call this after geometry changes that emit no event, such as
+        ``resizeactive`` or ``layoutmsg`` dispatches and mouse drags.
+        """
+        self.stale = True
+
+    def refresh(self, ipc: HyprlandIPC, *, force: bool = False) -> bool:
+        """Resync from ``get_clients()`` if the index is stale.
+
+        Args:
+            ipc: Client used for the query.
+            force: Resync even if the index is not stale.
+
+        Returns:
+            bool: True if a resync happened.
+        """
+        if not (self.stale or force):
+            return False
+        self.sync(ipc.get_clients())
+        return True
+
+    # -- queries -------------------------------------------------------------
+
+    def _scoped(self, address: str, workspace: int | None) -> bool:
+        return workspace is None or self._workspaces.get(address) == workspace
+
+    def at(self, x: int, y: int, workspace: int | None = None) -> list[str]:
+        """Return the windows containing a point.
+
+        Args:
+            x: Horizontal layout coordinate.
+            y: Vertical layout coordinate.
+            workspace: Only consider windows on this workspace.
+
+        Returns:
+            list[str]: Matching addresses, sorted.
+        """
+        bucket = self._grid.get((x // self.cell_size, y // self.cell_size), ())
+        return sorted(
+            a for a in bucket if self._rects[a].contains(x, y) and self._scoped(a, workspace)
+        )
+
+    def intersecting(self, rect: Rect, workspace: int | None = None) -> list[str]:
+        """Return the windows that overlap *rect*.
+
+        Args:
+            rect: Query rectangle.
+            workspace: Only consider windows on this workspace.
+
+        Returns:
+            list[str]: Matching addresses, sorted.
+        """
+        found: set[str] = set()
+        for cell in self._cells(rect):
+            found.update(self._grid.get(cell, ()))
+        return sorted(
+            a for a in found if self._rects[a].intersects(rect) and self._scoped(a, workspace)
+        )
+
+    def overlaps(self, workspace: int | None = None) -> list[tuple[str, str]]:
+        """Return every pair of overlapping windows.
+
+        Args:
+            workspace: Only consider windows on this workspace.
+
+        Returns:
+            list[tuple[str, str]]: Sorted address pairs, each ordered.
+        """
+        pairs: set[tuple[str, str]] = set()
+        for bucket in self._grid.values():
+            if len(bucket) < 2:  # noqa: PLR2004
+                continue
+            members = sorted(a for a in bucket if self._scoped(a, workspace))
+            for i, first in enumerate(members):
+                first_rect = self._rects[first]
+                for second in members[i + 1 :]:
+                    if first_rect.intersects(self._rects[second]):
+                        pairs.add((first, second))
+        return sorted(pairs)
+
+    def nearest(
+        self, address: str, direction: Direction, workspace: int | None = None
+    ) -> str | None:
+        """Return the closest window in a direction from *address*.
+
+        Candidates must lie entirely beyond the source window's edge in that
+        direction. They are ranked by the gap along the direction plus the
+        offset between centers across it. The grid is searched one band of
+        cells at a time outwards, stopping once no farther band can win.
+
+        Args:
+            address: Source window.
+            direction: ``"l"``, ``"r"``, ``"u"`` or ``"d"``.
+            workspace: Candidate workspace; defaults to the source's workspace.
+
+        Raises:
+            KeyError: If *address* is not indexed.
+
+        Returns:
+            str | None: Address of the nearest window, or None.
+        """
+        src = self._rects[address]
+        if workspace is None:
+            workspace = self._workspaces.get(address)
+        if not self._grid:
+            return None
+
+        size = self.cell_size
+        cells = self._grid.keys()
+        min_cx, max_cx = min(c[0] for c in cells), max(c[0] for c in cells)
+        min_cy, max_cy = min(c[1] for c in cells), max(c[1] for c in cells)
+        horizontal = direction in {"l", "r"}
+        step = -1 if direction in {"l", "u"} else 1
+        if horizontal:
+            start = (src.x if step < 0 else src.right - 1) // size
+            stop = min_cx if step < 0 else max_cx
+            across = range(min_cy, max_cy + 1)
+            src_edge = src.x if step < 0 else src.right
+        else:
+            start = (src.y if step < 0 else src.bottom - 1) // size
+            stop = min_cy if step < 0 else max_cy
+            across = range(min_cx, max_cx + 1)
+            src_edge = src.y if step < 0 else src.bottom
+
+        best: tuple[float, str] | None = None
+        seen: set[str] = {address}
+        for band in range(start, stop + step, step):
+            # Windows first seen in this band are at least this far away.
+            band_edge = band * size if step > 0 else (band + 1) * size
+            if best is not None and abs(band_edge - src_edge) > best[0]:
+                break
+            for other in across:
+                cell = (band, other) if horizontal else (other, band)
+                for candidate in self._grid.get(cell, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    if not self._scoped(candidate, workspace):
+                        continue
+                    score = _directional_score(src, self._rects[candidate], direction)
+                    if score is not None and (best is None or (score, candidate) < best):
+                        best = (score, candidate)
+        return None if best is None else best[1]
@@ -0,0 +1,322 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Monitor → workspace → window tree, kept current from events.
+
+:class:`Topology` answers "which monitor shows workspace N", "which workspaces
+are on DP-1" and "how many windows does workspace N hold" from dicts, so bars
+and overviews need not rebuild the tree from ``get_clients()`` and
+``get_workspaces()`` on every event. Special workspaces (negative ids, names
+starting with ``special:``) are tracked like any other.
+
+Each parent keeps its children in an insertion-ordered dict and each child
+maps back to its parent, so lookups in both directions, window counts and
+moves are O(1).
+
+It is seeded from one batched ``monitors`` / ``workspaces`` / ``clients``
+query and then follows ``monitoradded(v2)`` / ``monitorremoved(v2)``,
+``createworkspacev2`` / ``destroyworkspacev2``, ``moveworkspacev2``,
+``renameworkspace``, ``activespecialv2``, ``openwindow`` / ``closewindow``,
+``movewindowv2`` and ``focusedmonv2`` (new workspaces are created on the
+focused monitor).
+
+Usage:
+    topology = Topology.from_ipc(ipc)
+    for event in ipc.events():
+        topology.handle_event(event)
+        bar.update(topology.workspaces("DP-1"), topology.window_count)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .ipc import AnyDict, Event, HyprlandIPC, normalize
+from .schema import window_address
+
+
+_SEED = ("monitors", "workspaces", "clients")
+
+_WINDOW_EVENTS = frozenset({"openwindow", "closewindow", "movewindowv2"})
+_WORKSPACE_EVENTS = frozenset(
+    {
+        "createworkspacev2",
+        "destroyworkspacev2",
+        "renameworkspace",
+        "moveworkspacev2",
+        "activespecialv2",
+    }
+)
+_MONITOR_EVENTS = frozenset(
+    {"focusedmonv2", "monitoradded", "monitorremoved", "monitoraddedv2", "monitorremovedv2"}
+)
+
+
+def _to_int(raw: object) -> int | None:
+    try:
+        return int(str(raw))
+    except ValueError:
+        return None
+
+
+class Topology:
+    """Monitors, their workspaces and the windows on each workspace.
+
+    Workspaces are identified by id, monitors by name and windows by address
+    (with the ``0x`` prefix, as in ``get_clients()``).
+    """
+
+    def __init__(self) -> None:
+        """Create an empty topology."""
+        self._monitors: dict[str, dict[int, None]] = {}
+        self._monitor_ids: dict[int, str] = {}
+        self._workspace_monitor: dict[int, str | None] = {}
+        self._workspace_names: dict[int, str] = {}
+        self._workspace_ids: dict[str, int] = {}
+        self._windows: dict[int, dict[str, None]] = {}
+        self._window_workspace: dict[str, int] = {}
+        self.focused_monitor: str | None = None
+
+    @classmethod
+    def from_replies(
+        cls,
+        monitors: Iterable[AnyDict],
+        workspaces: Iterable[AnyDict],
+        clients: Iterable[AnyDict],
+    ) -> Topology:
+        """Build a topology from ``monitors``, ``workspaces`` and ``clients`` replies."""
+        topology = cls()
+        topology.sync(monitors, workspaces, clients)
+        return topology
+
+    @classmethod
+    def from_ipc(cls, ipc: HyprlandIPC) -> Topology:
+        """Build a topology from one batched query.
+
+        Raises:
+            HyprlandIPCError: On IPC failure.
+        """
+        monitors, workspaces, clients = ipc.send_json_batch(_SEED)
+        return cls.from_replies(
+            normalize(monitors, "list"),
+            normalize(workspaces, "list"),
+            normalize(clients, "list"),
+        )
+
+    # -- maintenance ---------------------------------------------------------
+
+    def sync(
+        self,
+        monitors: Iterable[AnyDict],
+        workspaces: Iterable[AnyDict],
+        clients: Iterable[AnyDict],
+    ) -> None:
+        """Replace the topology with fresh query replies."""
+        for mapping in (
+            self._monitors,
+            self._monitor_ids,
+            self._workspace_monitor,
+            self._workspace_names,
+            self._workspace_ids,
+            self._windows,
+            self._window_workspace,
+        ):
+            mapping.clear()
+        self.focused_monitor = None
+        for monitor in monitors:
+            name = str(monitor.get("name", ""))
+            self.add_monitor(name, _to_int(monitor.get("id")))
+            if monitor.get("focused"):
+                self.focused_monitor = name
+        for workspace in workspaces:
+            if (ws_id := _to_int(workspace.get("id"))) is not None:
+                owner = workspace.get("monitor")
+                self.add_workspace(
+                    ws_id, str(workspace.get("name", ws_id)), str(owner) if owner else None
+                )
+        for client in clients:
+            ws = client.get("workspace")
+            ws_id = _to_int(ws.get("id")) if isinstance(ws, dict) else None
+            if client.get("address") and ws_id is not None:
+                self.move_window(str(client["address"]), ws_id)
+
+    def add_monitor(self, name: str, monitor_id: int | None = None) -> None:
+        """Add a monitor (no-op if known)."""
+        self._monitors.setdefault(name, {})
+        if monitor_id is not None:
+            self._monitor_ids[monitor_id] = name
+
+    def remove_monitor(self, name: str) -> None:
+        """Remove a monitor; its workspaces stay, without a monitor.
+
+        Hyprland moves them elsewhere and reports each move with
+        ``moveworkspacev2``.
+        """
+        for ws_id in self._monitors.pop(name, {}):
+            self._workspace_monitor[ws_id] = None
+        self._monitor_ids = {i: n for i, n in self._monitor_ids.items() if n != name}
+        if self.focused_monitor == name:
+            self.focused_monitor = None
+
+    def add_workspace(self, workspace: int, name: str, monitor: str | None = None) -> None:
+        """Add a workspace, or move and rename a known one."""
+        self._workspace_names[workspace] = name
+        self._workspace_ids[name] = workspace
+        self._windows.setdefault(workspace, {})
+        self.move_workspace(workspace, monitor)
+
+    def remove_workspace(self, workspace: int) -> None:
+        """Remove a workspace and any windows still recorded on it."""
+        self.move_workspace(workspace, None)
+        self._workspace_monitor.pop(workspace, None)
+        if (name := self._workspace_names.pop(workspace, None)) is not None:
+            self._workspace_ids.pop(name, None)
+        for address in self._windows.pop(workspace, {}):
+            self._window_workspace.pop(address, None)
+
+    def move_workspace(self, workspace: int, monitor: str | None) -> None:
+        """Record that a workspace is now on *monitor* (None: unassigned)."""
+        old = self._workspace_monitor.get(workspace)
+        if old is not None and old != monitor:
+            self._monitors.get(old, {}).pop(workspace, None)
+        self._workspace_monitor[workspace] = monitor
+        if monitor is not None:
+            self._monitors.setdefault(monitor, {})[workspace] = None
+
+    def rename_workspace(self, workspace: int, name: str) -> None:
+        """Record a workspace's new name."""
+        if (old := self._workspace_names.get(workspace)) is not None:
+            self._workspace_ids.pop(old, None)
+        self._workspace_names[workspace] = name
+        self._workspace_ids[name] = workspace
+
+    def move_window(self, address: str, workspace: int) -> None:
+        """Record that a window is on *workspace* (adding it if new)."""
+        old = self._window_workspace.get(address)
+        if old is not None:
+            self._windows.get(old, {}).pop(address, None)
+        self._window_workspace[address] = workspace
+        self._windows.setdefault(workspace, {})[address] = None
+        self._workspace_monitor.setdefault(workspace, None)
+
+    def remove_window(self, address: str) -> None:
+        """Forget a window (no-op if absent)."""
+        if (workspace := self._window_workspace.pop(address, None)) is not None:
+            self._windows.get(workspace, {}).pop(address, None)
+
+    def handle_event(self, event: Event) -> None:
+        """Apply an event from :meth:`HyprlandIPC.events`."""
+        name = event.name
+        if name in _WINDOW_EVENTS:
+            self._window_event(name, event.data)
+        elif name in _WORKSPACE_EVENTS:
+            self._workspace_event(name, event.data)
+        elif name in _MONITOR_EVENTS:
+            self._monitor_event(name, event.data)
+
+    def _window_event(self, name: str, data: str) -> None:
+        address, _, rest = data.partition(",")
+        if name == "closewindow":
+            self.remove_window(window_address(address))
+            return
+        # openwindow names the workspace, movewindowv2 gives its id first
+        raw = rest.partition(",")[0]
+        ws_id = self._workspace_ids.get(raw) if name == "openwindow" else _to_int(raw)
+        if ws_id is not None:
+            self.move_window(window_address(address), ws_id)
+
+    def _workspace_event(self, name: str, data: str) -> None:
+        raw_id, _, rest = data.partition(",")
+        # activespecialv2 with an empty id: the special workspace was hidden
+        if (ws_id := _to_int(raw_id)) is None:
+            return
+        if name == "destroyworkspacev2":
+            self.remove_workspace(ws_id)
+        elif name == "renameworkspace":
+            self.rename_workspace(ws_id, rest)
+        elif name == "createworkspacev2":
+            self.add_workspace(ws_id, rest, self.focused_monitor)
+        else:  # moveworkspacev2, activespecialv2: id,name,monitor
+            ws_name, _, monitor = rest.rpartition(",")
+            self.add_workspace(ws_id, ws_name, monitor)
+
+    def _monitor_event(self, name: str, data: str) -> None:
+        if name == "focusedmonv2":
+            self.focused_monitor = data.partition(",")[0]
+        elif name == "monitoradded":
+            self.add_monitor(data)
+        elif name == "monitorremoved":
+            self.remove_monitor(data)
+        else:  # monitoraddedv2, monitorremovedv2: id,name,description
+            raw_id, _, rest = data.partition(",")
+            monitor = rest.partition(",")[0]
+            if name == "monitoraddedv2":
+                self.add_monitor(monitor, _to_int(raw_id))
+            else:
+                self.remove_monitor(monitor)
+
+    # -- queries -------------------------------------------------------------
+
+    def monitors(self) -> list[str]:
+        """Names of the known monitors."""
+        return list(self._monitors)
+
+    def monitor_name(self, monitor_id: int) -> str | None:
+        """The name of the monitor with id *monitor_id*, or None."""
+        return self._monitor_ids.get(monitor_id)
+
+    def workspaces(self, monitor: str | None = None) -> list[int]:
+        """Workspace ids, on *monitor* only if given."""
+        if monitor is None:
+            return list(self._workspace_monitor)
+        return list(self._monitors.get(monitor, {}))
+
+    def special_workspaces(self) -> list[int]:
+        """Ids of the known special workspaces."""
+        return [ws for ws in self._workspace_monitor if self.is_special(ws)]
+
+    @staticmethod
+    def is_special(workspace: int) -> bool:
+        """Return True if *workspace* is a special (scratchpad) workspace.
+
+        Hyprland gives special workspaces, and only them, negative ids.
+        """
+        return workspace < 0
+
+    def workspace_name(self, workspace: int) -> str | None:
+        """The name of *workspace*, or None if unknown."""
+        return self._workspace_names.get(workspace)
+
+    def workspace_id(self, name: str) -> int | None:
+        """The id of the workspace named *name*, or None."""
+        return self._workspace_ids.get(name)
+
+    def monitor_of(self, workspace: int) -> str | None:
+        """The monitor showing *workspace*, or None if unknown or unassigned."""
+        return self._workspace_monitor.get(workspace)
+
+    def windows(self, workspace: int) -> list[str]:
+        """Addresses of the windows on *workspace*, in the order they arrived."""
+        return list(self._windows.get(workspace, {}))
+
+    def window_count(self, workspace: int) -> int:
+        """Number of windows on *workspace*."""
+        return len(self._windows.get(workspace, {}))
+
+    def workspace_of(self, address: str) -> int | None:
+        """The workspace a window is on, or None if unknown."""
+        return self._window_workspace.get(address)
+
+    def monitor_of_window(self, address: str) -> str | None:
+        """The monitor a window is on, or None if unknown."""
+        workspace = self._window_workspace.get(address)
+        return None if workspace is None else self._workspace_monitor.get(workspace)
+
+    def __contains__(self, address: object) -> bool:
+        """Return True if window *address* is tracked."""
+        return address in self._window_workspace
+
+    def __len__(self) -> int:
+        """Return the number of tracked windows."""
+        return len(self._window_workspace)
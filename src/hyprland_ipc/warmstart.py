@@ -0,0 +1,279 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Persistent warm-start state for short-lived processes.
+
+Scripts started from keybinds spend most of their time starting up and on
+their first ``get_clients()``. :class:`WarmState` holds the clients,
+workspaces, monitors and focus history a previous process saw, and
+:func:`save_state` writes it to ``$XDG_RUNTIME_DIR/hypr/<signature>/`` in a
+compact binary file that :func:`load_state` reads back without any JSON.
+
+File layout (little endian)::
+
+    header  magic[8] layout:u32 marshal:u32 sequence:u64 saved_at:f64
+    payload marshal.dumps((signature, clients, workspaces, monitors,
+                           focus, active_window, active_workspace))
+
+``sequence`` grows by one with every save, so a reader can tell whether the
+file changed since it last loaded it. Files written for another instance
+signature, by another layout or marshal version, or older than ``max_age``
+are ignored.
+
+A loaded state may be behind the compositor. :meth:`WarmState.reconcile`
+checks it against one small batched query (active window and workspace) and
+only falls back to a full capture when they disagree:
+
+Usage:
+    state = load_state(max_age=60) or WarmState.capture(ipc)
+    state = state.reconcile(ipc)
+    ...
+    save_state(state)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import marshal
+import os
+import struct
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, cast
+
+from .focus import FocusHistory
+from .ipc import AnyDict, HyprlandIPC, HyprlandIPCError, normalize
+from .shm import default_snapshot_path
+from .singleflight import thaw
+
+
+STATE_FILENAME = "hyprland-ipc.state"
+"""File name of the warm-start state inside the instance runtime directory."""
+
+_MAGIC = b"HYPRWARM"
+_LAYOUT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQd")
+
+_CAPTURE = ("clients", "workspaces", "monitors", "activewindow", "activeworkspace")
+
+
+@dataclass(frozen=True)
+class WarmState:
+    """Compositor state saved by one process for the next one to start from.
+
+    Attributes:
+        signature: Instance signature the state belongs to.
+        clients: Output of :meth:`HyprlandIPC.get_clients`.
+        workspaces: Output of :meth:`HyprlandIPC.get_workspaces`.
+        monitors: Output of :meth:`HyprlandIPC.get_monitors`.
+        focus: Focus history as ``(address, workspace id)``, oldest first.
+        active_window: Address of the focused window, if any.
+        active_workspace: Id of the active workspace, if known.
+        sequence: Save counter of the file this state was loaded from (0 if
+            never saved).
+        saved_at: Wall-clock time of that save.
+    """
+
+    signature: str
+    clients: list[AnyDict]
+    workspaces: list[AnyDict]
+    monitors: list[AnyDict]
+    focus: list[tuple[str, int | None]]
+    active_window: str | None = None
+    active_workspace: int | None = None
+    sequence: int = 0
+    saved_at: float = 0.0
+
+    @classmethod
+    def capture(
+        cls, ipc: HyprlandIPC, focus: FocusHistory | None = None, signature: str | None = None
+    ) -> WarmState:
+        """Query the current state in one batched request.
+
+        Args:
+            ipc: Client to query.
+            focus: Focus history to keep; defaults to one seeded from the
+                clients' ``focusHistoryID``.
+            signature: Instance signature; defaults to
+                ``HYPRLAND_INSTANCE_SIGNATURE``.
+
+        Raises:
+            HyprlandIPCError: On IPC failure or without a signature.
+        """
+        signature = signature or os.getenv("HYPRLAND_INSTANCE_SIGNATURE")
+        if not signature:
+            raise HyprlandIPCError("Cannot capture state: HYPRLAND_INSTANCE_SIGNATURE is not set")
+        clients, workspaces, monitors, window, workspace = ipc.send_json_batch(_CAPTURE)
+        clients = normalize(clients, "list")
+        if focus is None:
+            focus = FocusHistory.from_clients(clients)
+        address = normalize(window, "dict").get("address")
+        ws_id = normalize(workspace, "dict").get("id")
+        return cls(
+            signature,
+            clients,
+            normalize(workspaces, "list"),
+            normalize(monitors, "list"),
+            focus.entries(),
+            address if isinstance(address, str) else None,
+            ws_id if isinstance(ws_id, int) else None,
+        )
+
+    def focus_history(self) -> FocusHistory:
+        """Rebuild the saved :class:`FocusHistory`."""
+        history = FocusHistory()
+        history.active_workspace = self.active_workspace
+        for address, workspace in self.focus:
+            history.focus(address, workspace)
+        return history
+
+    def matches(self, active_window: AnyDict, active_workspace: AnyDict) -> bool:
+        """Return True if fresh ``activewindow`` / ``activeworkspace`` replies agree.
+
+        Compares the focused window, the active workspace and that
+        workspace's window count, which catches most changes a stale state
+        would miss.
+        """
+        if active_window.get("address") != self.active_window:
+            return False
+        ws_id = active_workspace.get("id")
+        if ws_id != self.active_workspace:
+            return False
+        on_workspace = sum(
+            1
+            for c in self.clients
+            if isinstance(ws := c.get("workspace"), dict) and ws.get("id") == ws_id
+        )
+        return bool(active_workspace.get("windows", on_workspace) == on_workspace)
+
+    def reconcile(self, ipc: HyprlandIPC) -> WarmState:
+        """Return this state if it still matches the compositor, else a fresh one.
+
+        Costs one small batched query when the state is current, and one more
+        (a full :meth:`capture`) when it is not.
+
+        Raises:
+            HyprlandIPCError: On IPC failure.
+        """
+        window, workspace = ipc.send_json_batch(["activewindow", "activeworkspace"])
+        if self.matches(normalize(window, "dict"), normalize(workspace, "dict")):
+            return self
+        fresh = WarmState.capture(ipc, signature=self.signature)
+        return replace(fresh, sequence=self.sequence, saved_at=self.saved_at)
+
+
+def default_state_path(
+    signature: str | None = None, runtime_dir: str | os.PathLike[str] | None = None
+) -> Path:
+    """Return the warm-start file path for a Hyprland instance.
+
+    Raises:
+        HyprlandIPCError: If the signature or runtime directory cannot be determined.
+
+    Returns:
+        Path: ``<runtime_dir>/hypr/<signature>/hyprland-ipc.state``.
+    """
+    return default_snapshot_path(signature, runtime_dir).with_name(STATE_FILENAME)
+
+
+def _read_sequence(path: Path) -> int:
+    try:
+        with path.open("rb") as fh:
+            magic, layout, _, sequence, _ = _HEADER.unpack(fh.read(_HEADER.size))
+    except (OSError, struct.error):
+        return 0
+    return int(sequence) if (magic, layout) == (_MAGIC, _LAYOUT_VERSION) else 0
+
+
+def save_state(state: WarmState, path: Path | None = None) -> int:
+    """Atomically write *state*, stamped with the next sequence number.
+
+    Args:
+        state: State to save.
+        path: Destination; defaults to :func:`default_state_path` for the
+            state's signature.
+
+    Raises:
+        HyprlandIPCError: If the file cannot be written.
+
+    Returns:
+        int: The sequence number written.
+    """
+    path = path or default_state_path(state.signature)
+    sequence = _read_sequence(path) + 1
+    fields = (
+        state.signature,
+        state.clients,
+        state.workspaces,
+        state.monitors,
+        state.focus,
+        state.active_window,
+        state.active_workspace,
+    )
+    try:
+        try:
+            payload = marshal.dumps(fields)
+        except ValueError:
+            # Frozen replies (HyprlandIPC(frozen=True)) are not marshallable.
+            payload = marshal.dumps(thaw(fields))
+    except ValueError as e:
+        raise HyprlandIPCError(f"Cannot save state: {e}") from e
+    header = _HEADER.pack(_MAGIC, _LAYOUT_VERSION, marshal.version, sequence, time.time())
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(header + payload)
+        os.replace(tmp, path)
+    except OSError as e:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise HyprlandIPCError(f"Failed to save state to '{path}': {e}") from e
+    return sequence
+
+
+def load_state(
+    path: Path | None = None,
+    *,
+    signature: str | None = None,
+    max_age: float | None = None,
+) -> WarmState | None:
+    """Load a saved state if it is usable.
+
+    Args:
+        path: File to read; defaults to :func:`default_state_path`.
+        signature: Expected instance signature; defaults to
+            ``HYPRLAND_INSTANCE_SIGNATURE``.
+        max_age: Ignore states saved more than this many seconds ago.
+
+    Returns:
+        WarmState | None: The state, or None if the file is missing, corrupt,
+        from another instance or format, or too old.
+    """
+    signature = signature or os.getenv("HYPRLAND_INSTANCE_SIGNATURE")
+    try:
+        data = (path or default_state_path(signature)).read_bytes()
+        magic, layout, marshal_version, sequence, saved_at = _HEADER.unpack_from(data)
+    except (OSError, HyprlandIPCError, struct.error):
+        return None
+    if (magic, layout, marshal_version) != (_MAGIC, _LAYOUT_VERSION, marshal.version):
+        return None
+    if max_age is not None and time.time() - saved_at > max_age:
+        return None
+    try:
+        owner, clients, workspaces, monitors, focus, window, workspace = cast(
+            tuple[str, list[AnyDict], list[AnyDict], list[AnyDict], list[Any], Any, Any],
+            # The file lives in the user's private runtime dir and is mode 0600.
+            marshal.loads(data[_HEADER.size :]),  # noqa: S302
+        )
+    except (EOFError, ValueError, TypeError):
+        return None
+    state = WarmState(
+        owner, clients, workspaces, monitors, focus, window, workspace, sequence, saved_at
+    )
+    if signature is not None and state.signature != signature:
+        return None
+    return state
@@ -12,11 +12,12 @@ relying on a live compositor instance.
 
 from __future__ import annotations
 
+import contextlib
 import socket
 import tempfile
 import threading
 import uuid
-from collections.abc import Generator, Mapping
+from collections.abc import Callable, Generator, Mapping
 from pathlib import Path
 from typing import Literal, Self
 
@@ -199,3 +200,59 @@ def evt_server(tmp_path: Path, *, monkeypatch: pytest.MonkeyPatch) -> Generator[
 
     thread.join()
     sock_path.unlink(missing_ok=True)
+
+
+class ReplyServer:
+    """Threaded command socket that answers each connection like Hyprland.
+
+    Every accepted connection gets one request read and one reply written,
+    then it is closed. ``reply`` maps the request to the reply and may be
+    replaced by tests; connections whose request is empty are closed silently.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Bind *path* and start accepting connections."""
+        self.path = path
+        self.requests: list[bytes] = []
+        self.accepted = 0
+        self.reply: Callable[[bytes], bytes] = lambda request: b"ok " + request
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(path))
+        self._server.listen(16)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.accepted += 1
+            threading.Thread(target=self._answer, args=(conn,), daemon=True).start()
+
+    def _answer(self, conn: socket.socket) -> None:
+        with conn:
+            try:
+                request = conn.recv(65536)
+            except OSError:
+                return
+            if request:
+                self.requests.append(request)
+                conn.sendall(self.reply(request))
+
+    def close(self) -> None:
+        """Stop accepting and remove the socket file."""
+        with contextlib.suppress(OSError):
+            self._server.shutdown(socket.SHUT_RDWR)
+        self._server.close()
+        self._thread.join()
+        self.path.unlink(missing_ok=True)
+
+
+@pytest.fixture()
+def reply_server() -> Generator[ReplyServer, None, None]:
+    """Command socket server that replies ``ok <request>`` to each connection."""
+    server = ReplyServer(_make_short_socket("reply"))
+    yield server
+    server.close()
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.batching import DispatchQueue
+from hyprland_ipc.ipc import HyprlandIPC, HyprlandIPCError
+from tests.conftest import ReplyServer
+
+
+class _RecordingIPC(HyprlandIPC):
+    """HyprlandIPC that records dispatches instead of touching sockets."""
+
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__(Path("cmd"), Path("evt"))
+        self.fail = fail
+        self.requests: list[list[str]] = []
+        self.sent = threading.Event()
+
+    def dispatch(self, command: str) -> None:
+        self.batch([command])
+
+    def batch(self, commands: Sequence[str]) -> None:
+        self.requests.append(list(commands))
+        self.sent.set()
+        if self.fail:
+            raise HyprlandIPCError("boom")
+
+
+def test_context_exit_sends_one_batch() -> None:
+    ipc = _RecordingIPC()
+    with DispatchQueue(ipc, window=None) as queue:
+        futures = queue.dispatch_many(["movewindow l", "resizeactive 10 0"])
+        futures.append(queue.dispatch("focuswindow address:0x1"))
+        assert ipc.requests == []
+        assert queue.pending == len(futures)
+
+    assert ipc.requests == [["movewindow l", "resizeactive 10 0", "focuswindow address:0x1"]]
+    assert all(f.result(timeout=1) is None for f in futures)
+
+
+def test_window_timer_flushes() -> None:
+    ipc = _RecordingIPC()
+    queue = DispatchQueue(ipc, window=0.01)
+    future = queue.dispatch("a")
+    queue.dispatch("b")
+    assert ipc.sent.wait(timeout=2)
+    future.result(timeout=2)
+    assert ipc.requests == [["a", "b"]]
+    queue.close()
+
+
+def test_single_command_uses_dispatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    ipc = _RecordingIPC()
+    called: list[str] = []
+    monkeypatch.setattr(ipc, "dispatch", called.append)
+    with DispatchQueue(ipc, window=None) as queue:
+        queue.dispatch("only")
+    assert called == ["only"]
+
+
+def test_max_batch_flushes_immediately() -> None:
+    ipc = _RecordingIPC()
+    queue = DispatchQueue(ipc, window=None, max_batch=2)
+    queue.dispatch("a")
+    queue.dispatch("b")
+    queue.dispatch("c")
+    assert ipc.requests == [["a", "b"]]
+    queue.flush()
+    assert ipc.requests == [["a", "b"], ["c"]]
+
+
+def test_failure_propagates_to_every_future() -> None:
+    ipc = _RecordingIPC(fail=True)
+    with DispatchQueue(ipc, window=None) as queue:
+        first, second = queue.dispatch_many(["a", "b"])
+    for fut in (first, second):
+        with pytest.raises(HyprlandIPCError, match="boom"):
+            fut.result(timeout=1)
+
+
+def test_cancelled_future_is_not_sent() -> None:
+    ipc = _RecordingIPC()
+    with DispatchQueue(ipc, window=None) as queue:
+        keep = queue.dispatch("keep")
+        drop = queue.dispatch("drop")
+        assert drop.cancel()
+    assert keep.done()
+    assert ipc.requests == [["keep"]]
+
+
+def test_closed_queue_rejects_commands() -> None:
+    queue = DispatchQueue(_RecordingIPC(), window=None)
+    queue.close()
+    with pytest.raises(HyprlandIPCError, match="closed"):
+        queue.dispatch("late")
+
+
+def test_invalid_max_batch() -> None:
+    with pytest.raises(ValueError, match="max_batch"):
+        DispatchQueue(_RecordingIPC(), max_batch=0)
+
+
+def test_batch_wire_format(reply_server: ReplyServer) -> None:
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    with DispatchQueue(ipc, window=None) as queue:
+        futures = queue.dispatch_many(["movewindow l", "resizeactive 10 0"])
+    assert all(f.result(timeout=1) is None for f in futures)
+    assert reply_server.requests == [b"[[BATCH]]dispatch movewindow l;dispatch resizeactive 10 0"]
+
+
+def test_unbatchable_command_is_sent_alone_in_order(reply_server: ReplyServer) -> None:
+    def fake(request: bytes) -> bytes:
+        return b"unknown request" if request == b"dispatch exec x; y" else b"ok"
+
+    reply_server.reply = fake
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    with DispatchQueue(ipc, window=None) as queue:
+        first, bad, *rest = queue.dispatch_many(["a", "exec x; y", "b", "c"])
+
+    assert reply_server.requests == [
+        b"dispatch a",
+        b"dispatch exec x; y",
+        b"[[BATCH]]dispatch b;dispatch c",
+    ]
+    with pytest.raises(HyprlandIPCError):
+        bad.result(timeout=1)
+    assert all(f.result(timeout=1) is None for f in (first, *rest))
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import socket
+import subprocess
+import sys
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.__about__ import __version__
+from hyprland_ipc.cli import main
+from tests.conftest import ReplyServer
+
+
+@pytest.fixture()
+def instance(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[Path, None, None]:
+    """Instance directory with a reply server on .socket.sock, set up in the env."""
+    directory = tmp_path / "hypr" / "sig"
+    directory.mkdir(parents=True)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", "sig")
+    server = ReplyServer(directory / ".socket.sock")
+    server.reply = lambda request: b"unknown request" if request == b"bogus" else b"ok " + request
+    yield directory
+    server.close()
+
+
+def _event_server(path: Path, payload: bytes) -> threading.Thread:
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def _serve() -> None:
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(payload)
+        server.close()
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    thread.start()
+    return thread
+
+
+# ---------------------------------------------------------------------------#
+#                                  Commands                                  #
+# ---------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize(
+    ("argv", "output"),
+    [
+        (["query", "version"], b"ok version\n"),
+        (["query", "-j", "getoption", "general:gaps_in"], b"ok j/getoption general:gaps_in\n"),
+        (["dispatch", "workspace", "2"], b"ok dispatch workspace 2\n"),
+        (["batch", "keyword a 1", "dispatch b"], b"ok [[BATCH]]keyword a 1;dispatch b\n"),
+    ],
+)
+def test_commands(
+    instance: Path, capsysbinary: pytest.CaptureFixture[bytes], argv: list[str], output: bytes
+) -> None:
+    assert main(argv) == 0
+    assert capsysbinary.readouterr().out == output
+
+
+def test_error_reply_exits_1(instance: Path, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    assert main(["query", "bogus"]) == 1
+    assert capsysbinary.readouterr().out == b"unknown request\n"
+
+
+def test_instance_option(
+    instance: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.delenv("HYPRLAND_INSTANCE_SIGNATURE")
+    assert main(["query", "version"]) == 1
+    assert "Must run under Hyprland" in capsys.readouterr().err
+    assert main(["-i", "sig", "query", "version"]) == 0
+
+
+def test_connection_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert main(["-i", "missing", "dispatch", "exit"]) == 1
+
+
+# ---------------------------------------------------------------------------#
+#                                   Events                                   #
+# ---------------------------------------------------------------------------#
+
+
+def test_events_filters(instance: Path, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    thread = _event_server(
+        instance / ".socket2.sock",
+        b"workspacev2>>1,1\nactivewindowv2>>abc\n\nworkspacev2>>2,2\nworkspacev2>>3,3\n",
+    )
+    assert main(["events", "-e", "workspacev2", "--grep", ",", "-n", "2"]) == 0
+    thread.join()
+    assert capsysbinary.readouterr().out == b"workspacev2>>1,1\nworkspacev2>>2,2\n"
+
+
+def test_events_until_disconnect(
+    instance: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    thread = _event_server(instance / ".socket2.sock", b"a>>1\nb>>2\npartial")
+    assert main(["events", "--grep", "2"]) == 0
+    thread.join()
+    assert capsysbinary.readouterr().out == b"b>>2\n"
+
+
+# ---------------------------------------------------------------------------#
+#                                   Usage                                    #
+# ---------------------------------------------------------------------------#
+
+
+def test_help_and_version(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["--help"]) == 0
+    assert capsys.readouterr().out.startswith("usage: hyprland-ipc")
+    assert main(["-V"]) == 0
+    assert capsys.readouterr().out == f"hyprland-ipc {__version__}\n"
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["--bogus"],
+        ["-i"],
+        ["frobnicate"],
+        ["query"],
+        ["query", "-j"],
+        ["dispatch"],
+        ["batch"],
+        ["batch", "a;b"],
+        ["events", "-n", "0"],
+        ["events", "-n", "x"],
+        ["events", "-e"],
+        ["events", "--bogus"],
+    ],
+)
+def test_usage_errors(argv: list[str], capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(argv) == 2  # noqa: PLR2004
+    assert "hyprland-ipc: error:" in capsys.readouterr().err
+
+
+def test_module_entry_point_imports_little() -> None:
+    code = (
+        "import sys, runpy\n"
+        "sys.argv = ['hyprland-ipc', '--version']\n"
+        "try:\n"
+        "    runpy.run_module('hyprland_ipc', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = {'json', 'dataclasses', 'argparse', 'socket', 'hyprland_ipc.ipc'}\n"
+        "print(sorted(heavy & set(sys.modules)))\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines() == [f"hyprland-ipc {__version__}", "[]"]
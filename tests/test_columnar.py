@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import pytest
+
+from hyprland_ipc.columnar import ClientTable
+
+
+CLIENTS = [
+    {
+        "address": "0xa",
+        "at": [300, 0],
+        "size": [200, 100],
+        "workspace": {"id": 1, "name": "1"},
+        "floating": True,
+        "monitor": 1,
+        "class": "kitty",
+        "title": "shell",
+        "pid": 10,
+    },
+    {
+        "address": "0xb",
+        "at": [100, 50],
+        "size": [200, 100],
+        "workspace": {"id": 2, "name": "2"},
+        "floating": True,
+        "monitor": 1,
+        "class": "firefox",
+        "title": "web",
+        "pid": 11,
+    },
+    {
+        "address": "0xc",
+        "at": [0, 0],
+        "size": [500, 500],
+        "workspace": {"id": 1, "name": "1"},
+        "floating": False,
+        "monitor": 0,
+        "class": "kitty",
+        "title": "editor",
+        "pid": 12,
+    },
+]
+
+
+@pytest.fixture()
+def table() -> ClientTable:
+    return ClientTable.from_clients(CLIENTS)
+
+
+def test_columns_are_populated(table: ClientTable) -> None:
+    assert len(table) == len(CLIENTS)
+    assert table.column("x") == [300, 100, 0]
+    assert table.column("workspace") == [1, 2, 1]
+    assert table.column("floating") == [1, 1, 0]
+    assert table.column("class", [0, 2]) == ["kitty", "kitty"]
+
+
+def test_strings_are_interned(table: ClientTable) -> None:
+    first, _, last = table.column("class")
+    assert first is last
+
+
+def test_floating_on_monitor_sorted_by_x(table: ClientTable) -> None:
+    rows = table.sort_by("x", table.where(floating=True, monitor=1))
+    assert table.column("address", rows) == ["0xb", "0xa"]
+
+
+def test_where_with_predicate_and_chaining(table: ClientTable) -> None:
+    wide = table.where(width=lambda w: w > 300)  # noqa: PLR2004
+    assert table.column("address", wide) == ["0xc"]
+    assert table.where(wide, floating=True) == []
+
+
+def test_sort_descending(table: ClientTable) -> None:
+    assert table.sort_by("pid", reverse=True) == [2, 1, 0]
+
+
+def test_rows_materializes_dicts(table: ClientTable) -> None:
+    (row,) = table.rows([1])
+    assert row["address"] == "0xb"
+    assert (row["x"], row["y"], row["width"], row["height"]) == (100, 50, 200, 100)
+
+
+def test_missing_fields_default() -> None:
+    table = ClientTable.from_clients([{"address": "0x1"}])
+    assert table.rows() == [
+        {
+            "x": 0,
+            "y": 0,
+            "width": 0,
+            "height": 0,
+            "workspace": 0,
+            "pid": 0,
+            "monitor": 0,
+            "floating": 0,
+            "address": "0x1",
+            "class": "",
+            "title": "",
+        }
+    ]
+
+
+def test_unknown_column(table: ClientTable) -> None:
+    with pytest.raises(KeyError):
+        table.where(nope=1)
@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.commands import (
+    Command,
+    CommandTemplate,
+    Dispatch,
+    Query,
+    address,
+    integer,
+)
+from hyprland_ipc.ipc import HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.protocol import encode_command
+from tests.conftest import ReplyServer
+
+
+# ---------------------------------------------------------------------------#
+#                                  Templates                                 #
+# ---------------------------------------------------------------------------#
+
+
+def test_dispatch_templates_build_payloads() -> None:
+    assert Dispatch.focuswindow(address="0xabc").payload == b"dispatch focuswindow address:0xabc"
+    assert Dispatch.workspace(workspace=3).payload == b"dispatch workspace 3"
+    assert Dispatch.movefocus(direction="l").payload == b"dispatch movefocus l"
+    assert Dispatch.exec(command="kitty; notify-send hi").text == (
+        "dispatch exec kitty; notify-send hi"
+    )
+
+
+def test_address_slots_are_normalized() -> None:
+    assert (
+        Dispatch.closewindow(address="55d0beef").text == "dispatch closewindow address:0x55d0beef"
+    )
+
+
+def test_constant_templates_reuse_one_command() -> None:
+    assert Dispatch.killactive() is Dispatch.killactive()
+    assert Dispatch.killactive().payload == b"dispatch killactive"
+
+
+def test_json_template() -> None:
+    option = CommandTemplate("getoption {name}", json=True)
+    command = option(name="general:gaps_in")
+    assert command.payload == b"j/getoption general:gaps_in"
+    assert command.json
+
+
+@pytest.mark.parametrize(
+    ("template", "values"),
+    [
+        (Dispatch.focuswindow, {"address": "not-hex"}),
+        (Dispatch.movefocus, {"direction": "left"}),
+        (Dispatch.fullscreen, {"mode": "max"}),
+        (Dispatch.workspace, {"workspace": "2; dispatch exit"}),
+        (Dispatch.workspace, {"workspace": ""}),
+        (Dispatch.exec, {"command": "a\nb"}),
+    ],
+)
+def test_invalid_values_are_rejected(template: CommandTemplate, values: dict[str, str]) -> None:
+    with pytest.raises(ValueError):
+        template(**values)
+
+
+def test_missing_or_extra_slots() -> None:
+    with pytest.raises(TypeError, match="takes slots"):
+        Dispatch.focuswindow()
+    with pytest.raises(TypeError, match="takes slots"):
+        Dispatch.workspace(workspace=1, extra=2)
+    with pytest.raises(TypeError, match="takes slots"):
+        Dispatch.killactive(force=True)
+
+
+@pytest.mark.parametrize(
+    ("template", "checks"),
+    [
+        ("dispatch {}", {}),
+        ("dispatch {0}", {}),
+        ("dispatch {x!r}", {}),
+        ("dispatch {x:>4}", {}),
+        ("dispatch {x", {}),
+        ("dispatch {x}", {"y": integer}),
+        ("dispatch a\nb", {}),
+    ],
+)
+def test_malformed_templates(template: str, checks: dict[str, object]) -> None:
+    with pytest.raises(ValueError):
+        CommandTemplate(template, **checks)  # type: ignore[arg-type]
+
+
+def test_custom_template_with_checks() -> None:
+    resize = CommandTemplate(
+        "dispatch resizewindowpixel exact {w} {h},address:{address}",
+        w=integer,
+        h=integer,
+        address=address,
+    )
+    assert resize.slots == {"w", "h", "address"}
+    assert resize(w=800, h="600", address="abc").text == (
+        "dispatch resizewindowpixel exact 800 600,address:0xabc"
+    )
+
+
+# ---------------------------------------------------------------------------#
+#                                   Query                                    #
+# ---------------------------------------------------------------------------#
+
+
+def test_query() -> None:
+    assert Query("clients", json=True).payload == b"j/clients"
+    assert Query("version").payload == b"version"
+    assert Query("clients", json=True) == Query("clients", json=True)
+    assert Query("clients") != Query("clients", json=True)
+    assert len({Query("clients"), Query("clients")}) == 1
+    assert repr(Query("version")) == "Query('version', json=False)"
+
+
+@pytest.mark.parametrize("command", ["", "j/clients", "dispatch exit", "[[BATCH]]a;b", "a\nb"])
+def test_invalid_queries(command: str) -> None:
+    with pytest.raises(ValueError):
+        Query(command)
+
+
+def test_command_equality_with_other_types() -> None:
+    assert Command(b"x") != "x"
+
+
+def test_encode_command_is_cached() -> None:
+    encode_command.cache_clear()
+    first = encode_command("j/clients")
+    assert encode_command("j/clients") is first
+    assert encode_command.cache_info().hits == 1
+
+
+# ---------------------------------------------------------------------------#
+#                                  execute()                                 #
+# ---------------------------------------------------------------------------#
+
+
+def test_execute_sends_payload(reply_server: ReplyServer) -> None:
+    reply_server.reply = lambda request: (
+        b'[{"address": "0x1"}]' if request == b"j/clients" else b"ok"
+    )
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    assert ipc.execute(Query("clients", json=True)) == [{"address": "0x1"}]
+    assert ipc.execute(Dispatch.focuswindow(address="0x1")) == "ok"
+    assert reply_server.requests == [b"j/clients", b"dispatch focuswindow address:0x1"]
+
+
+@pytest.mark.parametrize(
+    ("reply", "message"),
+    [(b"unknown request", "Hyprland returned an error"), (b"notjson", "Invalid JSON")],
+)
+def test_execute_errors(reply_server: ReplyServer, reply: bytes, message: str) -> None:
+    reply_server.reply = lambda _request: reply
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    with pytest.raises(HyprlandIPCError, match=message):
+        ipc.execute(Query("clients", json=True))
@@ -0,0 +1,204 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.config import OptionCache, format_value, option_value
+from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError
+from tests.conftest import ReplyServer
+
+
+class FakeHyprland:
+    """Replies to getoption / keyword requests, batched or not, from a dict."""
+
+    def __init__(self, options: dict[str, dict[str, object]], separator: str = "") -> None:
+        """Serve *options*, mapping name to its getoption value field.
+
+        Batched replies are concatenated like in ``test_ipc``, or joined with
+        *separator* as some Hyprland versions do.
+        """
+        self.options = options
+        self.separator = separator
+        self.keywords: list[str] = []
+
+    def _one(self, command: str) -> str:
+        if command.startswith("j/getoption "):
+            name = command.removeprefix("j/getoption ")
+            if name not in self.options:
+                return "no such option"
+            return json.dumps({"option": name, **self.options[name], "set": True})
+        if command.startswith("keyword "):
+            self.keywords.append(command)
+            name = command.split()[1]
+            return "ok" if name in self.options else f"config option <{name}> does not exist."
+        return "unknown request"
+
+    def __call__(self, request: bytes) -> bytes:
+        """Answer one request, joining batched replies like Hyprland."""
+        text = request.decode()
+        if text.startswith("[[BATCH]]"):
+            replies = [self._one(c) for c in text.removeprefix("[[BATCH]]").split(";")]
+            return self.separator.join(replies).encode()
+        return self._one(text).encode()
+
+
+@pytest.fixture(params=["", "\n\n"], ids=["concatenated", "separated"])
+def hypr(request: pytest.FixtureRequest, reply_server: ReplyServer) -> FakeHyprland:
+    fake = FakeHyprland(
+        {
+            "general:gaps_in": {"custom": "5 5 5 5"},
+            "general:border_size": {"int": 2},
+            "decoration:rounding": {"int": 8},
+            "decoration:active_opacity": {"float": 1.0},
+            "input:kb_layout": {"str": "us"},
+            "misc:vfr": {"int": 1},
+        },
+        separator=request.param,
+    )
+    reply_server.reply = fake
+    return fake
+
+
+@pytest.fixture()
+def options(reply_server: ReplyServer, hypr: FakeHyprland) -> OptionCache:
+    return OptionCache(HyprlandIPC(reply_server.path, Path("evt")))
+
+
+# ---------------------------------------------------------------------------#
+#                                   Helpers                                  #
+# ---------------------------------------------------------------------------#
+
+
+def test_option_value() -> None:
+    assert option_value({"option": "a", "int": 3, "set": True}) == 3  # noqa: PLR2004
+    assert option_value({"option": "a", "vec2": [1, 2]}) == [1, 2]
+    with pytest.raises(HyprlandIPCError, match="without a value"):
+        option_value({"option": "a", "set": False})
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(True, "1"), (False, "0"), (0.5, "0.5"), (1.0, "1"), ((10, 20), "10 20"), (" us ", "us")],
+)
+def test_format_value(value: object, expected: str) -> None:
+    assert format_value(value) == expected
+
+
+# ---------------------------------------------------------------------------#
+#                                    Cache                                   #
+# ---------------------------------------------------------------------------#
+
+
+def test_get_caches_until_configreloaded(options: OptionCache, reply_server: ReplyServer) -> None:
+    assert options.get("general:border_size") == 2  # noqa: PLR2004
+    assert options.get("general:border_size") == 2  # noqa: PLR2004
+    assert len(reply_server.requests) == 1
+    assert (options.hits, options.misses) == (1, 1)
+
+    options.handle_event(Event("workspace", "1"))
+    assert "general:border_size" in options
+    options.handle_event(Event("configreloaded", ""))
+    assert "general:border_size" not in options
+    options.get("general:border_size")
+    assert len(reply_server.requests) == 2  # noqa: PLR2004
+
+
+def test_get_many_fetches_missing_in_one_batch(
+    options: OptionCache, reply_server: ReplyServer
+) -> None:
+    options.get("input:kb_layout")
+    values = options.get_many(["input:kb_layout", "misc:vfr", "decoration:rounding"])
+    assert values == {"input:kb_layout": "us", "misc:vfr": 1, "decoration:rounding": 8}
+    assert (
+        reply_server.requests[-1]
+        == b"[[BATCH]]j/getoption misc:vfr;j/getoption decoration:rounding"
+    )
+
+
+def test_unknown_option_raises(options: OptionCache) -> None:
+    with pytest.raises(HyprlandIPCError):
+        options.get("nope:nothing")
+
+
+def test_invalidate_one(options: OptionCache) -> None:
+    options.get_many(["misc:vfr", "input:kb_layout"])
+    options.invalidate("misc:vfr")
+    assert "misc:vfr" not in options
+    assert "input:kb_layout" in options
+
+
+# ---------------------------------------------------------------------------#
+#                                apply_config                                #
+# ---------------------------------------------------------------------------#
+
+
+def test_apply_config_sends_only_differences(
+    options: OptionCache, hypr: FakeHyprland, reply_server: ReplyServer
+) -> None:
+    sent = options.apply_config(
+        {
+            "general:border_size": 2,
+            "decoration:rounding": 10,
+            "decoration:active_opacity": "1.0",
+            "input:kb_layout": "de",
+            "misc:vfr": True,
+            "general:gaps_in": "5 5 5 5",
+        }
+    )
+    assert sent == ["decoration:rounding", "input:kb_layout"]
+    assert hypr.keywords == ["keyword decoration:rounding 10", "keyword input:kb_layout de"]
+    assert reply_server.requests[-1] == (
+        b"[[BATCH]]keyword decoration:rounding 10;keyword input:kb_layout de"
+    )
+
+    # Applying the same config again is answered from the cache alone.
+    before = len(reply_server.requests)
+    assert options.apply_config({"decoration:rounding": 10, "input:kb_layout": "de"}) == []
+    assert len(reply_server.requests) == before
+
+
+def test_apply_config_rejected_keyword_invalidates(
+    options: OptionCache, hypr: FakeHyprland
+) -> None:
+    options.get_many(["misc:vfr", "decoration:rounding"])
+    del hypr.options["decoration:rounding"]  # cached, but now rejected by "keyword"
+    with pytest.raises(HyprlandIPCError, match="rejected keywords"):
+        options.apply_config({"decoration:rounding": 3, "misc:vfr": 0})
+    assert "decoration:rounding" not in options
+    assert "misc:vfr" not in options
+
+
+def test_apply_config_rejects_unsendable_values(options: OptionCache) -> None:
+    with pytest.raises(ValueError, match="must not contain ';'"):
+        options.apply_config({"input:kb_layout": "us;dispatch exit"})
+
+
+# ---------------------------------------------------------------------------#
+#                                 send_batch                                 #
+# ---------------------------------------------------------------------------#
+
+
+def test_send_batch(reply_server: ReplyServer) -> None:
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    assert ipc.send_batch([]) == ""
+    assert reply_server.requests == []
+    assert ipc.send_batch(["a", "b"]) == "ok [[BATCH]]a;b"
+    with pytest.raises(ValueError, match="must not contain"):
+        ipc.send_batch(["a;b"])
+
+
+def test_send_json_batch(reply_server: ReplyServer) -> None:
+    reply_server.reply = lambda _request: b'[1, 2]\n\n{"a": 1}\n'
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    assert ipc.send_json_batch(["x", "y"]) == [[1, 2], {"a": 1}]
+    with pytest.raises(HyprlandIPCError, match="Expected 3 replies"):
+        ipc.send_json_batch(["x", "y", "z"])
+    reply_server.reply = lambda _request: b"[1, 2] oops"
+    with pytest.raises(HyprlandIPCError, match="Invalid JSON"):
+        ipc.send_json_batch(["x", "y"])
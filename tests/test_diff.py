@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+from hyprland_ipc.diff import SnapshotDiffer, diff_snapshots, diff_values
+
+
+def _client(address: str, x: int = 0, ws: int = 1, title: str = "t") -> dict[str, object]:
+    return {
+        "address": address,
+        "at": [x, 0],
+        "size": [100, 100],
+        "workspace": {"id": ws, "name": str(ws)},
+        "title": title,
+    }
+
+
+# ---------------------------------------------------------------------------#
+#                               diff_values()                                #
+# ---------------------------------------------------------------------------#
+
+
+def test_diff_values_equal() -> None:
+    assert diff_values({"a": [1, 2]}, {"a": [1, 2]}) == []
+
+
+def test_diff_values_nested_paths() -> None:
+    old = _client("0x1")
+    new = _client("0x1", x=50, ws=2)
+    assert diff_values(old, new) == [("at", 0), ("workspace", "id"), ("workspace", "name")]
+
+
+def test_diff_values_added_key_and_resized_list() -> None:
+    assert diff_values({"a": [1]}, {"a": [1, 2], "b": 0}) == [("a",), ("b",)]
+
+
+# ---------------------------------------------------------------------------#
+#                             diff_snapshots()                               #
+# ---------------------------------------------------------------------------#
+
+
+def test_diff_snapshots_added_removed_changed() -> None:
+    old = [_client("0x1"), _client("0x2"), _client("0x3")]
+    new = [_client("0x1"), _client("0x3", title="new"), _client("0x4")]
+
+    result = diff_snapshots(old, new)
+
+    assert set(result.added) == {"0x4"}
+    assert set(result.removed) == {"0x2"}
+    assert result.changed == {"0x3": [("title",)]}
+    assert result
+
+
+def test_diff_snapshots_unchanged_is_falsy() -> None:
+    old = [_client(f"0x{i}") for i in range(200)]
+    assert not diff_snapshots(old, copy.deepcopy(old))
+
+
+def test_diff_snapshots_infers_id_key() -> None:
+    old = [{"id": 1, "windows": 1}, {"id": 2, "windows": 0}]
+    new = [{"id": 1, "windows": 2}]
+    result = diff_snapshots(old, new)
+    assert result.changed == {1: [("windows",)]}
+    assert set(result.removed) == {2}
+
+
+def test_diff_snapshots_explicit_key() -> None:
+    old = [{"id": 0, "name": "DP-1", "x": 0}]
+    new = [{"id": 5, "name": "DP-1", "x": 0}]
+    result = diff_snapshots(old, new, key="name")
+    assert result.changed == {"DP-1": [("id",)]}
+
+
+def test_diff_snapshots_empty() -> None:
+    assert not diff_snapshots([], [])
+
+
+# ---------------------------------------------------------------------------#
+#                              SnapshotDiffer                                #
+# ---------------------------------------------------------------------------#
+
+
+def test_snapshot_differ_tracks_previous() -> None:
+    differ = SnapshotDiffer()
+    first = differ.update([_client("0x1")])
+    assert set(first.added) == {"0x1"}
+
+    second = differ.update([_client("0x1", x=10)])
+    assert second.changed == {"0x1": [("at", 0)]}
+    assert not differ.update([_client("0x1", x=10)])
+
+
+def test_update_raw_skips_parsing_unchanged_reply(monkeypatch: pytest.MonkeyPatch) -> None:
+    differ = SnapshotDiffer()
+    reply = json.dumps([_client("0x1"), _client("0x2")], indent=4)
+    assert set(differ.update_raw(reply).added) == {"0x1", "0x2"}
+
+    monkeypatch.setattr(json, "loads", None)  # an identical reply is not parsed
+    assert not differ.update_raw(reply)
+
+
+def test_update_raw_matches_update() -> None:
+    old = [_client("0x1"), _client("0x2", ws=2), _client("0x3")]
+    new = [_client("0x1", title="new"), _client("0x3"), _client("0x4")]
+    raw, parsed = SnapshotDiffer(), SnapshotDiffer()
+    for snapshot, sort_keys in ((old, False), (new, False), (new, True), (old, False)):
+        # The third reply only reorders keys: equal values are not changes.
+        reply = json.dumps(snapshot, sort_keys=sort_keys).encode()
+        assert raw.update_raw(reply) == parsed.update(snapshot)
+    assert raw.previous == parsed.previous
+    # update() forgets the raw reply, so the next one is parsed again.
+    raw.update(new)
+    assert raw.update_raw(json.dumps(old)) == diff_snapshots(new, old)
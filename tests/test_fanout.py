@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from hyprland_ipc.fanout import EventFanout
+from hyprland_ipc.ipc import Event, HyprlandIPCError
+
+
+def _events(n: int) -> list[Event]:
+    return [Event("workspace", str(i)) for i in range(n)]
+
+
+def test_every_subscriber_sees_every_event() -> None:
+    fanout = EventFanout(iter(_events(5)), capacity=16)
+    first = fanout.subscribe("block")
+    second = fanout.subscribe("drop-oldest")
+    fanout.pump()
+    assert list(first) == _events(5)
+    assert list(second) == _events(5)
+    assert first.dropped == second.dropped == 0
+
+
+def test_drop_oldest_counts_dropped_events() -> None:
+    fanout = EventFanout(iter(_events(10)), capacity=4)
+    slow = fanout.subscribe("drop-oldest")
+    fanout.pump()
+    assert [e.data for e in slow] == ["6", "7", "8", "9"]
+    assert slow.dropped == 6  # noqa: PLR2004
+
+
+def test_coalesce_keeps_latest_per_key() -> None:
+    source = [
+        Event("activewindowv2", "a"),
+        Event("workspace", "1"),
+        Event("activewindowv2", "b"),
+        Event("workspace", "2"),
+        Event("activewindowv2", "c"),
+        Event("title", "t"),
+    ]
+    fanout = EventFanout(iter(source), capacity=2)
+    sub = fanout.subscribe("coalesce")
+    fanout.pump()
+    # evicted: a, 1, b, 2 -> coalesced to latest per name; buffer holds c, t
+    assert list(sub) == [
+        Event("activewindowv2", "b"),
+        Event("workspace", "2"),
+        Event("activewindowv2", "c"),
+        Event("title", "t"),
+    ]
+    assert sub.dropped == 2  # noqa: PLR2004
+
+
+def test_block_policy_throttles_producer_only_for_its_consumer() -> None:
+    fanout = EventFanout(iter(_events(20)), capacity=2)
+    blocking = fanout.subscribe("block")
+    fast = fanout.subscribe("drop-oldest")
+    fanout.start()
+
+    received = [e.data for e in blocking]
+    fanout.join(timeout=5)
+
+    assert received == [str(i) for i in range(20)]
+    assert blocking.dropped == 0
+    # the fast consumer never read, so it only lost events
+    assert fast.lag + fast.dropped == 20  # noqa: PLR2004
+
+
+def test_slow_consumer_does_not_block_fast_one() -> None:
+    release = threading.Event()
+
+    def source() -> Iterator[Event]:
+        yield from _events(50)
+        release.wait(timeout=5)
+
+    fanout = EventFanout(source(), capacity=4)
+    fast = fanout.subscribe("block")
+    slow = fanout.subscribe("drop-oldest")
+    fanout.start()
+
+    got = [fast.get(timeout=5) for _ in range(50)]
+    assert [e.data for e in got if e is not None] == [str(i) for i in range(50)]
+    release.set()
+    fanout.join(timeout=5)
+    assert slow.dropped == 46  # noqa: PLR2004
+
+
+def test_late_subscriber_starts_at_head() -> None:
+    fanout = EventFanout(iter(()), capacity=4)
+    fanout.publish(Event("old", ""))
+    sub = fanout.subscribe()
+    fanout.publish(Event("new", ""))
+    assert sub.get(timeout=1) == Event("new", "")
+
+
+def test_closed_subscription_stops_iteration() -> None:
+    fanout = EventFanout(iter(()), capacity=1)
+    sub = fanout.subscribe("block")
+    sub.close()
+    fanout.publish(Event("a", ""))
+    fanout.publish(Event("b", ""))  # would block if the closed sub still counted
+    assert sub.get(timeout=0) is None
+
+
+def test_source_error_surfaces_to_subscribers() -> None:
+    def broken() -> Iterator[Event]:
+        yield Event("ok", "")
+        raise HyprlandIPCError("socket gone")
+
+    fanout = EventFanout(broken())
+    sub = fanout.subscribe()
+    fanout.pump()
+    assert sub.get() == Event("ok", "")
+    with pytest.raises(HyprlandIPCError, match="socket gone"):
+        sub.get()
+
+
+def test_get_timeout_returns_none() -> None:
+    fanout = EventFanout(iter(()))
+    assert fanout.subscribe().get(timeout=0.01) is None
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="capacity"):
+        EventFanout(iter(()), capacity=0)
+    with pytest.raises(ValueError, match="policy"):
+        EventFanout(iter(())).subscribe("bogus")  # type: ignore[arg-type]
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.focus import FocusHistory
+from hyprland_ipc.ipc import Event, HyprlandIPC
+
+
+def _client(address: str, ws: int, focus_id: int) -> dict[str, object]:
+    return {"address": address, "workspace": {"id": ws}, "focusHistoryID": focus_id}
+
+
+# Most recent first: 0xa (ws 1), 0xc (ws 2), 0xb (ws 1), 0xd (ws 2).
+CLIENTS = [
+    _client("0xb", 1, 2),
+    _client("0xa", 1, 0),
+    _client("0xd", 2, 3),
+    _client("0xc", 2, 1),
+]
+
+
+@pytest.fixture()
+def history() -> FocusHistory:
+    history = FocusHistory.from_clients(CLIENTS)
+    history.active_workspace = 1
+    return history
+
+
+def test_seeded_from_focus_history_ids(history: FocusHistory) -> None:
+    assert history.order() == ["0xa", "0xc", "0xb", "0xd"]
+    assert history.order(workspace=2) == ["0xc", "0xd"]
+    assert history.current == "0xa"
+    assert history.previous() == "0xc"
+    assert history.previous(workspace=1) == "0xb"
+    assert history.last_on(2) == "0xc"
+    assert len(history) == 4  # noqa: PLR2004
+    assert "0xd" in history
+
+
+def test_focus_event_moves_window_to_front(history: FocusHistory) -> None:
+    history.handle_event(Event("activewindowv2", "d"))
+    assert history.order(limit=2) == ["0xd", "0xa"]
+    assert history.last_on(2) == "0xd"
+    assert history.previous() == "0xa"
+
+
+def test_close_prunes_everywhere(history: FocusHistory) -> None:
+    history.handle_event(Event("closewindow", "c"))
+    history.handle_event(Event("closewindow", "d"))
+    assert history.order() == ["0xa", "0xb"]
+    assert history.last_on(2) is None
+    assert history.workspace_of("0xc") is None
+    history.handle_event(Event("closewindow", "ffff"))  # unknown: ignored
+
+
+def test_unknown_window_lands_on_active_workspace(history: FocusHistory) -> None:
+    history.handle_event(Event("workspacev2", "3,3"))
+    history.handle_event(Event("activewindowv2", "e"))
+    assert history.last_on(3) == "0xe"
+    history.handle_event(Event("focusedmonv2", "DP-1,2"))
+    history.handle_event(Event("activewindowv2", "f"))
+    assert history.workspace_of("0xf") == 2  # noqa: PLR2004
+
+
+def test_empty_focus_is_ignored(history: FocusHistory) -> None:
+    history.handle_event(Event("activewindowv2", ""))
+    history.handle_event(Event("activewindowv2", ","))
+    assert history.current == "0xa"
+
+
+def test_move_keeps_rank(history: FocusHistory) -> None:
+    history.handle_event(Event("movewindowv2", "d,1,1"))
+    assert history.order(workspace=1) == ["0xa", "0xb", "0xd"]
+    assert history.order(workspace=2) == ["0xc"]
+    assert history.order() == ["0xa", "0xc", "0xb", "0xd"]
+    history.handle_event(Event("movewindowv2", "b,5,5"))
+    assert history.last_on(5) == "0xb"
+    history.handle_event(Event("movewindowv2", "ffff,1,1"))  # unknown: ignored
+    assert "0xffff" not in history
+
+
+def test_focus_without_any_workspace() -> None:
+    history = FocusHistory()
+    history.focus("0x1")
+    assert history.current == "0x1"
+    assert history.workspace_of("0x1") is None
+    history.remove("0x1")
+    assert history.current is None
+    assert history.previous() is None
+
+
+def test_from_ipc(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(HyprlandIPC, "get_clients", lambda self: CLIENTS)
+    monkeypatch.setattr(HyprlandIPC, "get_active_workspace", lambda self: {"id": 2})
+    history = FocusHistory.from_ipc(HyprlandIPC(Path("cmd"), Path("evt")))
+    assert history.active_workspace == 2  # noqa: PLR2004
+    assert history.current == "0xa"
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.handlers import EventDispatcher, by_name, by_window
+from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError
+
+
+def test_keys() -> None:
+    assert by_name(Event("workspace", "2")) == "workspace"
+    assert by_window(Event("closewindow", "abc")) == "0xabc"
+    assert by_window(Event("openwindow", "abc,1,kitty,title")) == "0xabc"
+    assert by_window(Event("workspace", "2")) == "workspace"
+
+
+def test_same_key_keeps_order_across_threads() -> None:
+    seen: list[str] = []
+    lock = threading.Lock()
+
+    def handler(event: Event) -> None:
+        # later events sleep less, so only per-key ordering keeps them in order
+        time.sleep(0.01 * (5 - int(event.data)))
+        with lock:
+            seen.append(event.data)
+
+    with EventDispatcher(handler, concurrency=4) as dispatcher:
+        for i in range(5):
+            dispatcher.submit(Event("same", str(i)))
+
+    assert seen == ["0", "1", "2", "3", "4"]
+
+
+def test_different_keys_run_in_parallel() -> None:
+    barrier = threading.Barrier(3, timeout=5)
+
+    def handler(_event: Event) -> None:
+        barrier.wait()  # only passes if all three run at the same time
+
+    with EventDispatcher(handler, concurrency=3) as dispatcher:
+        for name in ("a", "b", "c"):
+            dispatcher.submit(Event(name, ""))
+
+
+def test_concurrency_limit_is_respected() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def handler(_event: Event) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+
+    with EventDispatcher(handler, concurrency=2) as dispatcher:
+        for i in range(10):
+            dispatcher.submit(Event(str(i), ""))
+
+    assert peak <= 2  # noqa: PLR2004
+
+
+def test_coroutine_handler() -> None:
+    seen: list[str] = []
+
+    async def handler(event: Event) -> None:
+        await asyncio.sleep(0.01 * (3 - int(event.data)))
+        seen.append(event.data)
+
+    with EventDispatcher(handler, concurrency=4) as dispatcher:
+        for i in range(3):
+            dispatcher.submit(Event("same", str(i)))
+        assert dispatcher.join(timeout=5)
+
+    assert seen == ["0", "1", "2"]
+
+
+def test_handler_error_is_reported() -> None:
+    def handler(_event: Event) -> None:
+        raise RuntimeError("boom")
+
+    dispatcher = EventDispatcher(handler, concurrency=1)
+    dispatcher.submit(Event("a", ""))
+    dispatcher.join()
+    with pytest.raises(HyprlandIPCError, match="boom"):
+        dispatcher.submit(Event("b", ""))
+    dispatcher.close()
+
+
+def test_key_error_does_not_hold_a_slot() -> None:
+    def key(event: Event) -> str:
+        if event.name == "bad":
+            raise KeyError(event.name)
+        return event.name
+
+    handled: list[Event] = []
+    with EventDispatcher(handled.append, concurrency=1, key=key) as dispatcher:
+        with pytest.raises(KeyError):
+            dispatcher.submit(Event("bad", ""))
+        dispatcher.submit(Event("good", ""))  # would block on a leaked slot
+    assert handled == [Event("good", "")]
+
+
+def test_start_failure_releases_slot() -> None:
+    dispatcher = EventDispatcher(lambda _event: None, concurrency=1)
+    dispatcher.close()
+    # The pool is shut down: the failure is reported like a handler error.
+    dispatcher.submit(Event("a", ""))
+    assert dispatcher.join(timeout=1)
+    with pytest.raises(HyprlandIPCError, match="shutdown"):
+        dispatcher.submit(Event("a", ""))
+
+
+def test_invalid_concurrency() -> None:
+    with pytest.raises(ValueError, match="concurrency"):
+        EventDispatcher(lambda _e: None, concurrency=0)
+
+
+def test_listen_events_with_coroutine_handler(monkeypatch: pytest.MonkeyPatch) -> None:
+    produced = [Event("a", "1"), Event("b", "2")]
+
+    def fake_events(_self: HyprlandIPC) -> Iterator[Event]:
+        yield from produced
+
+    monkeypatch.setattr(HyprlandIPC, "events", fake_events)
+
+    captured: list[Event] = []
+
+    async def handler(event: Event) -> None:
+        captured.append(event)
+
+    HyprlandIPC(Path("cmd"), Path("evt")).listen_events(handler)
+    assert sorted(captured, key=lambda e: e.name) == produced
+
+
+def test_listen_events_with_thread_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    produced = [Event("openwindow", f"{i},1,kitty,t") for i in range(4)]
+    monkeypatch.setattr(HyprlandIPC, "events", lambda _self: iter(produced))
+
+    threads: set[str] = set()
+
+    def handler(_event: Event) -> None:
+        threads.add(threading.current_thread().name)
+
+    HyprlandIPC(Path("cmd"), Path("evt")).listen_events(handler, concurrency=2, key=by_window)
+    assert all(name.startswith("hyprland-handler") for name in threads)
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import pytest
+
+from hyprland_ipc.history import EventHistory
+from hyprland_ipc.ipc import Event
+
+
+def _events(n: int) -> list[Event]:
+    return [Event("workspace" if i % 2 else "activewindow", f"data{i}") for i in range(n)]
+
+
+def test_record_assigns_monotonic_sequence_numbers() -> None:
+    history = EventHistory(capacity=8)
+    seqs = [history.record(ev) for ev in _events(3)]
+    assert seqs == [1, 2, 3]
+    assert len(history) == len(seqs)
+    assert [e.event for e in history] == _events(3)
+
+
+def test_since_returns_newer_events_only() -> None:
+    history = EventHistory(capacity=8)
+    for ev in _events(5):
+        history.record(ev)
+    assert [e.seq for e in history.since(3)] == [4, 5]
+    assert [e.seq for e in history.since(0, limit=2)] == [1, 2]
+    assert history.since(5) == []
+
+
+def test_ring_evicts_oldest_when_full() -> None:
+    history = EventHistory(capacity=4)
+    for ev in _events(10):
+        history.record(ev)
+    assert history.first_seq == 7  # noqa: PLR2004
+    assert [e.event.data for e in history] == ["data6", "data7", "data8", "data9"]
+    assert history.missed(2) == 4  # noqa: PLR2004
+    assert history.missed(6) == 0
+
+
+def test_arena_wraparound_evicts_overwritten_data() -> None:
+    history = EventHistory(capacity=100, data_capacity=16)
+    for data in ("aaaaaa", "bbbbbb", "cccccc", "dddddd"):
+        history.record(Event("e", data))
+    # 16 bytes hold two 6-byte payloads; older ones were overwritten
+    assert [e.event.data for e in history] == ["cccccc", "dddddd"]
+
+
+def test_oversized_payload_is_truncated() -> None:
+    history = EventHistory(capacity=4, data_capacity=4)
+    history.record(Event("e", "123456"))
+    assert [e.event.data for e in history] == ["1234"]
+    assert history.truncated == 1
+
+
+def test_window_uses_timestamps() -> None:
+    history = EventHistory(capacity=8)
+    for i, ev in enumerate(_events(5)):
+        history.record(ev, timestamp=float(i))
+    assert [e.seq for e in history.window(1.5, now=4.0)] == [4, 5]
+    assert [e.timestamp for e in history.window(10, now=4.0)] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_tap_records_while_yielding() -> None:
+    history = EventHistory(capacity=8)
+    assert list(history.tap(iter(_events(2)))) == _events(2)
+    assert history.next_seq == 3  # noqa: PLR2004
+
+
+def test_event_names_are_interned() -> None:
+    history = EventHistory(capacity=8)
+    for ev in _events(6):
+        history.record(ev)
+    first, second, third, *_ = history
+    assert first.event.name is third.event.name
+    assert first.event.name != second.event.name
+
+
+def test_invalid_capacity() -> None:
+    with pytest.raises(ValueError, match="capacity"):
+        EventHistory(capacity=0)
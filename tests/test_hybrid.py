@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.hybrid import HybridState
+from hyprland_ipc.ipc import Event, HyprlandIPC
+from tests.conftest import ReplyServer
+
+
+REPLIES = {
+    "activewindow": {"address": "0xa", "class": "kitty", "title": "vim"},
+    "activeworkspace": {"id": 1, "name": "1"},
+    "monitors": [{"name": "DP-1", "focused": False}, {"name": "DP-2", "focused": True}],
+}
+
+
+class FakeHyprland:
+    """Answers single and batched JSON queries from a dict of replies."""
+
+    def __init__(self) -> None:
+        """Start from the module-level replies."""
+        self.replies: dict[str, object] = dict(REPLIES)
+        self.on_request: Callable[[], None] | None = None
+
+    def __call__(self, request: bytes) -> bytes:
+        """Join one JSON document per query."""
+        if self.on_request is not None:
+            self.on_request()
+        commands = request.decode().removeprefix("[[BATCH]]").split(";")
+        return "\n".join(json.dumps(self.replies[c.removeprefix("j/")]) for c in commands).encode()
+
+
+@pytest.fixture()
+def hypr(reply_server: ReplyServer) -> FakeHyprland:
+    fake = FakeHyprland()
+    reply_server.reply = fake
+    return fake
+
+
+@pytest.fixture()
+def state(reply_server: ReplyServer, hypr: FakeHyprland) -> HybridState:
+    state = HybridState(HyprlandIPC(reply_server.path, Path("evt")))
+    state.connected()
+    return state
+
+
+# ---------------------------------------------------------------------------#
+#                              Hits and misses                               #
+# ---------------------------------------------------------------------------#
+
+
+def test_queries_once_then_serves_from_mirror(
+    state: HybridState, reply_server: ReplyServer
+) -> None:
+    assert state.get("active_window") == "0xa"
+    assert state.get("active_window") == "0xa"
+    assert reply_server.requests == [b"j/activewindow"]
+    assert (state.hits["active_window"], state.misses["active_window"]) == (1, 1)
+    assert state.is_fresh("active_window")
+    assert not state.is_fresh("active_title")
+
+
+def test_events_update_without_queries(state: HybridState, reply_server: ReplyServer) -> None:
+    state.handle_event(Event("activewindow", "firefox,Docs, a title"))
+    state.handle_event(Event("workspacev2", "3,web"))
+    state.handle_event(Event("focusedmonv2", "DP-1,4"))
+    assert state.get_many(["active_class", "active_title", "active_workspace"]) == {
+        "active_class": "firefox",
+        "active_title": "Docs, a title",
+        "active_workspace": 4,
+    }
+    assert state.get("focused_monitor") == "DP-1"
+    assert reply_server.requests == []
+    state.handle_event(Event("activewindow", ","))
+    assert state.get("active_class") is None
+
+
+def test_stale_fields_share_one_request(state: HybridState, reply_server: ReplyServer) -> None:
+    values = state.get_many(["active_window", "active_title", "active_workspace_name"])
+    assert values == {"active_window": "0xa", "active_title": "vim", "active_workspace_name": "1"}
+    assert reply_server.requests == [b"[[BATCH]]j/activewindow;j/activeworkspace"]
+
+
+def test_focused_monitor_change_keeps_workspace_name(
+    state: HybridState, reply_server: ReplyServer
+) -> None:
+    # Hyprland sends both on a monitor focus change; the name comes with the first.
+    state.handle_event(Event("focusedmon", "DP-1,web"))
+    state.handle_event(Event("focusedmonv2", "DP-1,3"))
+    assert state.is_fresh("active_workspace_name")
+    assert state.get_many(["active_workspace", "active_workspace_name"]) == {
+        "active_workspace": 3,
+        "active_workspace_name": "web",
+    }
+    assert reply_server.requests == []
+
+
+def test_invalidating_event_forces_query(state: HybridState, hypr: FakeHyprland) -> None:
+    state.handle_event(Event("workspacev2", "2,2"))
+    assert state.get("active_workspace_name") == "2"
+    state.handle_event(Event("renameworkspace", "2,mail"))
+    assert not state.is_fresh("active_workspace_name")
+    assert state.is_fresh("active_workspace")
+    hypr.replies["activeworkspace"] = {"id": 2, "name": "mail"}
+    assert state.get("active_workspace_name") == "mail"
+
+
+def test_unparsable_event_marks_field_stale(state: HybridState) -> None:
+    state.handle_event(Event("workspacev2", "2,2"))
+    state.handle_event(Event("workspacev2", "oops,2"))
+    assert not state.is_fresh("active_workspace")
+    assert state.get("active_workspace") == 1
+
+
+def test_unknown_event_marks_everything_stale(reply_server: ReplyServer) -> None:
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    for unknown_events_stale in (True, False):
+        state = HybridState(ipc, unknown_events_stale=unknown_events_stale)
+        state.connected()
+        state.handle_event(Event("workspacev2", "2,2"))
+        state.handle_event(Event("openwindow", "a,2,kitty,x"))  # known, unrelated
+        state.handle_event(Event("custom", "from hyprctl dispatch event"))
+        assert state.is_fresh("active_workspace")
+        state.handle_event(Event("someplugin", "x"))
+        assert state.is_fresh("active_workspace") is not unknown_events_stale
+
+
+def test_not_live_always_queries(state: HybridState, reply_server: ReplyServer) -> None:
+    state.disconnected()
+    state.handle_event(Event("workspacev2", "2,2"))
+    assert state.freshness() == dict.fromkeys(state.fields, False)
+    assert state.get("active_workspace") == 1
+    assert state.get("active_workspace") == 1
+    assert len(reply_server.requests) == 2  # noqa: PLR2004
+    assert state.misses.total() == 2  # noqa: PLR2004
+
+
+def test_event_during_query_wins(state: HybridState, hypr: FakeHyprland) -> None:
+    hypr.on_request = lambda: state.handle_event(Event("workspacev2", "5,5"))
+    assert state.get("active_workspace") == 1  # the reply, older than the event
+    hypr.on_request = None
+    assert state.get("active_workspace") == 5  # noqa: PLR2004
+
+
+def test_unknown_field(state: HybridState) -> None:
+    with pytest.raises(ValueError, match="Unknown fields"):
+        state.get("nope")
+
+
+# ---------------------------------------------------------------------------#
+#                                  follow()                                  #
+# ---------------------------------------------------------------------------#
+
+
+def test_follow_tracks_liveness_and_gaps(tmp_path: Path) -> None:
+    path = tmp_path / "evt.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(1)
+        server.settimeout(1)
+        state = HybridState(HyprlandIPC(tmp_path / "cmd.sock", path))
+        events = state.follow()
+
+        # The generator connects on its first step, then blocks for an event.
+        first: list[Event] = []
+        thread = threading.Thread(target=lambda: first.append(next(events)))
+        thread.start()
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(b"workspacev2>>2,2\n")
+            thread.join(timeout=1)
+            assert first == [Event("workspacev2", "2,2")]
+            assert state.live
+            assert state.is_fresh("active_workspace")
+
+            conn.sendall(b"bad>>\xff\nfocusedmon>>DP-1,3\n")
+            assert next(events) == Event("focusedmon", "DP-1,3")
+            assert not state.is_fresh("active_workspace")  # gap
+            assert state.is_fresh("focused_monitor")
+        assert list(events) == []
+        assert not state.live
@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import shutil
+import socket
+import tempfile
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.instances import (
+    LOCK_FILENAME,
+    InstanceEvent,
+    MultiInstanceIPC,
+    discover_instances,
+)
+from hyprland_ipc.ipc import Event, EventStream, HyprlandIPC, HyprlandIPCError
+from tests.conftest import ReplyServer
+
+
+@pytest.fixture()
+def runtime_dir() -> Generator[Path, None, None]:
+    """Short runtime directory so socket paths stay under the UNIX limit."""
+    path = Path(tempfile.mkdtemp(prefix="hyp"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _bind(path: Path) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+
+
+def _event_server(path: Path, lines: list[bytes]) -> threading.Thread:
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def serve() -> None:
+        with server:
+            conn, _ = server.accept()
+            with conn:
+                for line in lines:
+                    conn.sendall(line)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+# ---------------------------------------------------------------------------
+# Discovery
+# ---------------------------------------------------------------------------
+
+
+def test_discover_instances(runtime_dir: Path) -> None:
+    complete = runtime_dir / "hypr" / "aaa_1"
+    partial = runtime_dir / "hypr" / "bbb_2"
+    complete.mkdir(parents=True)
+    partial.mkdir()
+    _bind(complete / ".socket.sock")
+    _bind(complete / ".socket2.sock")
+    _bind(partial / ".socket.sock")
+    (complete / LOCK_FILENAME).write_text("4242\nwayland-1\n")
+
+    instances = discover_instances(runtime_dir)
+
+    assert [i.signature for i in instances] == ["aaa_1"]
+    instance = instances[0]
+    assert instance.pid == 4242  # noqa: PLR2004
+    assert instance.wayland_display == "wayland-1"
+    assert instance.socket_path == complete / ".socket.sock"
+    assert instance.client().event_socket_path == complete / ".socket2.sock"
+
+
+def test_discover_without_hypr_dir(runtime_dir: Path) -> None:
+    assert discover_instances(runtime_dir) == []
+    with pytest.raises(HyprlandIPCError, match="No Hyprland instances"):
+        MultiInstanceIPC.from_runtime_dir(runtime_dir)
+
+
+def test_discover_requires_runtime_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    with pytest.raises(HyprlandIPCError, match="XDG_RUNTIME_DIR"):
+        discover_instances()
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+
+def test_events_from_all_instances(runtime_dir: Path) -> None:
+    a, b = runtime_dir / "a.sock", runtime_dir / "b.sock"
+    servers = [
+        _event_server(a, [b"workspace>>1\nactivewin", b"dowv2>>abc\n"]),
+        _event_server(b, [b"submap>>resize\n"]),
+    ]
+    multi = MultiInstanceIPC({"A": HyprlandIPC(a, a), "B": HyprlandIPC(b, b)})
+
+    events = list(multi.events())
+    for server in servers:
+        server.join(timeout=2)
+
+    assert sorted(events, key=lambda e: (e.signature, e.event.name)) == [
+        InstanceEvent("A", Event("activewindowv2", "abc")),
+        InstanceEvent("A", Event("workspace", "1")),
+        InstanceEvent("B", Event("submap", "resize")),
+    ]
+    # Per-instance order is preserved.
+    assert [e.event.name for e in events if e.signature == "A"] == ["workspace", "activewindowv2"]
+
+
+def test_events_connection_error(runtime_dir: Path) -> None:
+    missing = runtime_dir / "missing.sock"
+    multi = MultiInstanceIPC({"A": HyprlandIPC(missing, missing)})
+    with pytest.raises(HyprlandIPCError, match="Failed to read events: A: "):
+        next(multi.events())
+    assert list(multi.event_errors) == ["A"]
+
+
+def test_events_skip_unreachable_instance(runtime_dir: Path) -> None:
+    good, missing = runtime_dir / "good.sock", runtime_dir / "missing.sock"
+    server = _event_server(good, [b"submap>>resize\n"])
+    multi = MultiInstanceIPC({"A": HyprlandIPC(missing, missing), "B": HyprlandIPC(good, good)})
+
+    assert list(multi.events()) == [InstanceEvent("B", Event("submap", "resize"))]
+    server.join(timeout=2)
+    assert list(multi.event_errors) == ["A"]
+    assert isinstance(multi.event_errors["A"], HyprlandIPCError)
+
+
+def test_events_drop_instance_on_read_error(
+    monkeypatch: pytest.MonkeyPatch, runtime_dir: Path
+) -> None:
+    a, b = runtime_dir / "a.sock", runtime_dir / "b.sock"
+    servers = [_event_server(a, [b"workspace>>1\n"]), _event_server(b, [b"submap>>resize\n"])]
+    read = EventStream.read
+
+    def flaky_read(stream: EventStream) -> list[Event]:
+        events = read(stream)
+        if any(e.name == "workspace" for e in events):
+            raise OSError("connection reset")
+        return events
+
+    monkeypatch.setattr(EventStream, "read", flaky_read)
+    multi = MultiInstanceIPC({"A": HyprlandIPC(a, a), "B": HyprlandIPC(b, b)})
+
+    assert list(multi.events()) == [InstanceEvent("B", Event("submap", "resize"))]
+    for server in servers:
+        server.join(timeout=2)
+    assert "connection reset" in str(multi.event_errors["A"])
+
+
+# ---------------------------------------------------------------------------
+# Parallel queries
+# ---------------------------------------------------------------------------
+
+
+def test_queries_run_on_every_instance(reply_server: ReplyServer) -> None:
+    second = ReplyServer(reply_server.path.with_name(f"{reply_server.path.stem}_2.sock"))
+    try:
+        reply_server.reply = lambda _r: b'[{"address": "0x1"}]'
+        second.reply = lambda _r: b"[]"
+        with MultiInstanceIPC.from_instances([]) as empty:
+            assert len(empty) == 0
+        multi = MultiInstanceIPC(
+            {
+                "one": HyprlandIPC(reply_server.path, Path("evt")),
+                "two": HyprlandIPC(second.path, Path("evt")),
+            }
+        )
+        with multi:
+            assert multi.send_json("clients") == {"one": [{"address": "0x1"}], "two": []}
+            assert multi.map(HyprlandIPC.get_clients)["two"] == []
+            assert multi["one"].socket_path == reply_server.path
+    finally:
+        second.close()
+
+
+def test_query_errors_name_instances(reply_server: ReplyServer, runtime_dir: Path) -> None:
+    multi = MultiInstanceIPC(
+        {
+            "ok": HyprlandIPC(reply_server.path, Path("evt")),
+            "gone": HyprlandIPC(runtime_dir / "gone.sock", Path("evt")),
+        }
+    )
+    with multi, pytest.raises(HyprlandIPCError, match=r"1 instance\(s\): gone:"):
+        multi.map(lambda ipc: ipc.send("version"))
@@ -2,15 +2,18 @@
 #
 # SPDX-License-Identifier: MIT
 
+import selectors
 import socket
 import tempfile
+import threading
 import uuid
 from pathlib import Path
 from typing import Any
 
 import pytest
 
-from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError, normalize
+from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError, RawEvent, normalize
+from tests.conftest import ReplyServer
 
 
 # ---------------------------------------------------------------------------#
@@ -192,7 +195,7 @@ def test_batch_success(monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC) -> Non
     sent: list[str] = []
     monkeypatch.setattr(HyprlandIPC, "send", lambda _self, c: sent.append(c))
     ipc.batch(["x", "y"])
-    assert sent == ["dispatch x; y"]
+    assert sent == ["[[BATCH]]dispatch x;dispatch y"]
 
 
 def test_batch_fallback(monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC) -> None:
@@ -205,6 +208,36 @@ def test_batch_fallback(monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC) -> No
     assert called == ["m", "n"]
 
 
+def test_batch_against_batch_server(reply_server: ReplyServer) -> None:
+    def hyprland(request: bytes) -> bytes:
+        if request.startswith(b"[[BATCH]]"):
+            commands = request.removeprefix(b"[[BATCH]]").split(b";")
+            assert all(c.startswith(b"dispatch ") for c in commands)
+            return b"ok" * len(commands)
+        return b"ok"
+
+    reply_server.reply = hyprland
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    ipc.batch(["workspace 2", "movefocus l"])
+    assert reply_server.requests == [b"[[BATCH]]dispatch workspace 2;dispatch movefocus l"]
+
+
+def test_batch_falls_back_without_batch_support(reply_server: ReplyServer) -> None:
+    reply_server.reply = lambda r: b"unknown request" if r.startswith(b"[[BATCH]]") else b"ok"
+    ipc = HyprlandIPC(reply_server.path, Path("evt"))
+    ipc.batch(["workspace 2", "killactive"])
+    assert reply_server.requests == [
+        b"[[BATCH]]dispatch workspace 2;dispatch killactive",
+        b"dispatch workspace 2",
+        b"dispatch killactive",
+    ]
+
+
+def test_batch_rejects_separators(ipc: HyprlandIPC) -> None:
+    with pytest.raises(ValueError, match="must not contain"):
+        ipc.batch(["a; b"])
+
+
 # ---------------------------------------------------------------------------#
 #                            Convenience wrappers                            #
 # ---------------------------------------------------------------------------#
@@ -220,6 +253,65 @@ def test_wrapper_methods(monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC) -> N
     assert [c["id"] for c in ipc.get_clients()] == [1, 2]
     assert ipc.get_active_window() == {"k": "v"}
     assert ipc.get_active_workspace() == {"k": "v"}
+    assert ipc.get_workspaces() == [{"k": "v"}]
+    assert ipc.get_monitors() == [{"k": "v"}]
+
+
+# ---------------------------------------------------------------------------#
+#                                  watch()                                   #
+# ---------------------------------------------------------------------------#
+
+
+def _replay(monkeypatch: pytest.MonkeyPatch, replies: list[bytes]) -> list[bytes]:
+    """Serve *replies* from ``_request`` in order and record the payloads."""
+    sent: list[bytes] = []
+    pending = iter(replies)
+
+    def fake_request(_self: HyprlandIPC, payload: bytes) -> bytes:
+        sent.append(payload)
+        return next(pending)
+
+    monkeypatch.setattr(HyprlandIPC, "_request", fake_request)
+    monkeypatch.setattr("time.sleep", lambda _s: None)
+    return sent
+
+
+def test_watch_yields_only_changes(monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC) -> None:
+    sent = _replay(monkeypatch, [b'{"int": 5}', b'{"int": 5}', b'{"int": 5}', b'{"int": 8}'])
+    parsed: list[str] = []
+    original = HyprlandIPC._parse_json
+
+    def counting_parse(self: HyprlandIPC, resp: str) -> Any:
+        parsed.append(resp)
+        return original(self, resp)
+
+    monkeypatch.setattr(HyprlandIPC, "_parse_json", counting_parse)
+
+    watcher = ipc.watch("getoption general:gaps_in", interval=0.5)
+    assert next(watcher) == {"int": 5}
+    assert next(watcher) == {"int": 8}
+    assert len(sent) == 4  # noqa: PLR2004
+    assert set(sent) == {b"j/getoption general:gaps_in"}
+    assert parsed == ['{"int": 5}', '{"int": 8}']
+
+
+def test_watch_raw(monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC) -> None:
+    sent = _replay(monkeypatch, [b"v1\n", b"v1\n", b"v2\n"])
+    watcher = ipc.watch("version", interval=0, raw=True)
+    assert [next(watcher), next(watcher)] == ["v1", "v2"]
+    assert sent[0] == b"version"
+
+
+@pytest.mark.parametrize(
+    ("reply", "message"),
+    [(b"unknown request", "Hyprland returned an error"), (b"notjson", "Invalid JSON")],
+)
+def test_watch_errors(
+    monkeypatch: pytest.MonkeyPatch, ipc: HyprlandIPC, reply: bytes, message: str
+) -> None:
+    _replay(monkeypatch, [reply])
+    with pytest.raises(HyprlandIPCError, match=message):
+        next(ipc.watch("devices"))
 
 
 # ---------------------------------------------------------------------------#
@@ -234,6 +326,61 @@ def test_events_iteration(cmd_server, evt_server) -> None:
     assert events == [Event("evt1", "data1"), Event("evt2", "data2")]
 
 
+def test_events_raw(cmd_server, evt_server) -> None:
+    ipc_obj = HyprlandIPC(cmd_server, evt_server)
+    events = list(ipc_obj.events(raw=True))
+    assert events == [RawEvent("evt1", b"data1"), RawEvent("evt2", b"data2")]
+    assert ipc_obj.event_decode_errors == 0
+
+
+def test_events_counts_decode_errors(tmp_path: Path) -> None:
+    path = tmp_path / "evt.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(1)
+        ipc_obj = HyprlandIPC(tmp_path / "cmd.sock", path)
+        events = ipc_obj.events()
+
+        def serve() -> None:
+            conn, _ = server.accept()
+            with conn:
+                conn.sendall(b"a>>\xff\nb>>ok\n")
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        assert list(events) == [Event("b", "ok")]
+        thread.join()
+    assert ipc_obj.event_decode_errors == 1
+
+
+def test_connect_events_read_is_non_blocking(tmp_path: Path) -> None:
+    path = tmp_path / "evt.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(1)
+        with HyprlandIPC(tmp_path / "cmd.sock", path).connect_events() as stream:
+            conn, _ = server.accept()
+            with conn:
+                assert stream.read() == []  # nothing sent yet: returns at once
+                conn.sendall(b"workspace>>1\nworkspace>>")
+
+                sel = selectors.DefaultSelector()
+                sel.register(stream, selectors.EVENT_READ)
+                assert sel.select(timeout=1)
+                assert stream.read() == [Event("workspace", "1")]
+
+                conn.sendall(b"2\n")
+            sel.select(timeout=1)
+            assert stream.read() == [Event("workspace", "2")]
+            assert stream.closed
+            sel.close()
+
+
+def test_connect_events_failure(ipc: HyprlandIPC) -> None:
+    with pytest.raises(HyprlandIPCError, match="Failed to connect to event socket"):
+        ipc.connect_events()
+
+
 # ---------------------------------------------------------------------------#
 #                                 normalize()                                #
 # ---------------------------------------------------------------------------#
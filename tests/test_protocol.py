@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import pytest
+
+from hyprland_ipc import ipc
+from hyprland_ipc.protocol import (
+    CommandExchange,
+    Event,
+    EventParser,
+    HyprlandIPCError,
+    RawEvent,
+    decode_reply,
+    encode_command,
+    parse_event_line,
+)
+
+
+# ---------------------------------------------------------------------------#
+#                                  Commands                                  #
+# ---------------------------------------------------------------------------#
+
+
+def test_ipc_reexports_protocol_types() -> None:
+    assert ipc.Event is Event
+    assert ipc.HyprlandIPCError is HyprlandIPCError
+
+
+def test_encode_and_decode() -> None:
+    assert encode_command("j/clients") == b"j/clients"
+    assert decode_reply(b"  ok\n") == "ok"
+    with pytest.raises(HyprlandIPCError, match="Hyprland returned an error"):
+        decode_reply(b"unknown request")
+
+
+def test_command_exchange_completes_at_eof() -> None:
+    exchange = CommandExchange("j/version")
+    assert exchange.request == b"j/version"
+    assert exchange.receive_data(b'{"tag": ') is None
+    assert exchange.receive_data(b'"v0.50"}') is None
+    assert not exchange.done
+    assert exchange.receive_data(b"") == '{"tag": "v0.50"}'
+    assert exchange.done
+    assert exchange.reply == '{"tag": "v0.50"}'
+
+
+def test_command_exchange_rejects_data_after_eof() -> None:
+    exchange = CommandExchange("version")
+    exchange.receive_data(b"")
+    with pytest.raises(HyprlandIPCError, match="already complete"):
+        exchange.receive_data(b"late")
+
+
+def test_command_exchange_surfaces_errors() -> None:
+    exchange = CommandExchange("bogus")
+    exchange.receive_data(b"unknown request")
+    with pytest.raises(HyprlandIPCError):
+        exchange.receive_data(b"")
+
+
+# ---------------------------------------------------------------------------#
+#                                   Events                                   #
+# ---------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        (b"workspace>>2", Event("workspace", "2")),
+        (b"activewindow>>kitty,a>>b", Event("activewindow", "kitty,a>>b")),
+        (b"configreloaded>>", Event("configreloaded", "")),
+        (b"nodelimiter", Event("nodelimiter", "")),
+        (b"", None),
+        (b"bad>>\xff", None),
+    ],
+)
+def test_parse_event_line(line: bytes, expected: Event | None) -> None:
+    assert parse_event_line(line) == expected
+
+
+def test_parser_splits_lines_across_chunks() -> None:
+    parser = EventParser()
+    assert parser.feed(b"workspace>>1\nopenwin") == [Event("workspace", "1")]
+    assert parser.pending == len(b"openwin")
+    assert parser.feed(b"dow>>abc,1,kitty,") == []
+    assert parser.feed(b"term\n\nclosewindow>>abc\n") == [
+        Event("openwindow", "abc,1,kitty,term"),
+        Event("closewindow", "abc"),
+    ]
+    assert parser.pending == 0
+
+
+def test_parser_skips_undecodable_lines() -> None:
+    parser = EventParser()
+    assert parser.feed(b"a>>\xfe\nb>>ok\n") == [Event("b", "ok")]
+    assert parser.decode_errors == 1
+    assert parser.feed(b"\n\n") == []
+    assert parser.decode_errors == 1  # empty lines are not errors
+
+
+def test_parser_byte_at_a_time() -> None:
+    parser = EventParser()
+    stream = b"workspace>>1\nworkspace>>2\n"
+    events = [event for i in range(len(stream)) for event in parser.feed(stream[i : i + 1])]
+    assert events == [Event("workspace", "1"), Event("workspace", "2")]
+
+
+# ---------------------------------------------------------------------------#
+#                                 Raw events                                 #
+# ---------------------------------------------------------------------------#
+
+
+def test_feed_raw_keeps_data_undecoded() -> None:
+    parser = EventParser()
+    events = parser.feed_raw(b"activewindow>>kitty,a>>b\nconfigreloaded>>\nnodelimiter\n")
+    assert events == [
+        RawEvent("activewindow", b"kitty,a>>b"),
+        RawEvent("configreloaded", b""),
+        RawEvent("nodelimiter", b""),
+    ]
+    assert events[0].data == "kitty,a>>b"
+    assert events[0].decode() == Event("activewindow", "kitty,a>>b")
+
+
+def test_feed_raw_interns_names() -> None:
+    parser = EventParser()
+    first = parser.feed_raw(b"workspace>>1\nplugin>>x\n")
+    second = parser.feed_raw(b"workspace>>2\nplugin>>y\n")
+    assert first[0].name is second[0].name
+    assert first[1].name is second[1].name
+
+
+def test_feed_raw_splits_lines_across_chunks() -> None:
+    parser = EventParser()
+    assert parser.feed_raw(b"workspace>>1\nopenwin") == [RawEvent("workspace", b"1")]
+    assert parser.feed_raw(b"dow>>abc\n") == [RawEvent("openwindow", b"abc")]
+    assert parser.pending == 0
+
+
+def test_feed_raw_decodes_data_on_demand() -> None:
+    parser = EventParser()
+    event, ok = parser.feed_raw(b"windowtitle>>\xff\nbad\xfe>>x\nworkspace>>2\n")
+    assert parser.decode_errors == 1  # only the undecodable name is dropped
+    assert event.payload == b"\xff"
+    with pytest.raises(UnicodeDecodeError):
+        _ = event.data
+    assert event.decode(errors="replace") == Event("windowtitle", "\ufffd")
+    assert ok == RawEvent("workspace", b"2")
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc import reader as reader_module
+from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.reader import EventReader, ReaderStats
+
+
+def _events(n: int) -> list[Event]:
+    return [Event("e", str(i)) for i in range(n)]
+
+
+def test_reader_yields_all_events_in_order() -> None:
+    reader = EventReader(iter(_events(5)))
+    assert list(reader) == _events(5)
+    stats = reader.stats()
+    assert (stats.depth, stats.received, stats.dropped) == (0, 5, 0)
+    assert isinstance(stats, ReaderStats)
+
+
+def test_reader_keeps_draining_while_consumer_is_slow() -> None:
+    finished = threading.Event()
+
+    def source() -> Iterator[Event]:
+        yield from _events(10)
+        finished.set()
+
+    with EventReader(source(), maxsize=3) as reader:
+        # Nobody consumes yet, but the source must still be drained completely.
+        assert finished.wait(timeout=5)
+        stats = reader.stats()
+        assert stats.received == 10  # noqa: PLR2004
+        assert stats.depth == stats.high_water == 3  # noqa: PLR2004
+        assert stats.dropped == 7  # noqa: PLR2004
+        assert [e.data for e in reader] == ["7", "8", "9"]
+
+
+def test_reader_get_timeout() -> None:
+    release = threading.Event()
+
+    def source() -> Iterator[Event]:
+        release.wait(timeout=5)
+        yield from ()
+
+    with EventReader(source()) as reader:
+        assert reader.get(timeout=0.01) is None
+        release.set()
+        assert reader.get(timeout=5) is None  # end of stream
+
+
+def test_reader_propagates_source_error_after_draining() -> None:
+    def source() -> Iterator[Event]:
+        yield Event("ok", "")
+        raise HyprlandIPCError("socket gone")
+
+    reader = EventReader(source())
+    events = iter(reader)
+    assert next(events) == Event("ok", "")
+    with pytest.raises(HyprlandIPCError, match="socket gone"):
+        next(events)
+
+
+def test_reader_invalid_maxsize() -> None:
+    with pytest.raises(ValueError, match="maxsize"):
+        EventReader(iter(()), maxsize=0)
+
+
+def test_listen_events_with_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    produced = _events(3)
+    threads: set[str] = set()
+
+    def fake_events(_self: HyprlandIPC) -> Iterator[Event]:
+        threads.add(threading.current_thread().name)
+        yield from produced
+
+    monkeypatch.setattr(HyprlandIPC, "events", fake_events)
+
+    captured: list[Event] = []
+    HyprlandIPC(Path("cmd"), Path("evt")).listen_events(captured.append, queue_size=8)
+    assert captured == produced
+    assert threads == {"hyprland-event-reader"}
+
+
+def test_listen_events_closes_queue_when_handler_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    def endless(_self: HyprlandIPC) -> Iterator[Event]:
+        while True:
+            yield Event("e", "")
+
+    def handler(_event: Event) -> None:
+        raise RuntimeError("handler failed")
+
+    monkeypatch.setattr(HyprlandIPC, "events", endless)
+    with pytest.raises(RuntimeError, match="handler failed"):
+        HyprlandIPC(Path("cmd"), Path("evt")).listen_events(handler, queue_size=8)
+    assert not any(t.name == "hyprland-event-reader" for t in threading.enumerate())
+
+
+# ---------------------------------------------------------------------------
+# close()
+# ---------------------------------------------------------------------------
+
+
+def test_close_stops_idle_stream_reader(tmp_path: Path) -> None:
+    path = tmp_path / "evt.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(1)
+        stream = HyprlandIPC(tmp_path / "cmd.sock", path).connect_events()
+        conn, _ = server.accept()
+        with conn:
+            with EventReader(stream) as reader:
+                conn.sendall(b"workspace>>2\n")
+                assert reader.get(timeout=5) == Event("workspace", "2")
+                thread = reader._thread
+                assert thread is not None
+                # No further events: the thread is waiting on the socket.
+            assert not thread.is_alive()
+            assert stream.closed
+            assert reader.get(timeout=0) is None
+
+
+def test_close_stops_iterable_at_next_event() -> None:
+    def endless() -> Iterator[Event]:
+        while True:
+            yield Event("e", "")
+
+    with EventReader(endless(), maxsize=1) as reader:
+        assert reader.get(timeout=5) is not None
+        thread = reader._thread
+    assert thread is not None
+    assert not thread.is_alive()
+
+
+def test_exit_does_not_wait_forever_on_idle_iterable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(reader_module, "EXIT_TIMEOUT", 0.01)
+    release = threading.Event()
+
+    def idle() -> Iterator[Event]:
+        release.wait(timeout=5)
+        yield Event("late", "")
+
+    with EventReader(idle()) as reader:
+        thread = reader._thread
+    assert thread is not None
+    assert thread.is_alive()  # still waiting for the next event
+    release.set()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.rules import Rule, RuleEngine
+from tests.conftest import ReplyServer
+
+
+class _RecordingIPC(HyprlandIPC):
+    def __init__(self) -> None:
+        super().__init__(Path("cmd"), Path("evt"))
+        self.requests: list[list[str]] = []
+
+    def dispatch(self, command: str) -> None:
+        self.requests.append([command])
+
+    def batch(self, commands: Sequence[str]) -> None:
+        self.requests.append(list(commands))
+
+
+OPEN_KITTY = Event("openwindow", "abc,1,kitty,shell")
+OPEN_MIXER = Event("openwindow", "def,2,pavucontrol,Volume Control")
+
+
+@pytest.fixture()
+def ipc() -> _RecordingIPC:
+    return _RecordingIPC()
+
+
+def test_regex_and_exact_matchers(ipc: _RecordingIPC) -> None:
+    engine = RuleEngine(
+        ipc,
+        [
+            Rule(
+                "openwindow",
+                where={"class": re.compile(r"^pavucontrol$")},
+                actions=("setfloating address:{address}", "centerwindow"),
+            ),
+            Rule(
+                "openwindow",
+                where={"workspace_name": "1"},
+                actions=("focuswindow address:{address}",),
+            ),
+        ],
+    )
+
+    assert engine.handle_event(OPEN_MIXER) == ["setfloating address:0xdef", "centerwindow"]
+    assert engine.handle_event(OPEN_KITTY) == ["focuswindow address:0xabc"]
+    # one request per event: a batch for the first, a plain dispatch for the second
+    assert ipc.requests == [
+        ["setfloating address:0xdef", "centerwindow"],
+        ["focuswindow address:0xabc"],
+    ]
+
+
+def test_predicate_and_stop(ipc: _RecordingIPC) -> None:
+    engine = RuleEngine(
+        ipc,
+        [
+            Rule("openwindow", where={"title": lambda t: "Volume" in t}, actions=("a",), stop=True),
+            Rule("openwindow", actions=("b",)),
+        ],
+    )
+    assert engine.match(OPEN_MIXER) == ["a"]
+    assert engine.match(OPEN_KITTY) == ["b"]
+
+
+def test_unrelated_events_do_nothing(ipc: _RecordingIPC) -> None:
+    engine = RuleEngine(ipc, [Rule("openwindow", actions=("x",))])
+    assert engine.handle_event(Event("workspace", "2")) == []
+    assert ipc.requests == []
+
+
+def test_wildcard_rules_keep_definition_order(ipc: _RecordingIPC) -> None:
+    engine = RuleEngine(ipc)
+    engine.add(Rule("*", actions=("first {name}",)))
+    engine.add(Rule("closewindow", actions=("second {address}",)))
+    assert engine.match(Event("closewindow", "abc")) == ["first closewindow", "second 0xabc"]
+    assert engine.match(Event("workspace", "2")) == ["first workspace"]
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        Rule("nosuchevent", actions=("x",)),
+        Rule("closewindow", where={"class": "kitty"}, actions=("x",)),
+        Rule("closewindow", actions=("focuswindow {title}",)),
+    ],
+)
+def test_invalid_rules_are_rejected(ipc: _RecordingIPC, rule: Rule) -> None:
+    with pytest.raises(HyprlandIPCError):
+        RuleEngine(ipc, [rule])
+
+
+def test_run_uses_listen_events(monkeypatch: pytest.MonkeyPatch, ipc: _RecordingIPC) -> None:
+    monkeypatch.setattr(HyprlandIPC, "events", lambda _self: iter([OPEN_KITTY]))
+    RuleEngine(ipc, [Rule("openwindow", actions=("x {class}",))]).run()
+    assert ipc.requests == [["x kitty"]]
+
+
+def test_batch_wire_format(reply_server: ReplyServer) -> None:
+    engine = RuleEngine(
+        HyprlandIPC(reply_server.path, Path("evt")),
+        [Rule("openwindow", actions=("setfloating address:{address}", "centerwindow"))],
+    )
+    engine.handle_event(OPEN_MIXER)
+    assert reply_server.requests == [
+        b"[[BATCH]]dispatch setfloating address:0xdef;dispatch centerwindow"
+    ]
+
+
+def test_title_with_semicolon_is_dispatched_alone(reply_server: ReplyServer) -> None:
+    engine = RuleEngine(
+        HyprlandIPC(reply_server.path, Path("evt")),
+        [
+            Rule(
+                "openwindow",
+                actions=(
+                    "setfloating address:{address}",
+                    "exec notify-send '{title}'",
+                    "centerwindow",
+                ),
+            )
+        ],
+    )
+    event = Event("openwindow", "def,2,kitty,make; make install")
+    assert engine.handle_event(event) == [
+        "setfloating address:0xdef",
+        "exec notify-send 'make; make install'",
+        "centerwindow",
+    ]
+    assert reply_server.requests == [
+        b"dispatch setfloating address:0xdef",
+        b"dispatch exec notify-send 'make; make install'",
+        b"dispatch centerwindow",
+    ]
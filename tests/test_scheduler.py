@@ -0,0 +1,234 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.ipc import HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.scheduler import DispatchScheduler, TokenBucket
+from tests.conftest import ReplyServer
+
+
+class _GatedIPC(HyprlandIPC):
+    """HyprlandIPC that records requests and can hold the first one back."""
+
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__(Path("cmd"), Path("evt"))
+        self.fail = fail
+        self.requests: list[list[str]] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def dispatch(self, command: str) -> None:
+        self.batch([command])
+
+    def batch(self, commands: Sequence[str]) -> None:
+        self.entered.set()
+        assert self.gate.wait(timeout=5)
+        self.requests.append(list(commands))
+        if self.fail:
+            raise HyprlandIPCError("boom")
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _hold(ipc: _GatedIPC, scheduler: DispatchScheduler) -> None:
+    """Park the worker inside a request so later commands stay queued."""
+    ipc.gate.clear()
+    scheduler.dispatch("hold", priority="interactive")
+    assert ipc.entered.wait(timeout=2)
+
+
+# ---------------------------------------------------------------------------
+# Token bucket
+# ---------------------------------------------------------------------------
+
+
+def test_token_bucket_refills_up_to_burst() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+    assert bucket.take(5) == 3  # noqa: PLR2004
+    assert bucket.take(1) == 0
+    assert bucket.delay() == pytest.approx(0.1)
+
+    clock.now = 0.25
+    assert bucket.take(5) == 2  # noqa: PLR2004
+    clock.now = 10
+    assert bucket.take(5) == 3  # noqa: PLR2004
+
+
+def test_token_bucket_rejects_bad_arguments() -> None:
+    with pytest.raises(ValueError, match="positive"):
+        TokenBucket(rate=0, burst=1)
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+
+def test_commands_are_sent_and_resolved() -> None:
+    ipc = _GatedIPC()
+    with DispatchScheduler(ipc) as scheduler:
+        futures = scheduler.dispatch_many(["a", "b"])
+        for future in futures:
+            assert future.result(timeout=2) is None
+    assert [cmd for request in ipc.requests for cmd in request] == ["a", "b"]
+
+
+def test_interactive_jumps_background_queue() -> None:
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc, max_batch=1)
+    _hold(ipc, scheduler)
+    scheduler.dispatch_many(["bg1", "bg2"])
+    scheduler.dispatch("fg", priority="interactive")
+    ipc.gate.set()
+    scheduler.close()
+    assert ipc.requests == [["hold"], ["fg"], ["bg1"], ["bg2"]]
+
+
+def test_background_rate_limit_leaves_interactive_alone() -> None:
+    clock = _FakeClock()
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc, rate=1, burst=2, clock=clock)
+    _hold(ipc, scheduler)
+    background = scheduler.dispatch_many(["bg1", "bg2", "bg3"])
+    ipc.gate.set()
+    background[1].result(timeout=2)
+    assert not background[2].done()
+
+    scheduler.dispatch("fg", priority="interactive").result(timeout=2)
+    assert not background[2].done()
+
+    clock.now = 1
+    background[2].result(timeout=5)
+    assert ipc.requests == [["hold"], ["bg1", "bg2"], ["fg"], ["bg3"]]
+    scheduler.close()
+
+
+def test_duplicates_share_future_and_promote() -> None:
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc)
+    _hold(ipc, scheduler)
+    first = scheduler.dispatch("movewindow l")
+    second = scheduler.dispatch("movewindow l", priority="interactive")
+    assert first is second
+    assert scheduler.pending("interactive") == 1
+    assert scheduler.pending("background") == 0
+    ipc.gate.set()
+    scheduler.close()
+    assert ipc.requests == [["hold"], ["movewindow l"]]
+
+
+def test_cancelled_commands_are_skipped() -> None:
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc)
+    _hold(ipc, scheduler)
+    dropped = scheduler.dispatch("a")
+    kept = scheduler.dispatch("b")
+    assert dropped.cancel()
+    again = scheduler.dispatch("a")
+    assert again is not dropped
+    ipc.gate.set()
+    kept.result(timeout=2)
+    again.result(timeout=2)
+    scheduler.close()
+    assert ipc.requests == [["hold"], ["b", "a"]]
+
+
+def test_cancelled_commands_use_no_tokens() -> None:
+    clock = _FakeClock()
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc, rate=1, burst=2, clock=clock)
+    _hold(ipc, scheduler)
+    first, dropped, last = scheduler.dispatch_many(["bg1", "bg2", "bg3"])
+    assert dropped.cancel()
+    ipc.gate.set()
+    first.result(timeout=2)
+    last.result(timeout=2)
+    scheduler.close()
+    assert ipc.requests == [["hold"], ["bg1", "bg3"]]
+
+
+def test_unbatchable_command_is_sent_alone() -> None:
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc)
+    _hold(ipc, scheduler)
+    futures = scheduler.dispatch_many(["a", "exec x; y", "b", "c"])
+    ipc.gate.set()
+    for future in futures:
+        assert future.result(timeout=2) is None
+    scheduler.close()
+    assert ipc.requests == [["hold"], ["a"], ["exec x; y"], ["b", "c"]]
+
+
+def test_clear_cancels_one_priority() -> None:
+    ipc = _GatedIPC()
+    scheduler = DispatchScheduler(ipc)
+    _hold(ipc, scheduler)
+    background = scheduler.dispatch_many(["bg1", "bg2"])
+    fg = scheduler.dispatch("fg", priority="interactive")
+    assert scheduler.clear("background") == 2  # noqa: PLR2004
+    ipc.gate.set()
+    fg.result(timeout=2)
+    scheduler.close()
+    assert all(f.cancelled() for f in background)
+    assert ipc.requests == [["hold"], ["fg"]]
+
+
+def test_failure_is_set_on_every_future() -> None:
+    ipc = _GatedIPC(fail=True)
+    scheduler = DispatchScheduler(ipc)
+    _hold(ipc, scheduler)
+    futures = scheduler.dispatch_many(["a", "b"])
+    ipc.gate.set()
+    for future in futures:
+        with pytest.raises(HyprlandIPCError, match="boom"):
+            future.result(timeout=2)
+    scheduler.close()
+
+
+def test_closed_scheduler_rejects_commands() -> None:
+    scheduler = DispatchScheduler(_GatedIPC())
+    scheduler.close()
+    with pytest.raises(HyprlandIPCError, match="closed"):
+        scheduler.dispatch("a")
+    with pytest.raises(ValueError, match="max_batch"):
+        DispatchScheduler(_GatedIPC(), max_batch=0)
+
+
+def test_batch_wire_format(reply_server: ReplyServer) -> None:
+    entered, gate = threading.Event(), threading.Event()
+
+    def hyprland(request: bytes) -> bytes:
+        # Hold the first request so the next two are sent as one batch.
+        if request == b"dispatch hold":
+            entered.set()
+            assert gate.wait(timeout=5)
+        return b"ok"
+
+    reply_server.reply = hyprland
+    scheduler = DispatchScheduler(HyprlandIPC(reply_server.path, Path("evt")))
+    scheduler.dispatch("hold", priority="interactive")
+    assert entered.wait(timeout=2)
+    futures = scheduler.dispatch_many(["workspace 2", "movefocus l"], priority="interactive")
+    gate.set()
+    assert all(f.result(timeout=2) is None for f in futures)
+    scheduler.close()
+    assert reply_server.requests == [
+        b"dispatch hold",
+        b"[[BATCH]]dispatch workspace 2;dispatch movefocus l",
+    ]
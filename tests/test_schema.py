@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import pytest
+
+from hyprland_ipc.ipc import Event
+from hyprland_ipc.schema import WINDOW_EVENTS, parse_event_data, window_address
+
+
+@pytest.mark.parametrize(
+    ("event", "expected"),
+    [
+        (
+            Event("openwindow", "80e62df0,2,kitty,vim: a, b, c"),
+            {
+                "address": "0x80e62df0",
+                "workspace_name": "2",
+                "class": "kitty",
+                "title": "vim: a, b, c",
+            },
+        ),
+        (Event("workspacev2", "3,3"), {"workspace_id": "3", "workspace_name": "3"}),
+        (
+            Event("movewindowv2", "abc"),
+            {"address": "0xabc", "workspace_id": "", "workspace_name": ""},
+        ),
+        (Event("configreloaded", ""), {}),
+        (Event("custom", "x,y"), {"data": "x,y"}),
+    ],
+)
+def test_parse_event_data(event: Event, expected: dict[str, str]) -> None:
+    assert parse_event_data(event) == expected
+
+
+def test_window_helpers() -> None:
+    assert window_address("abc") == "0xabc"
+    assert window_address("0xabc") == "0xabc"
+    assert "closewindow" in WINDOW_EVENTS
+    assert "togglegroup" not in WINDOW_EVENTS
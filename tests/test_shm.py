@@ -0,0 +1,219 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.ipc import Event, HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.shm import (
+    SNAPSHOT_FILENAME,
+    SharedStateReader,
+    SharedStateWriter,
+    StatePublisher,
+    default_snapshot_path,
+    load_snapshot,
+)
+from hyprland_ipc.singleflight import freeze
+
+
+CLIENTS = [{"address": "0x1", "class": "kitty", "at": [0, 0], "size": [100, 100]}]
+WORKSPACES = [{"id": 1, "name": "1", "windows": 1}]
+MONITORS = [{"id": 0, "name": "DP-1", "activeWorkspace": {"id": 1, "name": "1"}}]
+
+
+@pytest.fixture()
+def snapshot_path(tmp_path: Path) -> Path:
+    return tmp_path / "hypr" / "sig" / SNAPSHOT_FILENAME
+
+
+# ---------------------------------------------------------------------------#
+#                              Path discovery                                #
+# ---------------------------------------------------------------------------#
+
+
+def test_default_snapshot_path_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", "sig")
+    assert default_snapshot_path() == tmp_path / "hypr" / "sig" / SNAPSHOT_FILENAME
+
+
+def test_default_snapshot_path_missing_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.delenv("HYPRLAND_INSTANCE_SIGNATURE", raising=False)
+    with pytest.raises(HyprlandIPCError):
+        default_snapshot_path()
+
+
+# ---------------------------------------------------------------------------#
+#                            Writer / reader                                 #
+# ---------------------------------------------------------------------------#
+
+
+def test_round_trip(snapshot_path: Path) -> None:
+    with SharedStateWriter(snapshot_path) as writer:
+        assert writer.publish(CLIENTS, WORKSPACES, MONITORS) == 1
+        snap = load_snapshot(snapshot_path)
+
+    assert snap.generation == 1
+    assert (snap.clients, snap.workspaces, snap.monitors) == (CLIENTS, WORKSPACES, MONITORS)
+
+
+def test_reader_before_first_publish(snapshot_path: Path) -> None:
+    with SharedStateWriter(snapshot_path), SharedStateReader(snapshot_path) as reader:
+        assert reader.generation == 0
+        with pytest.raises(HyprlandIPCError, match="No snapshot"):
+            reader.read()
+
+
+def test_read_if_newer(snapshot_path: Path) -> None:
+    with SharedStateWriter(snapshot_path) as writer:
+        writer.publish(CLIENTS, WORKSPACES, MONITORS)
+        reader = SharedStateReader(snapshot_path)
+        first = reader.read()
+        assert reader.read_if_newer(first.generation) is None
+
+        writer.publish([], WORKSPACES, MONITORS)
+        newer = reader.read_if_newer(first.generation)
+        assert newer is not None
+        assert newer.generation == first.generation + 1
+        assert newer.clients == []
+        reader.close()
+
+
+def test_reader_follows_growth(snapshot_path: Path) -> None:
+    with SharedStateWriter(snapshot_path) as writer:
+        writer.publish(CLIENTS, WORKSPACES, MONITORS)
+        reader = SharedStateReader(snapshot_path)
+
+        many = [{"address": f"0x{i:x}", "title": "x" * 200} for i in range(2000)]
+        writer.publish(many, WORKSPACES, MONITORS)
+
+        snap = reader.read()
+        assert snap.generation == writer.generation
+        assert len(snap.clients) == len(many)
+        reader.close()
+
+
+def test_restarted_writer_retires_old_file(snapshot_path: Path) -> None:
+    old = SharedStateWriter(snapshot_path)
+    old.publish(CLIENTS, WORKSPACES, MONITORS)
+    old.publish([], WORKSPACES, MONITORS)
+    reader = SharedStateReader(snapshot_path)
+    assert reader.read().generation == 2  # noqa: PLR2004
+    old.close()  # the publisher exits (or dies) without cleaning up
+
+    with SharedStateWriter(snapshot_path) as new:
+        assert new.generation == 2  # noqa: PLR2004
+        assert reader.read().clients == []  # carried over
+        assert reader.read_if_newer(2) is None
+
+        assert new.publish(CLIENTS, WORKSPACES, MONITORS) == 3  # noqa: PLR2004
+        newer = reader.read_if_newer(2)
+        assert newer is not None
+        assert (newer.generation, newer.clients) == (3, CLIENTS)
+    reader.close()
+
+
+def test_writer_replaces_foreign_file(snapshot_path: Path) -> None:
+    snapshot_path.parent.mkdir(parents=True)
+    snapshot_path.write_bytes(b"\x00" * 16)
+    with SharedStateWriter(snapshot_path) as writer:
+        assert writer.generation == 0
+        assert writer.publish(CLIENTS, WORKSPACES, MONITORS) == 1
+
+
+def test_reader_rejects_foreign_file(tmp_path: Path) -> None:
+    path = tmp_path / "bogus"
+    path.write_bytes(b"\x00" * 128)
+    with pytest.raises(HyprlandIPCError, match="not a hyprland-ipc snapshot"):
+        SharedStateReader(path)
+
+
+def test_reader_rejects_truncated_file(tmp_path: Path) -> None:
+    path = tmp_path / "short"
+    path.write_bytes(b"\x00" * 16)
+    with pytest.raises(HyprlandIPCError, match="too short"):
+        SharedStateReader(path)
+
+
+def test_reader_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(HyprlandIPCError, match="Failed to open snapshot"):
+        SharedStateReader(tmp_path / "missing")
+
+
+def test_closed_writer_raises(snapshot_path: Path) -> None:
+    writer = SharedStateWriter(snapshot_path)
+    writer.close()
+    with pytest.raises(HyprlandIPCError, match="closed"):
+        writer.publish([], [], [])
+
+
+def test_concurrent_readers_see_consistent_snapshots(snapshot_path: Path) -> None:
+    rounds = 300
+    errors: list[str] = []
+    done = threading.Event()
+
+    with SharedStateWriter(snapshot_path) as writer:
+        writer.publish([{"n": 0}], [{"n": 0}], [{"n": 0}])
+
+        def _read() -> None:
+            with SharedStateReader(snapshot_path) as reader:
+                while not done.is_set():
+                    snap = reader.read()
+                    marks = {snap.clients[0]["n"], snap.workspaces[0]["n"], snap.monitors[0]["n"]}
+                    if len(marks) != 1:
+                        errors.append(f"torn snapshot: {marks}")
+
+        threads = [threading.Thread(target=_read) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for n in range(1, rounds):
+            writer.publish([{"n": n}], [{"n": n}], [{"n": n}])
+        done.set()
+        for t in threads:
+            t.join()
+
+    assert errors == []
+
+
+# ---------------------------------------------------------------------------#
+#                                Publisher                                   #
+# ---------------------------------------------------------------------------#
+
+
+def test_publisher_refreshes_on_relevant_events(
+    monkeypatch: pytest.MonkeyPatch, snapshot_path: Path
+) -> None:
+    monkeypatch.setattr(HyprlandIPC, "get_clients", lambda _self: CLIENTS)
+    monkeypatch.setattr(HyprlandIPC, "get_workspaces", lambda _self: WORKSPACES)
+    monkeypatch.setattr(HyprlandIPC, "get_monitors", lambda _self: MONITORS)
+    monkeypatch.setattr(
+        HyprlandIPC,
+        "events",
+        lambda _self: iter([Event("openwindow", "1,1,kitty,t"), Event("bell", "")]),
+    )
+
+    with SharedStateWriter(snapshot_path) as writer:
+        StatePublisher(HyprlandIPC(Path("cmd"), Path("evt")), writer).run()
+        # initial refresh + one for "openwindow"; "bell" is ignored
+        expected_generations = 2
+        assert writer.generation == expected_generations
+        assert load_snapshot(snapshot_path).clients == CLIENTS
+
+
+def test_publisher_with_frozen_replies(
+    monkeypatch: pytest.MonkeyPatch, snapshot_path: Path
+) -> None:
+    monkeypatch.setattr(HyprlandIPC, "get_clients", lambda _self: freeze(CLIENTS))
+    monkeypatch.setattr(HyprlandIPC, "get_workspaces", lambda _self: freeze(WORKSPACES))
+    monkeypatch.setattr(HyprlandIPC, "get_monitors", lambda _self: freeze(MONITORS))
+
+    with SharedStateWriter(snapshot_path) as writer:
+        ipc = HyprlandIPC(Path("cmd"), Path("evt"), frozen=True)
+        assert StatePublisher(ipc, writer).refresh() == 1
+        assert load_snapshot(snapshot_path).clients == CLIENTS
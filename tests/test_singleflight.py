@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import copy
+import marshal
+import pickle
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hyprland_ipc.ipc import HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.singleflight import FrozenDict, FrozenList, SingleFlight, freeze, thaw
+
+
+CALLERS = 4
+
+
+def _run_concurrently[T](fn: Callable[[], T], count: int = CALLERS) -> list[T | BaseException]:
+    results: list[T | BaseException] = []
+    lock = threading.Lock()
+
+    def call() -> None:
+        try:
+            value: T | BaseException = fn()
+        except Exception as e:
+            value = e
+        with lock:
+            results.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+class _BlockingSend:
+    """Stand-in for HyprlandIPC.send that holds the reply until released.
+
+    Instances are not descriptors, so when set on the class they are called
+    with the command only.
+    """
+
+    def __init__(self, reply: str) -> None:
+        self.reply = reply
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, _command: str) -> str:
+        self.calls += 1
+        assert self.release.wait(timeout=5)
+        return self.reply
+
+
+def _release_when_shared(flights: SingleFlight[Any], release: threading.Event) -> None:
+    """Release the in-flight call once every other caller has joined it."""
+
+    def watch() -> None:
+        while flights.shared < CALLERS - 1:
+            threading.Event().wait(0.001)
+        release.set()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+# ---------------------------------------------------------------------------
+# SingleFlight
+# ---------------------------------------------------------------------------
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flights: SingleFlight[object] = SingleFlight()
+    release = threading.Event()
+    executions: list[int] = []
+
+    def work() -> object:
+        executions.append(1)
+        assert release.wait(timeout=5)
+        return object()
+
+    _release_when_shared(flights, release)
+    results = _run_concurrently(lambda: flights.do("clients", work))
+
+    assert len(executions) == 1
+    assert len({id(r) for r in results}) == 1
+    assert flights.executed == 1
+    assert flights.in_flight == 0
+
+
+def test_exception_reaches_every_caller() -> None:
+    flights: SingleFlight[None] = SingleFlight()
+    release = threading.Event()
+
+    def work() -> None:
+        assert release.wait(timeout=5)
+        raise HyprlandIPCError("boom")
+
+    _release_when_shared(flights, release)
+    results = _run_concurrently(lambda: flights.do("clients", work))
+    assert len(results) == CALLERS
+    assert all(isinstance(r, HyprlandIPCError) for r in results)
+
+
+def test_sequential_calls_run_again() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    assert flights.do("k", lambda: 1) == 1
+    assert flights.do("k", lambda: 2) == 2  # noqa: PLR2004
+    assert flights.executed == 2  # noqa: PLR2004
+    assert flights.shared == 0
+
+
+# ---------------------------------------------------------------------------
+# freeze
+# ---------------------------------------------------------------------------
+
+
+def test_freeze_blocks_mutation_but_keeps_types() -> None:
+    frozen = freeze({"workspace": {"id": 1}, "grouped": ["0x1"]})
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen, dict)
+    assert isinstance(frozen["grouped"], FrozenList)
+    assert frozen == {"workspace": {"id": 1}, "grouped": ["0x1"]}
+
+    with pytest.raises(TypeError, match="read-only"):
+        frozen["title"] = "x"
+    with pytest.raises(TypeError, match="read-only"):
+        frozen["workspace"].update(id=2)
+    with pytest.raises(TypeError, match="read-only"):
+        frozen["grouped"].append("0x2")
+
+    thawed = dict(frozen)
+    thawed["title"] = "x"
+    assert "title" not in frozen
+
+
+def test_frozen_values_copy_and_pickle() -> None:
+    frozen = freeze([{"address": "0x1"}])
+    pickled = pickle.loads(pickle.dumps(frozen))  # noqa: S301 - round-trips our own data
+    for clone in (copy.copy(frozen), copy.deepcopy(frozen), pickled):
+        assert clone == frozen
+        assert isinstance(clone, FrozenList)
+
+
+def test_thaw_makes_frozen_values_marshallable() -> None:
+    frozen = (freeze([{"address": "0x1", "grouped": ["0x2"]}]), "sig")
+    with pytest.raises(ValueError, match="unmarshallable"):
+        marshal.dumps(frozen)
+    thawed = thaw(frozen)
+    assert type(thawed[0]) is list
+    assert type(thawed[0][0]["grouped"]) is list
+    assert marshal.loads(marshal.dumps(thawed)) == frozen  # noqa: S302 - our own data
+
+
+# ---------------------------------------------------------------------------
+# HyprlandIPC integration
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_send_json_single_flight(monkeypatch: pytest.MonkeyPatch, frozen: bool) -> None:
+    send = _BlockingSend('[{"address": "0x1"}]')
+    monkeypatch.setattr(HyprlandIPC, "send", send)
+    ipc = HyprlandIPC(Path("cmd"), Path("evt"), single_flight=True, frozen=frozen)
+    assert ipc._flights is not None
+
+    _release_when_shared(ipc._flights, send.release)
+    results = _run_concurrently(ipc.get_clients)
+
+    assert send.calls == 1
+    assert all(r == [{"address": "0x1"}] for r in results)
+    # Frozen results are shared; mutable ones are parsed per caller.
+    assert len({id(r) for r in results}) == (1 if frozen else CALLERS)
+
+
+def test_send_json_frozen_without_single_flight(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(HyprlandIPC, "send", lambda *_: '{"address": "0x1"}')
+    ipc = HyprlandIPC(Path("cmd"), Path("evt"), frozen=True)
+    window = ipc.get_active_window()
+    assert isinstance(window, FrozenDict)
+    assert window["address"] == "0x1"
+
+
+def test_send_json_single_flight_invalid_json(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(HyprlandIPC, "send", lambda *_: "notjson")
+    ipc = HyprlandIPC(Path("cmd"), Path("evt"), single_flight=True, frozen=True)
+    with pytest.raises(HyprlandIPCError, match="Invalid JSON"):
+        ipc.send_json("clients")
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.ipc import Event, HyprlandIPC
+from hyprland_ipc.spatial import Rect, SpatialIndex
+
+
+def _client(address: str, geometry: tuple[int, int, int, int], ws: int = 1) -> dict[str, object]:
+    x, y, w, h = geometry
+    return {"address": address, "at": [x, y], "size": [w, h], "workspace": {"id": ws}}
+
+
+# Two columns on workspace 1, plus a floating window overlapping the right one
+# and a window on workspace 2 that shares its geometry with 0xleft.
+CLIENTS = [
+    _client("0xleft", (0, 0, 960, 800)),
+    _client("0xright_top", (960, 0, 960, 540)),
+    _client("0xright_bottom", (960, 540, 960, 540)),
+    _client("0xfloat", (1500, 400, 200, 200)),
+    _client("0xother", (0, 0, 960, 1080), ws=2),
+]
+
+
+@pytest.fixture()
+def index() -> SpatialIndex:
+    return SpatialIndex.from_clients(CLIENTS, cell_size=128)
+
+
+def test_rect_helpers() -> None:
+    rect = Rect(10, 20, 30, 40)
+    assert (rect.right, rect.bottom) == (40, 60)
+    assert rect.contains(10, 20)
+    assert not rect.contains(40, 20)
+    assert rect.intersects(Rect(39, 59, 5, 5))
+    assert not rect.intersects(Rect(40, 0, 5, 100))
+
+
+def test_at_point(index: SpatialIndex) -> None:
+    assert index.at(100, 100) == ["0xleft", "0xother"]
+    assert index.at(100, 100, workspace=1) == ["0xleft"]
+    assert index.at(1600, 550) == ["0xfloat", "0xright_bottom"]
+    assert index.at(5000, 5000) == []
+
+
+def test_intersecting(index: SpatialIndex) -> None:
+    assert index.intersecting(Rect(950, 530, 20, 20), workspace=1) == [
+        "0xleft",
+        "0xright_bottom",
+        "0xright_top",
+    ]
+
+
+def test_overlaps(index: SpatialIndex) -> None:
+    assert index.overlaps(workspace=1) == [
+        ("0xfloat", "0xright_bottom"),
+        ("0xfloat", "0xright_top"),
+    ]
+    assert ("0xleft", "0xother") in index.overlaps()
+
+
+@pytest.mark.parametrize(
+    ("source", "direction", "expected"),
+    [
+        ("0xleft", "r", "0xright_top"),
+        ("0xright_top", "l", "0xleft"),
+        ("0xright_top", "d", "0xright_bottom"),
+        ("0xright_bottom", "u", "0xright_top"),
+        ("0xleft", "l", None),
+        ("0xright_top", "u", None),
+    ],
+)
+def test_nearest(index: SpatialIndex, source: str, direction: str, expected: str | None) -> None:
+    assert index.nearest(source, direction, workspace=1) == expected  # type: ignore[arg-type]
+
+
+def test_nearest_defaults_to_source_workspace(index: SpatialIndex) -> None:
+    # 0xother is alone on workspace 2
+    assert index.nearest("0xother", "r") is None
+
+
+def test_upsert_moves_between_cells(index: SpatialIndex) -> None:
+    index.upsert("0xfloat", Rect(10, 10, 50, 50), workspace=1)
+    assert "0xfloat" in index.at(20, 20)
+    assert "0xfloat" not in index.at(1600, 550)
+
+
+def test_closewindow_event_removes_and_marks_stale(
+    monkeypatch: pytest.MonkeyPatch, index: SpatialIndex
+) -> None:
+    index.handle_event(Event("closewindow", "right_top"))
+    assert "0xright_top" not in index
+    assert index.stale
+
+    # The sibling below grows into the freed space.
+    reflowed = [c for c in CLIENTS if c["address"] != "0xright_top"]
+    reflowed[1] = _client("0xright_bottom", (960, 0, 960, 1080))
+    monkeypatch.setattr(HyprlandIPC, "get_clients", lambda _self: reflowed)
+    assert index.refresh(HyprlandIPC(Path("cmd"), Path("evt"))) is True
+    assert index.at(1200, 100) == ["0xright_bottom"]
+
+
+def test_movewindowv2_rescopes_and_marks_stale(index: SpatialIndex) -> None:
+    index.handle_event(Event("movewindowv2", "left,3,3"))
+    assert index.stale
+    assert index.at(100, 100, workspace=3) == ["0xleft"]
+
+
+def test_refresh_only_when_stale(monkeypatch: pytest.MonkeyPatch, index: SpatialIndex) -> None:
+    calls: list[int] = []
+
+    def fake_get_clients(_self: HyprlandIPC) -> list[dict[str, object]]:
+        calls.append(1)
+        return CLIENTS[:1]
+
+    monkeypatch.setattr(HyprlandIPC, "get_clients", fake_get_clients)
+    ipc = HyprlandIPC(Path("cmd"), Path("evt"))
+
+    assert index.refresh(ipc) is False
+    index.handle_event(Event("openwindow", "abc,1,kitty,t"))
+    assert index.refresh(ipc) is True
+    assert len(index) == 1
+    assert not index.stale
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("name", ["togglegroup", "moveintogroup", "moveoutofgroup"])
+def test_group_events_mark_stale(index: SpatialIndex, name: str) -> None:
+    index.handle_event(Event(name, "1,left"))
+    assert index.stale
+
+
+def test_mark_stale_forces_next_refresh(
+    monkeypatch: pytest.MonkeyPatch, index: SpatialIndex
+) -> None:
+    # "resizeactive" emits no event, so the caller flags the index itself.
+    resized = [_client("0xleft", (0, 0, 1200, 1080)), *CLIENTS[1:]]
+    monkeypatch.setattr(HyprlandIPC, "get_clients", lambda _self: resized)
+    ipc = HyprlandIPC(Path("cmd"), Path("evt"))
+    assert index.refresh(ipc) is False
+    index.mark_stale()
+    assert index.refresh(ipc) is True
+    assert index.rect("0xleft").width == 1200  # noqa: PLR2004
+
+
+def test_invalid_cell_size() -> None:
+    with pytest.raises(ValueError, match="cell_size"):
+        SpatialIndex(0)
@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+"""Concurrency stress tests for state shared between threads.
+
+These hammer the shared structures from many threads at once. On GIL builds a
+tiny switch interval makes thread switches frequent enough to expose missing
+locks; on free-threaded builds the threads genuinely run in parallel.
+"""
+
+from __future__ import annotations
+
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+from collections.abc import Callable, Generator
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.batching import DispatchQueue
+from hyprland_ipc.history import EventHistory
+from hyprland_ipc.ipc import Event, HyprlandIPC
+from hyprland_ipc.rules import Rule, RuleEngine
+from hyprland_ipc.shm import SharedStateReader, SharedStateWriter
+from tests.conftest import ReplyServer
+
+
+THREADS = 8
+ROUNDS = 200
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches() -> Generator[None, None, None]:
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _hammer(work: Callable[[int], None], threads: int = THREADS) -> None:
+    """Run *work(index)* on every thread at once and re-raise the first error."""
+    errors: list[BaseException] = []
+    barrier = threading.Barrier(threads)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            work(index)
+        except BaseException as e:
+            errors.append(e)
+
+    pool = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join(timeout=30)
+    if errors:
+        raise errors[0]
+
+
+def test_single_flight_client(reply_server: ReplyServer) -> None:
+    reply_server.reply = lambda request: b'{"q": "%s"}' % request[2:]
+    ipc = HyprlandIPC(reply_server.path, Path("evt"), single_flight=True)
+    commands = ("clients", "monitors", "activewindow")
+
+    def work(index: int) -> None:
+        for i in range(ROUNDS // 4):
+            command = commands[(index + i) % len(commands)]
+            assert ipc.send_json(command) == {"q": command}
+
+    _hammer(work)
+    assert ipc._flights is not None
+    assert len(reply_server.requests) == ipc._flights.executed
+
+
+def test_history_sequence_numbers_stay_unique() -> None:
+    history = EventHistory(capacity=THREADS * ROUNDS)
+
+    def work(index: int) -> None:
+        for i in range(ROUNDS):
+            history.record(Event(f"name{index % 3}", f"{index}:{i}"))
+
+    _hammer(work)
+    entries = list(history)
+    assert [e.seq for e in entries] == list(range(1, THREADS * ROUNDS + 1))
+    assert len({e.event.data for e in entries}) == THREADS * ROUNDS
+
+
+def test_history_counts_every_truncation() -> None:
+    history = EventHistory(capacity=16, data_capacity=4)
+
+    def work(_index: int) -> None:
+        for _ in range(ROUNDS):
+            history.record(Event("e", "too long"))
+
+    _hammer(work)
+    assert history.truncated == THREADS * ROUNDS
+
+
+def test_event_decode_errors_from_several_streams() -> None:
+    path = Path(tempfile.mkdtemp(prefix="hyp")) / "evt.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(THREADS)
+
+    def serve() -> None:
+        with server:
+            for _ in range(THREADS):
+                conn, _ = server.accept()
+                with conn:
+                    conn.sendall(b"bad>>\xff\n" * ROUNDS)
+
+    threading.Thread(target=serve, daemon=True).start()
+    ipc = HyprlandIPC(Path("cmd"), path)
+    _hammer(lambda _index: list(ipc.events()))
+    assert ipc.event_decode_errors == THREADS * ROUNDS
+    shutil.rmtree(path.parent, ignore_errors=True)
+
+
+def test_rules_added_while_matching() -> None:
+    engine = RuleEngine(HyprlandIPC(Path("cmd"), Path("evt")))
+    event = Event("openwindow", "abc,1,kitty,title")
+
+    def work(index: int) -> None:
+        for i in range(ROUNDS // 4):
+            if index % 2:
+                engine.add(Rule("openwindow", (f"tag {index}-{i}",)))
+                engine.add(Rule("*", (f"wild {index}-{i}",)))
+            else:
+                actions = engine.match(event)
+                assert all(a.startswith(("tag", "wild")) for a in actions)
+
+    _hammer(work)
+    assert len(engine.rules) == THREADS // 2 * (ROUNDS // 4) * 2
+    assert len(engine.match(event)) == len(engine.rules)
+
+
+def test_shared_snapshot_reader_across_file_growth(tmp_path: Path) -> None:
+    path = tmp_path / "snap"
+    writer = SharedStateWriter(path, capacity=64)
+    writer.publish([], [], [])
+    reader = SharedStateReader(path)
+
+    def work(index: int) -> None:
+        if index == 0:
+            for i in range(1, ROUNDS // 4):
+                # Payload keeps growing, so the writer replaces the file.
+                writer.publish([{"title": "x" * 64 * i}], [], [])
+            return
+        last = 0
+        for _ in range(ROUNDS):
+            snap = reader.read()
+            assert snap.generation >= last
+            last = snap.generation
+
+    try:
+        _hammer(work)
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_dispatch_queue_sends_each_command_once() -> None:
+    sent: list[str] = []
+    lock = threading.Lock()
+
+    class _Recorder(HyprlandIPC):
+        def dispatch(self, command: str) -> None:
+            with lock:
+                sent.append(command)
+
+        def batch(self, commands: list[str]) -> None:  # type: ignore[override]
+            with lock:
+                sent.extend(commands)
+
+    with DispatchQueue(_Recorder(Path("cmd"), Path("evt")), window=0.001, max_batch=16) as queue:
+        _hammer(lambda index: [queue.dispatch(f"{index}-{i}") for i in range(ROUNDS)] and None)
+
+    assert sorted(sent) == sorted(f"{t}-{i}" for t in range(THREADS) for i in range(ROUNDS))
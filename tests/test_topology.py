@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.ipc import Event, HyprlandIPC
+from hyprland_ipc.topology import Topology
+from tests.conftest import ReplyServer
+
+
+MONITORS = [
+    {"id": 0, "name": "DP-1", "focused": True},
+    {"id": 1, "name": "HDMI-A-1", "focused": False},
+]
+WORKSPACES = [
+    {"id": 1, "name": "1", "monitor": "DP-1"},
+    {"id": 2, "name": "2", "monitor": "HDMI-A-1"},
+    {"id": -98, "name": "special:term", "monitor": "DP-1"},
+]
+CLIENTS = [
+    {"address": "0xa", "workspace": {"id": 1, "name": "1"}},
+    {"address": "0xb", "workspace": {"id": 1, "name": "1"}},
+    {"address": "0xc", "workspace": {"id": -98, "name": "special:term"}},
+]
+
+
+@pytest.fixture()
+def topology() -> Topology:
+    return Topology.from_replies(MONITORS, WORKSPACES, CLIENTS)
+
+
+def test_seeded_tree(topology: Topology) -> None:
+    assert topology.monitors() == ["DP-1", "HDMI-A-1"]
+    assert topology.workspaces("DP-1") == [1, -98]
+    assert topology.workspaces() == [1, 2, -98]
+    assert topology.windows(1) == ["0xa", "0xb"]
+    assert topology.window_count(1) == 2  # noqa: PLR2004
+    assert topology.window_count(2) == 0
+    assert topology.monitor_of(2) == "HDMI-A-1"
+    assert topology.workspace_of("0xc") == -98  # noqa: PLR2004
+    assert topology.monitor_of_window("0xc") == "DP-1"
+    assert topology.special_workspaces() == [-98]
+    assert topology.workspace_id("special:term") == -98  # noqa: PLR2004
+    assert topology.monitor_name(1) == "HDMI-A-1"
+    assert topology.focused_monitor == "DP-1"
+    assert len(topology) == 3  # noqa: PLR2004
+    assert "0xa" in topology
+
+
+def test_from_ipc_uses_one_request(reply_server: ReplyServer) -> None:
+    reply = "\n".join(json.dumps(r) for r in (MONITORS, WORKSPACES, CLIENTS)).encode()
+    reply_server.reply = lambda _request: reply
+    topology = Topology.from_ipc(HyprlandIPC(reply_server.path, Path("evt")))
+    assert reply_server.requests == [b"[[BATCH]]j/monitors;j/workspaces;j/clients"]
+    assert topology.windows(-98) == ["0xc"]
+
+
+# ---------------------------------------------------------------------------#
+#                                   Events                                   #
+# ---------------------------------------------------------------------------#
+
+
+def test_window_events(topology: Topology) -> None:
+    topology.handle_event(Event("openwindow", "d,2,kitty,a, b"))
+    topology.handle_event(Event("movewindowv2", "a,2,2"))
+    topology.handle_event(Event("closewindow", "b"))
+    assert topology.windows(2) == ["0xd", "0xa"]
+    assert topology.window_count(1) == 0
+    assert topology.monitor_of_window("0xd") == "HDMI-A-1"
+    topology.handle_event(Event("closewindow", "ffff"))  # unknown: ignored
+    topology.handle_event(Event("openwindow", "e,unknown,kitty,x"))
+    assert "0xe" not in topology
+
+
+def test_workspace_lifecycle_follows_focused_monitor(topology: Topology) -> None:
+    topology.handle_event(Event("focusedmonv2", "HDMI-A-1,2"))
+    topology.handle_event(Event("createworkspacev2", "3,web"))
+    assert topology.monitor_of(3) == "HDMI-A-1"
+    assert topology.workspace_name(3) == "web"
+
+    topology.handle_event(Event("renameworkspace", "3,mail"))
+    assert topology.workspace_id("mail") == 3  # noqa: PLR2004
+    assert topology.workspace_id("web") is None
+
+    topology.handle_event(Event("moveworkspacev2", "3,mail,DP-1"))
+    assert topology.workspaces("HDMI-A-1") == [2]
+    assert topology.workspaces("DP-1") == [1, -98, 3]
+
+    topology.handle_event(Event("destroyworkspacev2", "3,mail"))
+    assert 3 not in topology.workspaces()  # noqa: PLR2004
+    assert topology.workspaces("DP-1") == [1, -98]
+
+
+def test_special_workspace_follows_activespecial(topology: Topology) -> None:
+    topology.handle_event(Event("activespecialv2", "-98,special:term,HDMI-A-1"))
+    assert topology.monitor_of(-98) == "HDMI-A-1"
+    topology.handle_event(Event("activespecialv2", ",,HDMI-A-1"))  # hidden
+    assert topology.monitor_of(-98) == "HDMI-A-1"
+    assert topology.monitor_of_window("0xc") == "HDMI-A-1"
+
+
+def test_monitor_events(topology: Topology) -> None:
+    topology.handle_event(Event("monitoraddedv2", "2,DP-2,Dell Inc. U2720Q, 4K"))
+    assert topology.monitor_name(2) == "DP-2"
+    topology.handle_event(Event("monitorremovedv2", "1,HDMI-A-1,LG"))
+    assert topology.monitors() == ["DP-1", "DP-2"]
+    assert topology.monitor_of(2) is None
+    assert topology.monitor_name(1) is None
+
+    topology.handle_event(Event("moveworkspacev2", "2,2,DP-2"))
+    assert topology.workspaces("DP-2") == [2]
+
+    topology.handle_event(Event("monitoradded", "HDMI-A-2"))
+    topology.handle_event(Event("monitorremoved", "DP-1"))
+    assert topology.monitors() == ["DP-2", "HDMI-A-2"]
+    assert topology.focused_monitor is None
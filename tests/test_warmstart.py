@@ -0,0 +1,189 @@
+# SPDX-FileCopyrightText: 2025-present peppapig450 <peppapig450@pm.me>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hyprland_ipc.ipc import HyprlandIPC, HyprlandIPCError
+from hyprland_ipc.warmstart import (
+    STATE_FILENAME,
+    WarmState,
+    default_state_path,
+    load_state,
+    save_state,
+)
+from tests.conftest import ReplyServer
+
+
+CLIENTS = [
+    {"address": "0x1", "workspace": {"id": 1}, "focusHistoryID": 1},
+    {"address": "0x2", "workspace": {"id": 1}, "focusHistoryID": 0},
+    {"address": "0x3", "workspace": {"id": 2}, "focusHistoryID": 2},
+]
+REPLIES = {
+    "clients": CLIENTS,
+    "workspaces": [{"id": 1, "windows": 2}, {"id": 2, "windows": 1}],
+    "monitors": [{"id": 0, "name": "DP-1"}],
+    "activewindow": {"address": "0x2"},
+    "activeworkspace": {"id": 1, "windows": 2},
+}
+
+
+class FakeHyprland:
+    """Answers batched JSON queries from a dict of replies."""
+
+    def __init__(self) -> None:
+        """Start from the module-level replies."""
+        self.replies: dict[str, object] = dict(REPLIES)
+
+    def __call__(self, request: bytes) -> bytes:
+        """Join one JSON document per batched query."""
+        commands = request.decode().removeprefix("[[BATCH]]").split(";")
+        return "\n\n".join(
+            json.dumps(self.replies[c.removeprefix("j/")]) for c in commands
+        ).encode()
+
+
+@pytest.fixture()
+def hypr(reply_server: ReplyServer) -> FakeHyprland:
+    fake = FakeHyprland()
+    reply_server.reply = fake
+    return fake
+
+
+@pytest.fixture()
+def ipc(reply_server: ReplyServer, hypr: FakeHyprland) -> HyprlandIPC:
+    return HyprlandIPC(reply_server.path, Path("evt"))
+
+
+@pytest.fixture()
+def state_path(tmp_path: Path) -> Path:
+    return tmp_path / "hypr" / "sig" / STATE_FILENAME
+
+
+# ---------------------------------------------------------------------------#
+#                              Capture and files                             #
+# ---------------------------------------------------------------------------#
+
+
+def test_capture_uses_one_request(ipc: HyprlandIPC, reply_server: ReplyServer) -> None:
+    state = WarmState.capture(ipc, signature="sig")
+    assert len(reply_server.requests) == 1
+    assert state.clients == CLIENTS
+    assert state.active_window == "0x2"
+    assert state.active_workspace == 1
+    assert state.focus_history().order() == ["0x2", "0x1", "0x3"]
+
+
+def test_capture_requires_signature(ipc: HyprlandIPC, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HYPRLAND_INSTANCE_SIGNATURE", raising=False)
+    with pytest.raises(HyprlandIPCError, match="HYPRLAND_INSTANCE_SIGNATURE"):
+        WarmState.capture(ipc)
+
+
+def test_save_and_load_round_trip(ipc: HyprlandIPC, state_path: Path) -> None:
+    state = WarmState.capture(ipc, signature="sig")
+    assert save_state(state, state_path) == 1
+    assert save_state(state, state_path) == 2  # noqa: PLR2004
+    assert state_path.stat().st_mode & 0o777 == 0o600  # noqa: PLR2004
+
+    loaded = load_state(state_path, signature="sig")
+    assert loaded is not None
+    assert loaded.sequence == 2  # noqa: PLR2004
+    assert loaded.saved_at <= time.time()
+    assert (loaded.clients, loaded.focus) == (state.clients, state.focus)
+    assert loaded.focus_history().order() == state.focus_history().order()
+
+
+def test_save_frozen_replies(
+    reply_server: ReplyServer, hypr: FakeHyprland, state_path: Path
+) -> None:
+    frozen = HyprlandIPC(reply_server.path, Path("evt"), frozen=True)
+    state = WarmState.capture(frozen, signature="sig")
+    assert save_state(state, state_path) == 1
+    loaded = load_state(state_path, signature="sig")
+    assert loaded is not None
+    assert loaded.clients == CLIENTS
+
+
+def test_save_unmarshallable_state(ipc: HyprlandIPC, state_path: Path) -> None:
+    state = replace(WarmState.capture(ipc, signature="sig"), clients=[{"x": object()}])
+    with pytest.raises(HyprlandIPCError, match="Cannot save state"):
+        save_state(state, state_path)
+
+
+def test_load_rejects_unusable_files(ipc: HyprlandIPC, state_path: Path) -> None:
+    assert load_state(state_path, signature="sig") is None  # missing
+    save_state(WarmState.capture(ipc, signature="sig"), state_path)
+    assert load_state(state_path, signature="other") is None
+    assert load_state(state_path, signature="sig", max_age=-1) is None
+    assert load_state(state_path, signature="sig", max_age=60) is not None
+
+    data = state_path.read_bytes()
+    state_path.write_bytes(data[:40])
+    assert load_state(state_path, signature="sig") is None  # truncated payload
+    state_path.write_bytes(b"NOTWARM!" + data[8:])
+    assert load_state(state_path, signature="sig") is None
+    # A foreign file restarts the sequence.
+    assert save_state(WarmState.capture(ipc, signature="sig"), state_path) == 1
+
+
+def test_default_paths_from_env(
+    ipc: HyprlandIPC, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", "sig")
+    assert default_state_path() == tmp_path / "hypr" / "sig" / STATE_FILENAME
+    save_state(WarmState.capture(ipc))
+    assert load_state() is not None
+
+
+def test_save_failure(ipc: HyprlandIPC, tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    with pytest.raises(HyprlandIPCError, match="Failed to save state"):
+        save_state(WarmState.capture(ipc, signature="sig"), blocker / STATE_FILENAME)
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+# ---------------------------------------------------------------------------#
+#                                 Reconcile                                  #
+# ---------------------------------------------------------------------------#
+
+
+def test_reconcile_keeps_matching_state(
+    ipc: HyprlandIPC, reply_server: ReplyServer, state_path: Path
+) -> None:
+    save_state(WarmState.capture(ipc, signature="sig"), state_path)
+    loaded = load_state(state_path, signature="sig")
+    assert loaded is not None
+    reply_server.requests.clear()
+    assert loaded.reconcile(ipc) is loaded
+    assert reply_server.requests == [b"[[BATCH]]j/activewindow;j/activeworkspace"]
+
+
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [
+        ("activewindow", {"address": "0x3"}),
+        ("activeworkspace", {"id": 2, "windows": 1}),
+        ("activeworkspace", {"id": 1, "windows": 3}),
+    ],
+)
+def test_reconcile_recaptures_on_mismatch(
+    ipc: HyprlandIPC, hypr: FakeHyprland, key: str, value: object
+) -> None:
+    state = WarmState.capture(ipc, signature="sig")
+    hypr.replies[key] = value
+    hypr.replies["clients"] = CLIENTS[:1]
+    fresh = state.reconcile(ipc)
+    assert fresh is not state
+    assert fresh.clients == CLIENTS[:1]